@@ -69,12 +69,27 @@ CREATE TABLE raw_attribute_allowable_values_in_any_category (
     PRIMARY KEY (attribute_key, value)
 );
 
+-- Hash partitioned on product_key: this is by far the largest input table
+-- and it is always read one product at a time.
 CREATE TABLE raw_product_attribute_allowable_values (
     product_key TEXT,
     attribute_key TEXT,
     value TEXT,
-    PRIMARY KEY (product_key, attribute_key, value)
-);
+    CONSTRAINT raw_product_attribute_allowable_values_pkey
+        PRIMARY KEY (product_key, attribute_key, value)
+) PARTITION BY HASH (product_key);
+
+DO $$
+BEGIN
+    FOR i IN 0..15 LOOP
+        EXECUTE format(
+            'CREATE TABLE raw_product_attribute_allowable_values_p%s '
+            'PARTITION OF raw_product_attribute_allowable_values '
+            'FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+            i, i
+        );
+    END LOOP;
+END $$;
 
 CREATE TABLE raw_recommendations (
     recommendation_key TEXT PRIMARY KEY,
@@ -109,5 +124,35 @@ CREATE TABLE human_recommendations (
     alternative_override TEXT,
     action TEXT,
     link_to_site TEXT,
-    comment TEXT
-); 
\ No newline at end of file
+    comment TEXT,
+    content_hash TEXT NOT NULL UNIQUE,
+    source_batch TEXT
+);
+
+-- content_hash fingerprints the file by its size and modification time.
+CREATE TABLE ingestion_manifest (
+    filename TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    rows_committed BIGINT NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE ingestion_row_hashes (
+    filename TEXT,
+    row_key TEXT,
+    row_hash TEXT NOT NULL,
+    PRIMARY KEY (filename, row_key)
+);
+
+-- Bumped by ingestion whenever attributes, categories or category
+-- attributes change, so that processes caching them reload.
+CREATE TABLE reference_data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+INSERT INTO reference_data_version (id) VALUES (1);
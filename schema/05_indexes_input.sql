@@ -11,6 +11,8 @@ CREATE INDEX IF NOT EXISTS idx_product_attribute_values_attribute_key ON raw_pro
 CREATE INDEX IF NOT EXISTS idx_product_attribute_gaps_product_key ON raw_product_attribute_gaps(product_key);
 CREATE INDEX IF NOT EXISTS idx_product_attribute_gaps_attribute_key ON raw_product_attribute_gaps(attribute_key);
 
+CREATE INDEX IF NOT EXISTS idx_product_attribute_allowable_values_attribute_key ON raw_product_attribute_allowable_values(attribute_key);
+
 CREATE INDEX IF NOT EXISTS idx_category_allowable_values_category_key ON raw_category_allowable_values(category_key);
 CREATE INDEX IF NOT EXISTS idx_category_allowable_values_attribute_key ON raw_category_allowable_values(attribute_key);
 
@@ -26,4 +28,5 @@ CREATE INDEX IF NOT EXISTS idx_attributes_system_name ON raw_attributes(system_n
 
 -- QA table indexes
 CREATE INDEX IF NOT EXISTS idx_qa_complete_product_reference ON human_recommendations(product_reference);
-CREATE INDEX IF NOT EXISTS idx_qa_complete_attribute_reference ON human_recommendations(attribute_reference); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_qa_complete_attribute_reference ON human_recommendations(attribute_reference);
+CREATE INDEX IF NOT EXISTS idx_qa_complete_source_batch ON human_recommendations(source_batch);
\ No newline at end of file
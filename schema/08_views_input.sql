@@ -10,6 +10,7 @@ BEGIN
             p.system_name AS product_system_name,
             p.friendly_name AS product_friendly_name,
             c.category_key,
+            ca.category_attribute_key,
             c.system_name AS category_system_name,
             c.friendly_name AS category_friendly_name,
             a.attribute_key,
@@ -18,6 +19,7 @@ BEGIN
             a.attribute_type,
             a.unit_measure_type,
             pav.value AS attribute_value,
+            r.recommendation_key,
             r.value AS recommended_value,
             r.confidence AS recommendation_confidence,
             r.created_at AS recommendation_created_at
@@ -31,13 +33,16 @@ BEGIN
     END IF;
 END $$;
 
--- Create a unique index on the materialized view for concurrent refreshes
+-- Create a unique index on the materialized view for concurrent refreshes.
+-- A row is a product, one of its category attributes and one of the
+-- recommendations for that attribute: several categories can share an
+-- attribute, and an attribute can have several recommendations.
 DO $$ 
 BEGIN
     IF NOT EXISTS (
         SELECT 1 FROM pg_indexes WHERE indexname = 'product_summary_unique_idx'
     ) THEN
-        CREATE UNIQUE INDEX product_summary_unique_idx ON product_summary (product_key, category_key, attribute_key);
+        CREATE UNIQUE INDEX product_summary_unique_idx ON product_summary (product_key, category_attribute_key, recommendation_key);
     END IF;
 END $$;
 
@@ -168,4 +173,40 @@ BEGIN
     ) THEN
         CREATE UNIQUE INDEX product_gaps_unique_idx ON product_gaps (product_key, attribute_key);
     END IF;
-END $$; 
\ No newline at end of file
+END $$; 
+
+-- Allowable values resolved per (category, attribute). Values allowed in
+-- every category or in any category are stored under category_key '' so
+-- that they are not repeated for each category; the values of an attribute
+-- for a product are the union of its categories' rows and the '' row.
+-- Refreshed by ingestion whenever an allowable-value file changes.
+DO $$ 
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_matviews WHERE matviewname = 'allowable_values_resolved'
+    ) THEN
+        CREATE MATERIALIZED VIEW allowable_values_resolved AS
+        SELECT 
+            category_key,
+            attribute_key,
+            array_agg(value ORDER BY value COLLATE "C") AS allowable_values
+        FROM (
+            SELECT category_key, attribute_key, value FROM raw_category_allowable_values
+            UNION
+            SELECT '', attribute_key, value FROM raw_attribute_allowable_values_applicable_in_every_category
+            UNION
+            SELECT '', attribute_key, value FROM raw_attribute_allowable_values_in_any_category
+        ) combined_values
+        GROUP BY category_key, attribute_key;
+    END IF;
+END $$;
+
+-- Create a unique index on the materialized view for concurrent refreshes
+DO $$ 
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes WHERE indexname = 'allowable_values_resolved_unique_idx'
+    ) THEN
+        CREATE UNIQUE INDEX allowable_values_resolved_unique_idx ON allowable_values_resolved (category_key, attribute_key);
+    END IF;
+END $$;
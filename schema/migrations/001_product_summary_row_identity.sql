@@ -0,0 +1,47 @@
+-- Databases created before product_summary kept category_attribute_key and
+-- recommendation_key have a unique index that a product with several
+-- recommendations for an attribute violates, so its refresh fails.
+-- Recreate the view as 08_views_input.sql defines it. Safe to run again.
+BEGIN;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = 'product_summary'::regclass
+          AND attname = 'recommendation_key'
+    ) THEN
+        DROP MATERIALIZED VIEW product_summary;
+
+        CREATE MATERIALIZED VIEW product_summary AS
+        SELECT 
+            p.product_key,
+            p.system_name AS product_system_name,
+            p.friendly_name AS product_friendly_name,
+            c.category_key,
+            ca.category_attribute_key,
+            c.system_name AS category_system_name,
+            c.friendly_name AS category_friendly_name,
+            a.attribute_key,
+            a.system_name AS attribute_system_name,
+            a.friendly_name AS attribute_friendly_name,
+            a.attribute_type,
+            a.unit_measure_type,
+            pav.value AS attribute_value,
+            r.recommendation_key,
+            r.value AS recommended_value,
+            r.confidence AS recommendation_confidence,
+            r.created_at AS recommendation_created_at
+        FROM raw_products p
+        LEFT JOIN raw_product_categories pc ON p.product_key = pc.product_key
+        LEFT JOIN raw_categories c ON pc.category_key = c.category_key
+        LEFT JOIN raw_category_attributes ca ON c.category_key = ca.category_key
+        LEFT JOIN raw_attributes a ON ca.attribute_key = a.attribute_key
+        LEFT JOIN raw_product_attribute_values pav ON p.product_key = pav.product_key AND a.attribute_key = pav.attribute_key
+        LEFT JOIN raw_recommendations r ON p.product_key = r.product_key AND a.attribute_key = r.attribute_key;
+
+        CREATE UNIQUE INDEX product_summary_unique_idx ON product_summary (product_key, category_attribute_key, recommendation_key);
+    END IF;
+END $$;
+
+COMMIT;
@@ -0,0 +1,10 @@
+-- Reference lookups read reference_data_version to know when their cached
+-- attributes and categories are stale, so they fail on databases created
+-- before it existed. Create it with its single row. Safe to run again.
+CREATE TABLE IF NOT EXISTS reference_data_version (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+INSERT INTO reference_data_version (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,58 @@
+-- QA batch files are merged into human_recommendations on a hash of each
+-- recommendation's content. Add content_hash and source_batch to databases
+-- created before then, hash the rows already loaded as
+-- recommendation_content_hash in src/core/csv_ingestion/qa.py does, and
+-- keep only the first row of each content, pointing prediction_results at
+-- it. Safe to run again.
+BEGIN;
+
+ALTER TABLE human_recommendations
+    ADD COLUMN IF NOT EXISTS content_hash TEXT,
+    ADD COLUMN IF NOT EXISTS source_batch TEXT;
+
+UPDATE human_recommendations
+SET content_hash = md5(concat_ws(
+    chr(31),
+    coalesce(product_reference, ''),
+    coalesce(attribute_reference, ''),
+    coalesce(attribute_name, ''),
+    coalesce(recommendation, ''),
+    coalesce(unit, ''),
+    coalesce(override, ''),
+    coalesce(alternative_override, ''),
+    coalesce(action, ''),
+    coalesce(link_to_site, ''),
+    coalesce(comment, '')
+))
+WHERE content_hash IS NULL;
+
+CREATE TEMP TABLE duplicate_recommendations ON COMMIT DROP AS
+SELECT id, min(id) OVER (PARTITION BY content_hash) AS first_id
+FROM human_recommendations;
+
+UPDATE prediction_results p
+SET recommendation_key = d.first_id
+FROM duplicate_recommendations d
+WHERE p.recommendation_key = d.id
+  AND d.id <> d.first_id;
+
+DELETE FROM human_recommendations h
+USING duplicate_recommendations d
+WHERE h.id = d.id
+  AND d.id <> d.first_id;
+
+ALTER TABLE human_recommendations ALTER COLUMN content_hash SET NOT NULL;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'human_recommendations_content_hash_key'
+    ) THEN
+        ALTER TABLE human_recommendations
+            ADD CONSTRAINT human_recommendations_content_hash_key
+            UNIQUE (content_hash);
+    END IF;
+END $$;
+
+COMMIT;
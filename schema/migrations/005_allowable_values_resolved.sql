@@ -0,0 +1,32 @@
+-- Gap and product detail queries read allowable values from the
+-- allowable_values_resolved materialized view, which databases created
+-- before it existed do not have. Create and populate it as
+-- 08_views_input.sql defines it. Safe to run again.
+BEGIN;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_matviews WHERE matviewname = 'allowable_values_resolved'
+    ) THEN
+        CREATE MATERIALIZED VIEW allowable_values_resolved AS
+        SELECT
+            category_key,
+            attribute_key,
+            array_agg(value ORDER BY value COLLATE "C") AS allowable_values
+        FROM (
+            SELECT category_key, attribute_key, value FROM raw_category_allowable_values
+            UNION
+            SELECT '', attribute_key, value FROM raw_attribute_allowable_values_applicable_in_every_category
+            UNION
+            SELECT '', attribute_key, value FROM raw_attribute_allowable_values_in_any_category
+        ) combined_values
+        GROUP BY category_key, attribute_key
+        WITH DATA;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS allowable_values_resolved_unique_idx
+    ON allowable_values_resolved (category_key, attribute_key);
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- Ingestion checkpoints every file in ingestion_manifest, which databases
+-- created before it existed do not have. Create it as 02_input_tables.sql
+-- defines it. Safe to run again.
+CREATE TABLE IF NOT EXISTS ingestion_manifest (
+    filename TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    rows_committed BIGINT NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
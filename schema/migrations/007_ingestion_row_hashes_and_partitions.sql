@@ -0,0 +1,61 @@
+-- Delta loads record row hashes in ingestion_row_hashes, and
+-- raw_product_attribute_allowable_values is hash partitioned on
+-- product_key into 16 partitions, which databases created before then do
+-- not have. Create the row hash table and, if the allowable values table
+-- is still a plain table, rebuild it partitioned as 02_input_tables.sql
+-- defines it and copy its rows across. The rebuild rewrites the whole
+-- table in one transaction and needs room for a second copy of it while
+-- it runs. Safe to run again.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ingestion_row_hashes (
+    filename TEXT,
+    row_key TEXT,
+    row_hash TEXT NOT NULL,
+    PRIMARY KEY (filename, row_key)
+);
+
+DO $$
+BEGIN
+    IF (
+        SELECT relkind FROM pg_class
+        WHERE oid = 'raw_product_attribute_allowable_values'::regclass
+    ) = 'r' THEN
+        ALTER TABLE raw_product_attribute_allowable_values
+            RENAME TO raw_product_attribute_allowable_values_unpartitioned;
+        ALTER TABLE raw_product_attribute_allowable_values_unpartitioned
+            RENAME CONSTRAINT raw_product_attribute_allowable_values_pkey
+            TO raw_product_attribute_allowable_values_unpartitioned_pkey;
+        DROP INDEX IF EXISTS idx_product_attribute_allowable_values_attribute_key;
+
+        CREATE TABLE raw_product_attribute_allowable_values (
+            product_key TEXT,
+            attribute_key TEXT,
+            value TEXT,
+            CONSTRAINT raw_product_attribute_allowable_values_pkey
+                PRIMARY KEY (product_key, attribute_key, value)
+        ) PARTITION BY HASH (product_key);
+
+        FOR i IN 0..15 LOOP
+            EXECUTE format(
+                'CREATE TABLE raw_product_attribute_allowable_values_p%s '
+                'PARTITION OF raw_product_attribute_allowable_values '
+                'FOR VALUES WITH (MODULUS 16, REMAINDER %s)',
+                i, i
+            );
+        END LOOP;
+
+        INSERT INTO raw_product_attribute_allowable_values
+            (product_key, attribute_key, value)
+        SELECT product_key, attribute_key, value
+        FROM raw_product_attribute_allowable_values_unpartitioned;
+
+        DROP TABLE raw_product_attribute_allowable_values_unpartitioned;
+
+        CREATE INDEX idx_product_attribute_allowable_values_attribute_key
+            ON raw_product_attribute_allowable_values (attribute_key);
+        ANALYZE raw_product_attribute_allowable_values;
+    END IF;
+END $$;
+
+COMMIT;
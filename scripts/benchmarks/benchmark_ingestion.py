@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Benchmarks ingest_files on a synthetic catalogue.
+
+Generates a catalogue at the requested scale (or uses --directory), then
+ingests its files one at a time in dependency order, each in a fresh
+process so that its peak RSS is its own. For every file it reports rows/s,
+database round trips and peak RSS, and the run is saved as JSON so that
+runs can be compared over time with --compare.
+
+Run against a scratch database only, as the input tables are truncated:
+    python -m scripts.benchmarks.benchmark_ingestion --scale 100k --bulk
+"""
+
+import argparse
+import logging
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable
+
+import psycopg
+from pydantic import BaseModel
+from sqlalchemy import Engine, event
+
+from scripts.benchmarks.generate_catalogue import SCALES, generate_catalogue
+from src.common.db import ConnectionProvider
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.config import CSVConfig
+from src.core.csv_ingestion.scheduler import (
+    build_dependency_graph,
+    topological_order,
+)
+from src.core.csv_ingestion.service import IngestionOptions, ingest_file
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+class FileBenchmark(BaseModel):
+    filename: str
+    rows: int
+    rows_processed: int
+    seconds: float
+    rows_per_second: float
+    round_trips: int
+    peak_rss_mib: float
+
+
+class BenchmarkRun(BaseModel):
+    started_at: datetime
+    scale: str
+    options: dict[str, Any]
+    files: list[FileBenchmark]
+    seconds: float
+
+    def format(self) -> str:
+        width = max((len(file.filename) for file in self.files), default=4)
+        lines = [
+            f"{'File':<{width}}  {'Rows':>10}  {'Rows/s':>10}  "
+            f"{'Trips':>8}  {'RSS MiB':>8}"
+        ]
+        for file in self.files:
+            lines.append(
+                f"{file.filename:<{width}}  {file.rows:>10}  "
+                f"{file.rows_per_second:>10,.0f}  {file.round_trips:>8}  "
+                f"{file.peak_rss_mib:>8.0f}"
+            )
+        lines.append(f"{'Total':<{width}}  {self.seconds:>10.1f}s")
+        return "\n".join(lines)
+
+
+class RoundTripCounter:
+    """
+    Counts the statements sent to the database by this process.
+
+    SQLAlchemy statements are counted with its cursor events. The psycopg 3
+    pool used by the bulk paths has no such hook, so its cursor methods are
+    wrapped instead; a COPY counts as one round trip.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def install(self) -> None:
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+        for name in ("execute", "executemany", "copy"):
+            setattr(
+                psycopg.Cursor,
+                name,
+                self._counted(getattr(psycopg.Cursor, name)),
+            )
+
+    def _on_execute(self, *args: Any) -> None:
+        self.count += 1
+
+    def _counted(self, method: Callable[..., Any]) -> Callable[..., Any]:
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            self.count += 1
+            return method(*args, **kwargs)
+
+        return counted
+
+
+def _benchmark_file(
+    filename: str, directory: Path, options: IngestionOptions
+) -> FileBenchmark:
+    """Ingest one file in this (fresh) process and measure it."""
+    counter = RoundTripCounter()
+    counter.install()
+    report = ingest_file(filename, directory, options)
+    rows = report.result.total_processed
+    return FileBenchmark(
+        filename=filename,
+        rows=rows,
+        rows_processed=report.result.rows_processed,
+        seconds=report.seconds,
+        rows_per_second=rows / report.seconds if report.seconds else 0.0,
+        round_trips=counter.count,
+        # ru_maxrss is in KiB on Linux.
+        peak_rss_mib=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+
+
+def truncate_targets() -> None:
+    tables = [
+        config["model"].__table__.name
+        for config in CSVConfig.FILE_CONFIGS.values()
+        if config
+    ]
+    tables += ["ingestion_manifest", "ingestion_row_hashes"]
+    with ConnectionProvider.psycopgpool() as pool:
+        with pool.connection() as connection:
+            connection.execute(f"TRUNCATE {', '.join(tables)} CASCADE")
+
+
+def run_benchmark(
+    directory: Path, scale: str, options: IngestionOptions
+) -> BenchmarkRun:
+    """Ingest every configured file of directory into empty tables."""
+    truncate_targets()
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    files = []
+    order = topological_order(build_dependency_graph(CSVConfig.FILE_CONFIGS))
+    for filename in order:
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=get_context("spawn")
+        ) as executor:
+            file = executor.submit(
+                _benchmark_file, filename, directory, options
+            ).result()
+        logger.info(
+            f"{filename}: {file.rows} rows at {file.rows_per_second:,.0f} "
+            f"rows/s, {file.round_trips} round trips, "
+            f"{file.peak_rss_mib:.0f} MiB peak RSS"
+        )
+        files.append(file)
+
+    return BenchmarkRun(
+        started_at=started_at,
+        scale=scale,
+        options=asdict(options),
+        files=files,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def compare_runs(previous: BenchmarkRun, current: BenchmarkRun) -> str:
+    """Render the rows/s of current relative to previous, per file."""
+    before = {file.filename: file for file in previous.files}
+    width = max((len(file.filename) for file in current.files), default=4)
+    lines = [
+        f"{'File':<{width}}  {'Before':>10}  {'After':>10}  {'Change':>8}"
+    ]
+    for file in current.files:
+        old = before.get(file.filename)
+        if old is None or not old.rows_per_second:
+            continue
+        change = file.rows_per_second / old.rows_per_second - 1
+        lines.append(
+            f"{file.filename:<{width}}  {old.rows_per_second:>10,.0f}  "
+            f"{file.rows_per_second:>10,.0f}  {change:>+8.0%}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ingestion on a synthetic catalogue"
+    )
+    parser.add_argument(
+        "--scale",
+        choices=SCALES,
+        default="10k",
+        help="Number of products to generate (default: 10k)",
+    )
+    parser.add_argument(
+        "--directory",
+        type=str,
+        default=None,
+        help=(
+            "Ingest an existing data directory instead of generating one "
+            "(for example the output of generate_catalogue)"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Number of rows to process in each batch (default: 1000)",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Benchmark the COPY staging path",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help="Processes parsing each CSV file in bulk mode (default: 1)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help=(
+            "File to save the results to (default: "
+            "benchmark_results/ingestion-<scale>-<timestamp>.json)"
+        ),
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Results file of an earlier run to compare rows/s with",
+    )
+    args = parser.parse_args()
+
+    options = IngestionOptions(
+        batch_size=args.batch_size,
+        bulk=args.bulk,
+        parse_workers=args.parse_workers,
+    )
+
+    with tempfile.TemporaryDirectory() as temporary:
+        if args.directory is not None:
+            directory = Path(args.directory)
+        else:
+            directory = Path(temporary)
+            start = time.perf_counter()
+            counts = generate_catalogue(directory, SCALES[args.scale])
+            logger.info(
+                f"Generated {sum(counts.values())} rows in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+        run = run_benchmark(directory, args.scale, options)
+
+    logger.info(f"Ingestion benchmark:\n{run.format()}")
+
+    output = Path(
+        args.output
+        or f"benchmark_results/ingestion-{args.scale}-"
+        f"{run.started_at:%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(run.model_dump_json(indent=2))
+    logger.info(f"Saved results to {output}")
+
+    if args.compare:
+        previous = BenchmarkRun.model_validate_json(
+            Path(args.compare).read_text()
+        )
+        logger.info(
+            f"Compared with {args.compare}:\n{compare_runs(previous, run)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
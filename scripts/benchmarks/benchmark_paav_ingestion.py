@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmarks ingestion of ProductAttributeAllowableValue.csv.
+
+Generates a synthetic file of the requested size, loads it with the COPY
+loader into an empty raw_product_attribute_allowable_values table, and
+times the row-by-row unit of work on a small sample for comparison.
+
+Run against a scratch database only, as the target table is truncated:
+    python -m scripts.benchmarks.benchmark_paav_ingestion --rows 20000000
+"""
+
+import argparse
+import csv
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.common.db import ConnectionProvider
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.bulk import load_partitioned_table
+from src.core.csv_ingestion.config import CSVConfig
+from src.core.csv_ingestion.processors import process_csv_file
+from src.core.csv_ingestion.uow import create_product_attribute_allowable_value
+from src.core.infrastructure.database.input_data.records import (
+    RawProductAttributeAllowableValueRecord,
+)
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+COLUMN_MAPPING = CSVConfig.FILE_CONFIGS["ProductAttributeAllowableValue"][
+    "column_mapping"
+]
+
+
+def generate_file(
+    path: Path, rows: int, attributes: int, values_per_attribute: int
+) -> None:
+    """Write a synthetic file with rows distinct natural keys."""
+    per_product = attributes * values_per_attribute
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["ProductKey", "AttributeKey", "Value"])
+        for i in range(rows):
+            product, offset = divmod(i, per_product)
+            attribute, value = divmod(offset, values_per_attribute)
+            writer.writerow(
+                [
+                    f"product-{product:09d}",
+                    f"attribute-{attribute:05d}",
+                    f"Allowable value {value}",
+                ]
+            )
+
+
+def truncate_target() -> None:
+    with ConnectionProvider.psycopgpool() as pool:
+        with pool.connection() as connection:
+            connection.execute(
+                "TRUNCATE raw_product_attribute_allowable_values"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ProductAttributeAllowableValue ingestion"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=10_000_000,
+        help="Number of rows to generate (default: 10000000)",
+    )
+    parser.add_argument(
+        "--attributes",
+        type=int,
+        default=40,
+        help="Attributes per product (default: 40)",
+    )
+    parser.add_argument(
+        "--values-per-attribute",
+        type=int,
+        default=25,
+        help="Allowable values per product attribute (default: 25)",
+    )
+    parser.add_argument(
+        "--baseline-rows",
+        type=int,
+        default=5000,
+        help=(
+            "Rows to load row by row for comparison, 0 to skip "
+            "(default: 5000)"
+        ),
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "ProductAttributeAllowableValue.csv"
+
+        start = time.perf_counter()
+        generate_file(
+            file_path, args.rows, args.attributes, args.values_per_attribute
+        )
+        logger.info(
+            f"Generated {args.rows} rows "
+            f"({file_path.stat().st_size / 2**20:.0f} MiB) in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+        truncate_target()
+        with ConnectionProvider.psycopgpool() as pool:
+            with pool.connection() as connection:
+                start = time.perf_counter()
+                result = load_partitioned_table(
+                    connection,
+                    RawProductAttributeAllowableValueRecord,
+                    file_path,
+                    COLUMN_MAPPING,
+                )
+                copy_seconds = time.perf_counter() - start
+        copy_rate = result.rows_processed / copy_seconds
+        logger.info(
+            f"COPY loader: {result.rows_processed} rows in "
+            f"{copy_seconds:.1f}s ({copy_rate:,.0f} rows/s)"
+        )
+
+        if args.baseline_rows:
+            truncate_target()
+            start = time.perf_counter()
+            baseline = process_csv_file(
+                file_path,
+                create_product_attribute_allowable_value,
+                column_mapping=COLUMN_MAPPING,
+                row_limit=args.baseline_rows,
+            )
+            baseline_seconds = time.perf_counter() - start
+            baseline_rate = baseline.rows_processed / baseline_seconds
+            logger.info(
+                f"Row by row: {baseline.rows_processed} rows in "
+                f"{baseline_seconds:.1f}s ({baseline_rate:,.0f} rows/s), "
+                f"projected {args.rows / baseline_rate / 3600:.1f}h for "
+                f"{args.rows} rows; COPY loader is "
+                f"{copy_rate / baseline_rate:.0f}x faster"
+            )
+
+
+if __name__ == "__main__":
+    main()
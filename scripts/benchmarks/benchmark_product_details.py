@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmarks FacetIdentificationRepository.get_product_details.
+
+Samples products from the input tables and fetches the details of each,
+once with the single JSON-aggregating statement and once with the four
+queries it replaced (product, categories, attribute values and rich text),
+reporting the per-product latency and round trips of both.
+
+Read only, so it can run against any populated database:
+    python -m scripts.benchmarks.benchmark_product_details --products 1000
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import Any, Callable
+
+from sqlalchemy import Engine, event, func, select
+from sqlalchemy.orm import Session
+
+from src.common.db import db_session
+from src.common.logs import setup_logging
+from src.core.domain.models import ProductDetails
+from src.core.domain.repositories import FacetIdentificationRepository
+from src.core.domain.types import ProductAttributeValue, ProductDescriptor
+from src.core.infrastructure.database.input_data.records import (
+    RawAttributeRecord,
+    RawCategoryRecord,
+    RawProductAttributeValueRecord,
+    RawProductCategoryRecord,
+    RawProductRecord,
+    RawRichTextSourceRecord,
+)
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+def four_query_details(session: Session, product_key: str) -> ProductDetails:
+    """The details as get_product_details assembled them before"""
+    product = session.get(RawProductRecord, product_key)
+    if product is None:
+        raise ValueError(f"No product found with id {product_key}")
+    categories = session.scalars(
+        select(RawCategoryRecord.friendly_name)
+        .join(
+            RawProductCategoryRecord,
+            RawCategoryRecord.category_key
+            == RawProductCategoryRecord.category_key,
+        )
+        .where(RawProductCategoryRecord.product_key == product_key)
+    ).all()
+    attribute_values = session.execute(
+        select(
+            RawAttributeRecord.friendly_name,
+            RawProductAttributeValueRecord.value,
+        )
+        .join(
+            RawProductAttributeValueRecord,
+            RawAttributeRecord.attribute_key
+            == RawProductAttributeValueRecord.attribute_key,
+        )
+        .where(RawProductAttributeValueRecord.product_key == product_key)
+    ).all()
+    descriptions = session.scalars(
+        select(RawRichTextSourceRecord)
+        .where(RawRichTextSourceRecord.product_key == product_key)
+        .order_by(RawRichTextSourceRecord.priority)
+    ).all()
+    return ProductDetails(
+        product_key=product.product_key,
+        product_code=product.system_name,
+        product_name=product.friendly_name,
+        product_description=[
+            ProductDescriptor(descriptor=rt.name, value=rt.content)
+            for rt in descriptions
+        ],
+        categories=list(categories),
+        attributes=[
+            ProductAttributeValue(attribute=attribute, value=value)
+            for attribute, value in attribute_values
+        ],
+        code_type=product.code_type,
+    )
+
+
+def measure(
+    session: Session,
+    product_keys: list[str],
+    fetch: Callable[[str], ProductDetails],
+) -> tuple[list[float], int]:
+    """Per-product latencies in milliseconds, and the round trips made"""
+    round_trips = 0
+
+    def count(*args: Any) -> None:
+        nonlocal round_trips
+        round_trips += 1
+
+    latencies = []
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        for product_key in product_keys:
+            # A fresh identity map, so that no fetch is served from the last.
+            session.expunge_all()
+            start = time.perf_counter()
+            fetch(product_key)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    return latencies, round_trips
+
+
+def comparable(details: ProductDetails) -> tuple[Any, ...]:
+    """The details, with the lists that have no defined order sorted"""
+    return (
+        details.model_copy(update={"categories": [], "attributes": []}),
+        sorted(details.categories),
+        sorted((a.attribute, a.value) for a in details.attributes),
+    )
+
+
+def summarise(name: str, latencies: list[float], round_trips: int) -> str:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return (
+        f"{name:<12}  mean {statistics.fmean(latencies):7.2f}ms  "
+        f"p50 {quantiles[49]:7.2f}ms  p95 {quantiles[94]:7.2f}ms  "
+        f"{round_trips / len(latencies):.1f} round trips/product"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark get_product_details"
+    )
+    parser.add_argument(
+        "--products",
+        type=int,
+        default=1000,
+        help="Number of products to sample (default: 1000)",
+    )
+    args = parser.parse_args()
+
+    with db_session().begin() as session:
+        product_keys = list(
+            session.scalars(
+                select(RawProductRecord.product_key)
+                .order_by(func.random())
+                .limit(args.products)
+            ).all()
+        )
+        if len(product_keys) < 2:
+            parser.error("The database needs at least two products")
+        repository = FacetIdentificationRepository(session)
+
+        # Warm the connection and the statement caches first.
+        repository.get_product_details(product_keys[0])
+        four_query_details(session, product_keys[0])
+
+        for product_key in product_keys[:100]:
+            if comparable(
+                repository.get_product_details(product_key)
+            ) != comparable(four_query_details(session, product_key)):
+                logger.warning(f"Details of {product_key} differ")
+
+        single, single_trips = measure(
+            session, product_keys, repository.get_product_details
+        )
+        four, four_trips = measure(
+            session,
+            product_keys,
+            lambda product_key: four_query_details(session, product_key),
+        )
+
+    speedup = statistics.fmean(four) / statistics.fmean(single)
+    logger.info(
+        f"get_product_details over {len(product_keys)} products:\n"
+        f"{summarise('Single query', single, single_trips)}\n"
+        f"{summarise('Four queries', four, four_trips)}\n"
+        f"Mean latency is {speedup:.1f}x lower"
+    )
+
+
+if __name__ == "__main__":
+    main()
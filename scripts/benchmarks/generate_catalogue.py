@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Generates a synthetic data directory for every file in CSVConfig.
+
+Products, categories and attributes are generated first and every other
+file only references keys that exist, so the directory ingests without
+orphans: a product's attribute values and allowable values all use
+attributes of its category, and its gaps are derived from them on
+ingestion. QA batch files for ingest_qa_files are written to a qa/
+subdirectory. Output is deterministic for a given seed.
+
+    python -m scripts.benchmarks.generate_catalogue --scale 100k \\
+        --directory data/synthetic-100k
+"""
+
+import argparse
+import csv
+import logging
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.config import CSVConfig
+from src.core.csv_ingestion.qa import QA_COLUMN_MAPPING
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+ATTRIBUTE_TYPES = ("Text", "Number", "Boolean", "List")
+UNIT_TYPES = ("", "mm", "cm", "kg", "W", "V")
+RICH_TEXT_NAMES = ("Description", "Features", "Specification")
+QA_ACTIONS = ("Accept", "Reject", "Override")
+
+
+@dataclass(frozen=True)
+class CatalogueShape:
+    """Sizes of a synthetic catalogue, derived from its product count."""
+
+    products: int
+    categories: int
+    attributes: int
+    attributes_per_category: int = 12
+    values_per_product: int = 6
+    gaps_per_product: int = 2
+    allowable_values_per_attribute: int = 5
+    recommendations_per_product: int = 2
+
+    @classmethod
+    def for_products(cls, products: int) -> "CatalogueShape":
+        return cls(
+            products=products,
+            categories=max(products // 200, 10),
+            attributes=min(max(products // 100, 50), 5000),
+        )
+
+    def product_key(self, index: int) -> str:
+        return f"product-{index:08d}"
+
+    def category_key(self, index: int) -> str:
+        return f"category-{index:05d}"
+
+    def attribute_key(self, index: int) -> str:
+        return f"attribute-{index:05d}"
+
+    def category_of(self, product: int) -> int:
+        return product % self.categories
+
+    def category_attributes(self, category: int) -> list[int]:
+        """The attributes of a category, as attribute indexes."""
+        stride = self.attributes // self.attributes_per_category or 1
+        return [
+            (category + i * stride) % self.attributes
+            for i in range(self.attributes_per_category)
+        ]
+
+    def value_attributes(self, product: int) -> list[int]:
+        """The attributes a product has a value for."""
+        attributes = self.category_attributes(self.category_of(product))
+        return attributes[: self.values_per_product]
+
+    def gap_attributes(self, product: int) -> list[int]:
+        """The attributes of a product's category it has no value for."""
+        attributes = self.category_attributes(self.category_of(product))
+        first_gap = self.values_per_product
+        return attributes[first_gap:]
+
+    def category_attribute_key(self, category: int, attribute: int) -> str:
+        return f"category-attribute-{category:05d}-{attribute:05d}"
+
+    def allowable_value(self, attribute: int, index: int) -> str:
+        return f"Value {index} of attribute {attribute}"
+
+
+Row = dict[str, str]
+RowGenerator = Callable[[CatalogueShape, random.Random], Iterator[Row]]
+
+
+def _check_digit(digits: str) -> str:
+    """GS1 check digit for EAN-13, UPC-A and ISBN-13 bodies."""
+    total = sum(
+        int(digit) * (3 if i % 2 else 1)
+        for i, digit in enumerate(reversed(digits), start=1)
+    )
+    return str((10 - total % 10) % 10)
+
+
+def _product_code(index: int, rng: random.Random) -> str:
+    """
+    A unique product code, mixing the identifier types seen in client data.
+    The index is part of every code, so codes never collide.
+    """
+    kind = rng.random()
+    if kind < 0.6:
+        body = f"50{index:010d}"
+    elif kind < 0.8:
+        body = f"0{index:010d}"
+    elif kind < 0.85:
+        body = f"978{index:09d}"
+    else:
+        return f"SKU{index:07X}"
+    return body + _check_digit(body)
+
+
+def _products(shape: CatalogueShape, rng: random.Random) -> Iterator[Row]:
+    for i in range(shape.products):
+        yield {
+            "product_key": shape.product_key(i),
+            "system_name": _product_code(i, rng),
+            "friendly_name": f"Synthetic product {i}",
+        }
+
+
+def _categories(shape: CatalogueShape, rng: random.Random) -> Iterator[Row]:
+    for i in range(shape.categories):
+        yield {
+            "category_key": shape.category_key(i),
+            "system_name": f"CAT{i:05d}",
+            "friendly_name": f"Category {i}",
+        }
+
+
+def _attributes(shape: CatalogueShape, rng: random.Random) -> Iterator[Row]:
+    for i in range(shape.attributes):
+        yield {
+            "attribute_key": shape.attribute_key(i),
+            "system_name": f"ATTR{i:05d}",
+            "friendly_name": f"Attribute {i}",
+            "attribute_type": ATTRIBUTE_TYPES[i % len(ATTRIBUTE_TYPES)],
+            "unit_measure_type": UNIT_TYPES[i % len(UNIT_TYPES)],
+        }
+
+
+def _product_categories(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for i in range(shape.products):
+        yield {
+            "product_key": shape.product_key(i),
+            "category_key": shape.category_key(shape.category_of(i)),
+        }
+
+
+def _category_attributes(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for category in range(shape.categories):
+        for attribute in shape.category_attributes(category):
+            yield {
+                "category_attribute_key": shape.category_attribute_key(
+                    category, attribute
+                ),
+                "category_key": shape.category_key(category),
+                "attribute_key": shape.attribute_key(attribute),
+            }
+
+
+def _product_attribute_values(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for i in range(shape.products):
+        for attribute in shape.value_attributes(i):
+            yield {
+                "product_key": shape.product_key(i),
+                "attribute_key": shape.attribute_key(attribute),
+                "value": shape.allowable_value(
+                    attribute,
+                    rng.randrange(shape.allowable_values_per_attribute),
+                ),
+            }
+
+
+def _product_attribute_allowable_values(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for i in range(shape.products):
+        gaps = shape.gap_attributes(i)
+        for attribute in gaps[: shape.gaps_per_product]:
+            for value in range(shape.allowable_values_per_attribute):
+                yield {
+                    "product_key": shape.product_key(i),
+                    "attribute_key": shape.attribute_key(attribute),
+                    "value": shape.allowable_value(attribute, value),
+                }
+
+
+def _category_allowable_values(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for category in range(shape.categories):
+        for attribute in shape.category_attributes(category):
+            unit = UNIT_TYPES[attribute % len(UNIT_TYPES)]
+            for value in range(shape.allowable_values_per_attribute):
+                numeric = bool(unit) and value == 0
+                yield {
+                    "category_attribute_key": shape.category_attribute_key(
+                        category, attribute
+                    ),
+                    "value": shape.allowable_value(attribute, value),
+                    "unit_type": unit,
+                    "minimum_value": "0" if numeric else "",
+                    "minimum_unit": unit if numeric else "",
+                    "maximum_value": "100" if numeric else "",
+                    "maximum_unit": unit if numeric else "",
+                    "range_qualifier": "Between" if numeric else "",
+                }
+
+
+def _recommendations(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for i in range(shape.products):
+        gaps = shape.gap_attributes(i)
+        for attribute in gaps[: shape.recommendations_per_product]:
+            yield {
+                "product_key": shape.product_key(i),
+                "attribute_key": shape.attribute_key(attribute),
+                "value": shape.allowable_value(
+                    attribute,
+                    rng.randrange(shape.allowable_values_per_attribute),
+                ),
+                "confidence": f"{rng.random():.3f}",
+            }
+
+
+def _rich_text_sources(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for i in range(shape.products):
+        for priority, name in enumerate(RICH_TEXT_NAMES, start=1):
+            yield {
+                "product_key": shape.product_key(i),
+                "content": (
+                    f"<p>{name} of synthetic product {i}.</p>\n"
+                    f"<ul><li>Feature {rng.randrange(1000)}</li></ul>"
+                ),
+                "name": name,
+                "priority": str(priority),
+            }
+
+
+def _globally_allowed_values(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for attribute in range(0, shape.attributes, 10):
+        for value in range(shape.allowable_values_per_attribute):
+            yield {
+                "attribute_key": shape.attribute_key(attribute),
+                "value": shape.allowable_value(attribute, value),
+            }
+
+
+def _allowable_values_in_any_category(
+    shape: CatalogueShape, rng: random.Random
+) -> Iterator[Row]:
+    for attribute in range(shape.attributes):
+        for value in range(shape.allowable_values_per_attribute):
+            yield {
+                "attribute_key": shape.attribute_key(attribute),
+                "value": shape.allowable_value(attribute, value),
+            }
+
+
+def _qa_batch(
+    shape: CatalogueShape, rng: random.Random, batch: int
+) -> Iterator[Row]:
+    # Each batch reviews a different one in a hundred products.
+    for i in range(batch % 100, shape.products, 100):
+        attribute = shape.category_attributes(shape.category_of(i))[-1]
+        value = shape.allowable_value(
+            attribute, rng.randrange(shape.allowable_values_per_attribute)
+        )
+        action = rng.choice(QA_ACTIONS)
+        yield {
+            "product_reference": shape.product_key(i),
+            "attribute_reference": shape.attribute_key(attribute),
+            "attribute_name": f"Attribute {attribute}",
+            "recommendation": value,
+            "unit": UNIT_TYPES[attribute % len(UNIT_TYPES)],
+            "override": value if action == "Override" else "",
+            "alternative_override": "",
+            "action": action,
+            "link_to_site": f"https://example.com/products/{i}",
+            "comment": "",
+        }
+
+
+GENERATORS: dict[str, RowGenerator] = {
+    "Product": _products,
+    "Category": _categories,
+    "Attribute": _attributes,
+    "ProductCategory": _product_categories,
+    "CategoryAttribute": _category_attributes,
+    "ProductAttributeValue": _product_attribute_values,
+    "ProductAttributeAllowableValue": _product_attribute_allowable_values,
+    "CategoryAllowableValue": _category_allowable_values,
+    "Recommendation": _recommendations,
+    "RichTextSource": _rich_text_sources,
+    "AttributeAllowableValuesApplicableInEveryCategory": (
+        _globally_allowed_values
+    ),
+    "AttributeAllowableValueInAnyCategory": (
+        _allowable_values_in_any_category
+    ),
+}
+
+
+def _write_csv(
+    file_path: Path, column_mapping: dict[str, str], rows: Iterator[Row]
+) -> int:
+    """Write rows under the headers of column_mapping; return the count."""
+    count = 0
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(column_mapping.keys())
+        for row in rows:
+            writer.writerow(row[name] for name in column_mapping.values())
+            count += 1
+    return count
+
+
+def generate_catalogue(
+    directory: Path, products: int, seed: int = 0
+) -> dict[str, int]:
+    """
+    Write a CSV for every configured file into directory.
+
+    Headers come from each file's column_mapping, so the directory can be
+    passed straight to ingest_files. Returns the row count of each file.
+    """
+    missing = [
+        filename
+        for filename, config in CSVConfig.FILE_CONFIGS.items()
+        if config and filename not in GENERATORS
+    ]
+    if missing:
+        raise ValueError(f"No synthetic generator for: {', '.join(missing)}")
+
+    shape = CatalogueShape.for_products(products)
+    directory.mkdir(parents=True, exist_ok=True)
+    counts: dict[str, int] = {}
+    for filename, config in CSVConfig.FILE_CONFIGS.items():
+        if not config:
+            continue
+        # Each file gets its own stream so that adding a file does not
+        # change the contents of the others.
+        rng = random.Random(f"{seed}:{filename}")
+        rows = _write_csv(
+            directory / f"{filename}.csv",
+            config["column_mapping"],
+            GENERATORS[filename](shape, rng),
+        )
+        counts[filename] = rows
+        logger.debug(f"Generated {rows} rows for {filename}")
+    return counts
+
+
+def generate_qa_batches(
+    directory: Path, products: int, batches: int, seed: int = 0
+) -> dict[str, int]:
+    """
+    Write batches QA files, each reviewing different products, into
+    directory. Returns the row count of each file.
+    """
+    shape = CatalogueShape.for_products(products)
+    directory.mkdir(parents=True, exist_ok=True)
+    counts: dict[str, int] = {}
+    for batch in range(batches):
+        filename = f"QA Batch {batch + 1:02d}"
+        rng = random.Random(f"{seed}:{filename}")
+        counts[filename] = _write_csv(
+            directory / f"{filename}.csv",
+            QA_COLUMN_MAPPING,
+            _qa_batch(shape, rng, batch),
+        )
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic data directory for ingestion"
+    )
+    parser.add_argument(
+        "--directory",
+        type=str,
+        required=True,
+        help="Directory to write the CSV files to",
+    )
+    parser.add_argument(
+        "--scale",
+        choices=SCALES,
+        default="10k",
+        help="Number of products to generate (default: 10k)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed (default: 0)",
+    )
+    parser.add_argument(
+        "--qa-batches",
+        type=int,
+        default=1,
+        help="Number of QA batch files to write to qa/ (default: 1)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    directory = Path(args.directory)
+    counts = generate_catalogue(directory, SCALES[args.scale], args.seed)
+    counts |= generate_qa_batches(
+        directory / "qa", SCALES[args.scale], args.qa_batches, args.seed
+    )
+    logger.info(
+        f"Generated {sum(counts.values())} rows in {len(counts)} files in "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+
+from src.common.db import bootstrap_database
+from src.common.logs import setup_logging
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+def main():
+    argparse.ArgumentParser(
+        description=(
+            "Prepare the database once for the application: install the "
+            "vector extension if it is missing"
+        )
+    ).parse_args()
+
+    try:
+        bootstrap_database()
+        logger.info("Database bootstrapped")
+    except Exception as e:
+        logger.error(f"Error bootstrapping the database: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
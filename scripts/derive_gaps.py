@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+from pathlib import Path
+
+from src.common.db import ConnectionProvider
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.bulk import derive_gaps
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Derive raw_product_attribute_gaps from product categories, "
+            "category attributes and attribute values"
+        )
+    )
+    parser.add_argument(
+        "--products-file",
+        type=str,
+        default=None,
+        help=(
+            "File of product keys to derive gaps for, one per line, such as "
+            "the changed products written by a delta ingestion (default: "
+            "rebuild the gaps of every product)"
+        ),
+    )
+    args = parser.parse_args()
+
+    product_keys = (
+        Path(args.products_file).read_text().split()
+        if args.products_file
+        else None
+    )
+    try:
+        with ConnectionProvider.psycopgpool() as pool:
+            with pool.connection() as connection:
+                derive_gaps(connection, product_keys)
+    except Exception as e:
+        logger.error(f"Error deriving attribute gaps: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
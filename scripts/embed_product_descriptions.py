@@ -2,6 +2,7 @@
 
 import argparse
 import asyncio
+from pathlib import Path
 
 from src.core.embedding_generation.jobs.embed_product_descriptions import (
     create_embeddings_for_products,
@@ -24,13 +25,28 @@ if __name__ == "__main__":
         help="Maximum number of concurrent embedding jobs (default: 10)",
         default=32,
     )
+    parser.add_argument(
+        "--products-file",
+        type=str,
+        help=(
+            "File of product keys to embed, one per line, such as the "
+            "changed products written by a delta ingestion"
+        ),
+        default=None,
+    )
     args = parser.parse_args()
 
     if args.product:
         asyncio.run(embed_single_product(args.product))
     else:
+        product_keys = (
+            Path(args.products_file).read_text().split()
+            if args.products_file
+            else None
+        )
         asyncio.run(
             create_embeddings_for_products(
-                max_concurrency=args.max_concurrency
+                max_concurrency=args.max_concurrency,
+                product_keys=product_keys,
             )
         )
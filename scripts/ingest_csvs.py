@@ -2,6 +2,7 @@
 
 import argparse
 import logging
+from pathlib import Path
 
 from src.common.logs import setup_logging
 from src.core.csv_ingestion import ProductIdentifierType, ingest_files
@@ -41,6 +42,110 @@ def main():
             "(default: auto-detect)"
         ),
     )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help=(
+            "Load CSV files with COPY into a staging table and merge each "
+            "batch set-based instead of inserting row by row"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of files to ingest in parallel, respecting foreign key "
+            "dependencies between files (default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Skip files unchanged since they last completed and continue "
+            "interrupted files from their last checkpoint"
+        ),
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help=(
+            "Apply only the rows inserted, changed or removed since the "
+            "previous load of each CSV file"
+        ),
+    )
+    parser.add_argument(
+        "--changed-products-file",
+        type=str,
+        default=None,
+        help=(
+            "Write the product keys changed by a delta load to this file, "
+            "one per line"
+        ),
+    )
+    parser.add_argument(
+        "--excel-cache-dir",
+        type=str,
+        default=None,
+        help=(
+            "Convert Excel workbooks to CSV in this directory once and read "
+            "the cached CSV on later runs"
+        ),
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of processes parsing each CSV file in bulk mode "
+            "(default: 1)"
+        ),
+    )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help=(
+            "Drop the secondary indexes of the target tables while loading, "
+            "rebuild them afterwards and refresh product_summary"
+        ),
+    )
+    parser.add_argument(
+        "--index-workers",
+        type=int,
+        default=4,
+        help=(
+            "Number of indexes rebuilt at once with --defer-indexes "
+            "(default: 4)"
+        ),
+    )
+    parser.add_argument(
+        "--reject-dir",
+        type=str,
+        default=None,
+        help=(
+            "Validate every file before loading and write its rejected "
+            "rows, with reasons, to <file>.jsonl in this directory; "
+            "nothing is loaded if any row has no parent row"
+        ),
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help=(
+            "Validate every file into --reject-dir (default: rejects) "
+            "without ingesting anything"
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help=(
+            "Ingest files on the async connection pool, parsing each file "
+            "in a thread while earlier batches are written"
+        ),
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -54,12 +159,32 @@ def main():
         logger.debug("Debug logging enabled")
 
     try:
-        ingest_files(
+        report = ingest_files(
             directory=args.directory,
             batch_size=args.batch_size,
             row_limit=args.row_limit,
             identifier_type=args.code_type,
+            bulk=args.bulk,
+            workers=args.workers,
+            resume=args.resume,
+            delta=args.delta,
+            excel_cache_dir=args.excel_cache_dir,
+            parse_workers=args.parse_workers,
+            defer_indexes=args.defer_indexes,
+            index_workers=args.index_workers,
+            reject_dir=args.reject_dir,
+            validate_only=args.validate_only,
+            use_async=args.use_async,
         )
+        if args.changed_products_file:
+            product_keys = report.changed_product_keys
+            Path(args.changed_products_file).write_text(
+                "".join(f"{key}\n" for key in product_keys)
+            )
+            logger.info(
+                f"Wrote {len(product_keys)} changed product keys to "
+                f"{args.changed_products_file}"
+            )
     except Exception as e:
         logger.error(f"Error during raw data ingestion: {str(e)}")
         raise
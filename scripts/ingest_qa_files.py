@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+
+from src.common.logs import setup_logging
+from src.core.csv_ingestion import ingest_qa_files
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest QA batch files into human_recommendations"
+    )
+    parser.add_argument(
+        "pattern",
+        type=str,
+        help=(
+            "Glob pattern matching the QA batch files, CSV or Excel "
+            "(e.g. 'data/qa/*.xlsx')"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files parsed in parallel (default: 4)",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug logging",
+    )
+
+    args = parser.parse_args()
+
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+        logger.debug("Debug logging enabled")
+
+    try:
+        ingest_qa_files(args.pattern, workers=args.workers)
+    except Exception as e:
+        logger.error(f"Error during QA ingestion: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
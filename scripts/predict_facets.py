@@ -3,6 +3,7 @@ import argparse
 import asyncio
 import logging
 from datetime import datetime
+from pathlib import Path
 
 from src.common.db import SessionLocal
 from src.core.facet_inference.orchestration.orchestrator import (
@@ -35,7 +36,22 @@ async def main():
         help="Run experiment for a single product key",
         default=None,
     )
+    parser.add_argument(
+        "--products-file",
+        type=str,
+        help=(
+            "Restrict the experiment to the product keys in this file, one "
+            "per line, such as the changed products written by a delta "
+            "ingestion"
+        ),
+        default=None,
+    )
     args = parser.parse_args()
+    product_keys = (
+        set(Path(args.products_file).read_text().split())
+        if args.products_file
+        else None
+    )
 
     with SessionLocal() as session:
         # Create orchestrator
@@ -58,7 +74,7 @@ async def main():
             experiment_key = await orchestrator.run_experiment(limit=1)
         else:
             experiment_key = await orchestrator.run_experiment(
-                limit=args.limit
+                limit=args.limit, product_keys=product_keys
             )
 
         end_time = datetime.now()
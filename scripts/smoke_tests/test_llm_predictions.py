@@ -19,8 +19,8 @@ from scripts.smoke_tests.utils import (
     get_product_key,
     write_output,
 )
-from src.common.db import SessionLocal
-from src.core.domain.repositories import FacetIdentificationRepository
+from src.common.db import AsyncSessionLocal
+from src.core.domain.repositories import AsyncFacetIdentificationRepository
 from src.core.facet_inference.service import FacetInferenceService
 
 logger = logging.getLogger(__name__)
@@ -99,8 +99,8 @@ async def main(
         output_dir = get_output_dir(product_key, output_dir)
         logger.debug(f"Output directory: {output_dir}")
 
-        with SessionLocal() as session:
-            repository = FacetIdentificationRepository(session)
+        async with AsyncSessionLocal() as session:
+            repository = AsyncFacetIdentificationRepository(session)
             service = FacetInferenceService(repository)
             predictions = await service.predict_for_product_key(
                 product_key, evaluation_mode=False
@@ -7,6 +7,7 @@ To use, run:
     python -m scripts.smoke_tests.test_similarity_search [optional product_key]
 """
 
+import asyncio
 import logging
 from pathlib import Path
 
@@ -44,7 +45,7 @@ def format_similar_product(result) -> str:
     )
 
 
-def main(
+async def main(
     product_key: str | None = None, output_dir: Path | None = None
 ) -> None:
     """Run the similarity search test."""
@@ -56,7 +57,7 @@ def main(
         logger.info(f"Starting similarity search for product: {product_key}")
 
         service = SimilaritySearchService()
-        results = service.find_similar_products(
+        results = await service.find_similar_products(
             product_key=product_key,
             limit=5,
             max_distance=1.8,
@@ -117,4 +118,4 @@ def main(
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import argparse
+import logging
+from pathlib import Path
+
+from src.common.db import db_session
+from src.common.logs import setup_logging
+from src.config import config
+from src.core.infrastructure.database.input_data.reference_snapshot import (
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+setup_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Write the memory-mapped snapshot of attributes, categories and "
+            "allowable values that API workers map at startup"
+        )
+    )
+    parser.add_argument(
+        "--path",
+        type=str,
+        default=config.REFERENCE_SNAPSHOT_PATH or None,
+        help="Snapshot file to write (default: REFERENCE_SNAPSHOT_PATH)",
+    )
+    args = parser.parse_args()
+    if not args.path:
+        parser.error(
+            "--path is required when REFERENCE_SNAPSHOT_PATH is unset"
+        )
+
+    try:
+        with db_session().begin() as session:
+            write_snapshot(session, Path(args.path))
+    except Exception as e:
+        logger.error(f"Error writing the reference snapshot: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.dto.facet_inference import FacetPredictionsResponse
-from src.common.db import get_db
+from src.common.db import get_async_db
 from src.core.facet_inference.service import FacetInferenceService
 
 
@@ -13,7 +13,7 @@ def facet_inference_router() -> APIRouter:
         "/predict/{product_key}", response_model=FacetPredictionsResponse
     )
     async def predict_attributes_for_product(
-        product_key: str, db: Session = Depends(get_db)
+        product_key: str, db: AsyncSession = Depends(get_async_db)
     ) -> FacetPredictionsResponse:
         """Predict values for all missing attributes of a product."""
         service = FacetInferenceService.from_session(db)
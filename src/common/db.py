@@ -1,11 +1,20 @@
-from typing import Any, Generator, cast
+from functools import cache
+from typing import Any, AsyncGenerator, Generator, cast
 from uuid import UUID, uuid4
 
+import psycopg
 from dotenv import load_dotenv
+from pgvector.psycopg import register_vector_async
 from pgvector.psycopg2 import register_vector
 from psycopg_pool import ConnectionPool
 from psycopg_pool.pool_async import AsyncConnectionPool
-from sqlalchemy import Engine, MetaData, create_engine, event, text
+from sqlalchemy import Engine, MetaData, create_engine, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from src.config import config
@@ -13,7 +22,15 @@ from src.config import config
 load_dotenv()
 
 
+# Key of the advisory lock that serialises bootstrap_database calls.
+BOOTSTRAP_LOCK_KEY = 123456
+
+
 def setup_database() -> Engine:
+    """
+    Create the SQLAlchemy engine. No connection is opened until the engine
+    is first used.
+    """
     engine = create_engine(
         f"postgresql://{config.DB_USER}:{config.DB_PASSWORD}"
         f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}"
@@ -21,24 +38,82 @@ def setup_database() -> Engine:
         pool_size=config.DB_POOL_SIZE,
         max_overflow=config.DB_MAX_OVERFLOW,
     )
+    event.listen(engine, "connect", connect)
+    return engine
+
+
+@cache
+def get_engine() -> Engine:
+    """The process-wide engine, created on first use."""
+    return setup_database()
+
+
+def setup_async_database() -> AsyncEngine:
+    """
+    Create the asyncio SQLAlchemy engine, on psycopg 3. No connection is
+    opened until the engine is first used.
+    """
+    engine = create_async_engine(
+        f"postgresql+psycopg://{config.DB_USER}:{config.DB_PASSWORD}"
+        f"@{config.DB_HOST}:{config.DB_PORT}/{config.DB_NAME}"
+        f'{"" if not config.DB_USE_SSL else "?sslmode=require"}',
+        pool_size=config.DB_ASYNC_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+    )
+    event.listen(engine.sync_engine, "connect", connect_async)
+    return engine
+
 
-    # Check if vector extension is installed once with lock to avoid race
-    # condition
-    with engine.connect() as connection:
-        connection.execute(text("SELECT pg_advisory_lock(123456)"))
+@cache
+def get_async_engine() -> AsyncEngine:
+    """The process-wide asyncio engine, created on first use."""
+    return setup_async_database()
+
+
+def bootstrap_database() -> None:
+    """
+    Prepare a database for the application: install the vector extension
+    if it is missing. Run once per database (scripts/bootstrap_database.py)
+    rather than on every start. An advisory lock makes concurrent calls
+    safe.
+    """
+    with psycopg.connect(
+        ConnectionProvider.connection_url(), autocommit=True
+    ) as connection:
+        connection.execute(
+            "SELECT pg_advisory_lock(%s)", (BOOTSTRAP_LOCK_KEY,)
+        )
         try:
-            result = connection.execute(
-                text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")
-            )
-            if not result.scalar():
-                connection.execute(
-                    text("CREATE EXTENSION IF NOT EXISTS vector")
-                )
-                connection.commit()
+            installed = connection.execute(
+                "SELECT 1 FROM pg_extension WHERE extname = 'vector'"
+            ).fetchone()
+            if not installed:
+                connection.execute("CREATE EXTENSION IF NOT EXISTS vector")
         finally:
-            connection.execute(text("SELECT pg_advisory_unlock(123456)"))
+            connection.execute(
+                "SELECT pg_advisory_unlock(%s)", (BOOTSTRAP_LOCK_KEY,)
+            )
 
-    return engine
+
+class LazySessionmaker(sessionmaker[Session]):
+    """A sessionmaker bound to get_engine() when the first session opens."""
+
+    def __call__(self, **local_kw: Any) -> Session:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class LazyAsyncSessionmaker(async_sessionmaker[AsyncSession]):
+    """
+    An async_sessionmaker bound to get_async_engine() when the first
+    session opens.
+    """
+
+    def __call__(self, **local_kw: Any) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_async_engine())
+        return super().__call__(**local_kw)
 
 
 class ConnectionProvider:
@@ -85,25 +160,30 @@ class ConnectionProvider:
         return conninfo
 
 
-engine = setup_database()
-
 metadata = MetaData()
 Base = declarative_base(metadata=metadata)
-SessionLocal: sessionmaker = sessionmaker(engine)
+SessionLocal: sessionmaker = LazySessionmaker()
+# Objects stay usable after commit: async sessions cannot lazy-load them.
+AsyncSessionLocal: async_sessionmaker[AsyncSession] = LazyAsyncSessionmaker(
+    expire_on_commit=False
+)
 
 
-try:
-    with engine.connect() as connection:
-        print("Connection to DB successful!")
-except Exception as e:
-    raise Exception("Failed to connect to DB") from e
+def __getattr__(name: str) -> Any:
+    # The engine used to be created at import time as src.common.db.engine.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-@event.listens_for(engine, "connect")
 def connect(dbapi_connection: Any, _: Any) -> None:
     register_vector(dbapi_connection, arrays=True)
 
 
+def connect_async(dbapi_connection: Any, _: Any) -> None:
+    dbapi_connection.run_async(register_vector_async)
+
+
 def db_session() -> sessionmaker:
     return SessionLocal
 
@@ -119,3 +199,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get asyncio database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
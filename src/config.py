@@ -78,6 +78,15 @@ class Config:
         os.getenv("SIMILARITY_DEFAULT_DISTANCE", "0.6")
     )
 
+    # Reference Data Cache Configuration
+    REFERENCE_CACHE_CHECK_SECONDS: float = float(
+        os.getenv("REFERENCE_CACHE_CHECK_SECONDS", "30")
+    )
+    REFERENCE_SNAPSHOT_PATH: str = os.getenv("REFERENCE_SNAPSHOT_PATH", "")
+    ALLOWABLE_VALUES_CACHE_SIZE: int = int(
+        os.getenv("ALLOWABLE_VALUES_CACHE_SIZE", "100000")
+    )
+
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
@@ -1,7 +1,12 @@
+from src.core.csv_ingestion.qa import ingest_qa_files
+from src.core.csv_ingestion.report import FileReport, IngestionReport
 from src.core.csv_ingestion.service import ingest_files
 from src.core.domain.product_identifiers import ProductIdentifierType
 
 __all__ = [
+    "FileReport",
+    "IngestionReport",
     "ingest_files",
+    "ingest_qa_files",
     "ProductIdentifierType",
 ]
@@ -0,0 +1,34 @@
+from src.core.csv_ingestion.bulk.async_writer import AsyncBulkWriter
+from src.core.csv_ingestion.bulk.copy_loader import load_partitioned_table
+from src.core.csv_ingestion.bulk.delta import apply_delta
+from src.core.csv_ingestion.bulk.gaps import derive_gaps
+from src.core.csv_ingestion.bulk.indexes import (
+    SecondaryIndex,
+    drop_indexes,
+    find_deferrable_indexes,
+    rebuild_indexes,
+    refresh_materialized_views,
+)
+from src.core.csv_ingestion.bulk.merge import StagingMerge, build_merge_sql
+from src.core.csv_ingestion.bulk.validation import (
+    RejectReason,
+    StagingValidator,
+)
+from src.core.csv_ingestion.bulk.writer import BulkWriter
+
+__all__ = [
+    "apply_delta",
+    "AsyncBulkWriter",
+    "BulkWriter",
+    "SecondaryIndex",
+    "StagingMerge",
+    "StagingValidator",
+    "build_merge_sql",
+    "derive_gaps",
+    "drop_indexes",
+    "find_deferrable_indexes",
+    "load_partitioned_table",
+    "RejectReason",
+    "rebuild_indexes",
+    "refresh_materialized_views",
+]
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from types import TracebackType
+from typing import Any, Sequence
+from uuid import uuid4
+
+from psycopg import AsyncConnection
+
+from src.core.csv_ingestion.bulk.merge import (
+    ROW_NUMBER_COLUMN,
+    StagingMerge,
+    build_merge_sql,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBulkWriter:
+    """
+    Asyncio counterpart of BulkWriter, for a connection from the async
+    psycopg pool.
+
+    Each batch is copied into a temporary staging table and merged into its
+    raw_* table in one transaction, exactly like BulkWriter. A batch's
+    prepare step runs in a worker thread so that it does not block the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        connection: AsyncConnection[Any],
+        model: Any,
+        merge: StagingMerge,
+        columns: Sequence[str],
+    ) -> None:
+        self.connection = connection
+        self.model = model
+        self.merge = merge
+        self.columns = [*columns, *merge.derived_columns]
+        self.staging_table = (
+            f"staging_{model.__table__.name}_{uuid4().hex[:8]}"
+        )
+        self._merge_sql = build_merge_sql(
+            model, merge, self.staging_table, self.columns
+        )
+
+    async def __aenter__(self) -> "AsyncBulkWriter":
+        column_definitions = ", ".join(
+            f"{column} TEXT" for column in self.columns
+        )
+        await self.connection.execute(
+            f"CREATE TEMP TABLE {self.staging_table} ("
+            f"{ROW_NUMBER_COLUMN} BIGINT GENERATED ALWAYS AS IDENTITY, "
+            f"{column_definitions}) ON COMMIT DELETE ROWS"
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.connection.execute(
+            f"DROP TABLE IF EXISTS {self.staging_table}"
+        )
+
+    async def write_batch(self, rows: list[dict[str, str]]) -> int:
+        """
+        Copy a batch into staging and merge it into the target table.
+
+        Returns the number of rows inserted into the target.
+        """
+        if not rows:
+            return 0
+
+        if self.merge.prepare is not None:
+            await asyncio.to_thread(self.merge.prepare, rows)
+
+        async with self.connection.transaction():
+            async with self.connection.cursor() as cursor:
+                async with cursor.copy(
+                    f"COPY {self.staging_table} ({', '.join(self.columns)}) "
+                    "FROM STDIN"
+                ) as copy:
+                    for row in rows:
+                        await copy.write_row(
+                            [row[column] for column in self.columns]
+                        )
+
+                await cursor.execute(f"ANALYZE {self.staging_table}")
+                await cursor.execute(self._merge_sql)
+                inserted = max(cursor.rowcount, 0)
+
+        logger.debug(
+            f"Merged {inserted} of {len(rows)} staged rows into "
+            f"{self.model.__table__.name}"
+        )
+        return inserted
@@ -0,0 +1,202 @@
+import csv
+import logging
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from psycopg import Connection, Cursor
+
+from src.core.csv_ingestion.processors.csv_processor import iter_csv_rows
+from src.core.csv_ingestion.processors.types import ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK_SIZE = 1 << 20
+MAINTENANCE_WORK_MEM = "1GB"
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+def header_staging_columns(
+    file_path: Path, column_mapping: dict[str, str]
+) -> list[str]:
+    """Name a staging column for every header column, in file order."""
+    with open(file_path, newline="", encoding="utf-8-sig") as csvfile:
+        header = next(csv.reader(csvfile))
+    return [
+        column_mapping.get(name, f"_unmapped_{position}")
+        for position, name in enumerate(header)
+    ]
+
+
+def copy_file(
+    cursor: Cursor[Any],
+    staging_table: str,
+    file_path: Path,
+    columns: list[str],
+) -> int:
+    """Stream the raw bytes of a CSV file into staging."""
+    with cursor.copy(
+        f"COPY {staging_table} ({', '.join(columns)}) "
+        "FROM STDIN WITH (FORMAT csv, HEADER true)"
+    ) as copy:
+        with open(file_path, "rb") as csvfile:
+            chunk = csvfile.read(COPY_CHUNK_SIZE)
+            copy.write(chunk.removeprefix(UTF8_BOM))
+            while chunk := csvfile.read(COPY_CHUNK_SIZE):
+                copy.write(chunk)
+    return cursor.rowcount
+
+
+def _copy_rows(
+    cursor: Cursor[Any],
+    staging_table: str,
+    file_path: Path,
+    column_mapping: dict[str, str],
+    row_limit: int,
+) -> int:
+    """Copy the first row_limit parsed rows of a CSV file into staging."""
+    columns = list(column_mapping.values())
+    with cursor.copy(
+        f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN"
+    ) as copy:
+        rows = iter_csv_rows(file_path, column_mapping)
+        for row in islice(rows, row_limit):
+            copy.write_row([row[column] for column in columns])
+    return cursor.rowcount
+
+
+def _detach_indexes(cursor: Cursor[Any], table: str) -> list[str]:
+    """
+    Drop the primary key and secondary indexes of an empty table and return
+    the statements that rebuild them.
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'p'",
+        (table,),
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename = %s AND indexname NOT IN ("
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)",
+        (table, table),
+    )
+    indexes = cursor.fetchall()
+
+    rebuild = [
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+        for name, definition in constraints
+    ]
+    # Indexes on a partitioned parent are reported as "ON ONLY", which
+    # would not cascade to the partitions when recreated.
+    rebuild += [
+        definition.replace(" ON ONLY ", " ON ", 1) for _, definition in indexes
+    ]
+
+    for name, _ in constraints:
+        cursor.execute(f"ALTER TABLE {table} DROP CONSTRAINT {name}")
+    for name, _ in indexes:
+        cursor.execute(f"DROP INDEX {name}")
+    return rebuild
+
+
+def load_partitioned_table(
+    connection: Connection[Any],
+    model: Any,
+    file_path: Path,
+    column_mapping: dict[str, str],
+    row_limit: int | None = None,
+) -> ProcessingResult:
+    """
+    Load a very large CSV into a table whose primary key is its natural key.
+
+    The file is streamed into a temporary staging table with a single COPY.
+    When the target is empty its primary key and indexes are dropped, the
+    distinct rows are inserted, and the indexes are rebuilt once at the end;
+    otherwise rows are merged with ON CONFLICT DO NOTHING. Everything runs in
+    one transaction, so a failed load leaves the target untouched.
+    """
+    table = model.__table__.name
+    key_columns = [column.name for column in model.__table__.primary_key]
+    key_list = ", ".join(key_columns)
+    staging_table = f"staging_{table}_{uuid4().hex[:8]}"
+    if row_limit:
+        staging_columns = list(column_mapping.values())
+    else:
+        staging_columns = header_staging_columns(file_path, column_mapping)
+    timings: dict[str, float] = {}
+
+    logger.debug(f"Loading {file_path} into {table} with COPY")
+
+    with connection.transaction():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"
+            )
+            column_definitions = ", ".join(
+                f"{column} TEXT" for column in staging_columns
+            )
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging_table} ({column_definitions}) "
+                "ON COMMIT DROP"
+            )
+
+            start = time.perf_counter()
+            if row_limit:
+                staged = _copy_rows(
+                    cursor, staging_table, file_path, column_mapping, row_limit
+                )
+            else:
+                staged = copy_file(
+                    cursor, staging_table, file_path, staging_columns
+                )
+            timings["copy"] = time.perf_counter() - start
+
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+            row = cursor.fetchone()
+            target_empty = row is not None and not row[0]
+
+            start = time.perf_counter()
+            if target_empty:
+                rebuild = _detach_indexes(cursor, table)
+                cursor.execute(
+                    f"INSERT INTO {table} ({key_list}) "
+                    f"SELECT DISTINCT {key_list} FROM {staging_table}"
+                )
+            else:
+                rebuild = []
+                cursor.execute(
+                    f"INSERT INTO {table} ({key_list}) "
+                    f"SELECT DISTINCT {key_list} FROM {staging_table} "
+                    "ON CONFLICT DO NOTHING"
+                )
+            inserted = max(cursor.rowcount, 0)
+            timings["insert"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for statement in rebuild:
+                cursor.execute(statement)
+            timings["index"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    connection.execute(f"ANALYZE {table}")
+    timings["analyze"] = time.perf_counter() - start
+
+    logger.debug(
+        f"Loaded {table}: "
+        + ", ".join(f"{phase} {secs:.1f}s" for phase, secs in timings.items())
+    )
+    rows_skipped = staged - inserted
+    logger.info(
+        f"Processed {inserted} rows from {file_path.name} "
+        f"({rows_skipped} duplicates skipped)"
+    )
+
+    return ProcessingResult(
+        rows_processed=inserted,
+        rows_skipped=rows_skipped,
+        total_processed=staged,
+    )
@@ -0,0 +1,232 @@
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Any, Sequence
+from uuid import uuid4
+
+from psycopg import Connection, Cursor
+from sqlalchemy.dialects import postgresql
+
+from src.core.csv_ingestion.bulk.merge import (
+    ROW_NUMBER_COLUMN,
+    STAGING_ALIAS,
+    StagingMerge,
+    build_merge_sql,
+    merge_columns,
+)
+from src.core.csv_ingestion.processors.csv_processor import iter_csv_rows
+from src.core.csv_ingestion.processors.types import DeltaResult
+
+logger = logging.getLogger(__name__)
+
+ROW_HASH_TABLE = "ingestion_row_hashes"
+
+
+def _joined(expressions: Sequence[str]) -> str:
+    """
+    Join SQL expressions into a single text value: a JSON array of their
+    text, which keeps NULLs in place and can be split again.
+    """
+    parts = ", ".join(f"({expression})::text" for expression in expressions)
+    return f"json_build_array({parts})::text"
+
+
+def _key_matches(model: Any, natural_key: Sequence[str], row_key: str) -> str:
+    """
+    Match the target's natural key columns (aliased t) with the parts of
+    row_key, a key built by _joined. The target columns are compared bare,
+    so that the lookup can use their index; like the merge, a key with a
+    NULL part matches nothing.
+    """
+    columns = model.__table__.columns
+    return " AND ".join(
+        f"t.{key} = CAST(({row_key})::json->>{i} AS "
+        f"{columns[key].type.compile(dialect=postgresql.dialect())})"
+        for i, key in enumerate(natural_key)
+    )
+
+
+def _stage_file(
+    cursor: Cursor[Any],
+    staging_table: str,
+    columns: list[str],
+    merge: StagingMerge,
+    file_path: Path,
+    column_mapping: dict[str, str],
+    batch_size: int,
+) -> int:
+    """Copy every row of a file into staging, preparing it in batches."""
+    staged = 0
+    rows = iter_csv_rows(file_path, column_mapping)
+    with cursor.copy(
+        f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN"
+    ) as copy:
+        while batch := list(islice(rows, batch_size)):
+            if merge.prepare is not None:
+                merge.prepare(batch)
+            for row in batch:
+                copy.write_row([row[column] for column in columns])
+            staged += len(batch)
+    return staged
+
+
+def _product_keys(cursor: Cursor[Any]) -> set[str]:
+    return {row[0] for row in cursor.fetchall() if row[0]}
+
+
+def apply_delta(
+    connection: Connection[Any],
+    filename: str,
+    model: Any,
+    merge: StagingMerge,
+    file_path: Path,
+    column_mapping: dict[str, str],
+    batch_size: int = 1000,
+) -> DeltaResult:
+    """
+    Apply a file as a delta against the previous load of the same file.
+
+    Every row is hashed on its natural key and compared with the hashes
+    recorded in ingestion_row_hashes last time. Only new keys are inserted,
+    keys whose row hash changed are updated, and keys that disappeared are
+    deleted. The whole file is applied in one transaction.
+
+    The first delta load of a file has no previous hashes, so every row
+    counts as new; rows already in the target are left as they are.
+    """
+    table = model.__table__.name
+    columns = [*column_mapping.values(), *merge.derived_columns]
+    suffix = uuid4().hex[:8]
+    staging_table = f"staging_{table}_{suffix}"
+    delta_table = f"delta_{table}_{suffix}"
+    changes_table = f"changes_{table}_{suffix}"
+
+    expressions = merge_columns(model, merge, columns)
+    key_expressions = [expressions[key] for key in merge.natural_key]
+    has_product_key = "product_key" in expressions
+    returning = " RETURNING t.product_key" if has_product_key else ""
+    updates = {
+        column: expression
+        for column, expression in expressions.items()
+        if column not in merge.natural_key and column not in merge.insert_only
+    }
+
+    logger.debug(f"Applying {file_path} to {table} as a delta")
+
+    with connection.transaction():
+        with connection.cursor() as cursor:
+            column_definitions = ", ".join(
+                f"{column} TEXT" for column in columns
+            )
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging_table} ("
+                f"{ROW_NUMBER_COLUMN} BIGINT GENERATED ALWAYS AS IDENTITY, "
+                f"{column_definitions}) ON COMMIT DROP"
+            )
+            staged = _stage_file(
+                cursor,
+                staging_table,
+                columns,
+                merge,
+                file_path,
+                column_mapping,
+                batch_size,
+            )
+            cursor.execute(f"ANALYZE {staging_table}")
+
+            staged_values = [f"{STAGING_ALIAS}.{column}" for column in columns]
+            cursor.execute(
+                f"CREATE TEMP TABLE {delta_table} ON COMMIT DROP AS "
+                "SELECT DISTINCT ON (row_key) row_key, row_hash, "
+                f"{ROW_NUMBER_COLUMN} FROM ("
+                f"SELECT {_joined(key_expressions)} AS row_key, "
+                f"md5({_joined(staged_values)}) AS row_hash, "
+                f"{STAGING_ALIAS}.{ROW_NUMBER_COLUMN} "
+                f"FROM {staging_table} {STAGING_ALIAS} {merge.joins}"
+                f") keyed ORDER BY row_key, {ROW_NUMBER_COLUMN}"
+            )
+            cursor.execute(
+                f"CREATE TEMP TABLE {changes_table} ON COMMIT DROP AS "
+                "SELECT coalesce(d.row_key, h.row_key) AS row_key, "
+                f"d.{ROW_NUMBER_COLUMN}, CASE "
+                "WHEN h.row_key IS NULL THEN 'insert' "
+                "WHEN d.row_key IS NULL THEN 'delete' "
+                "ELSE 'update' END AS change "
+                f"FROM {delta_table} d FULL JOIN ("
+                f"SELECT row_key, row_hash FROM {ROW_HASH_TABLE} "
+                "WHERE filename = %(filename)s"
+                ") h ON h.row_key = d.row_key "
+                "WHERE h.row_hash IS DISTINCT FROM d.row_hash",
+                {"filename": filename},
+            )
+
+            cursor.execute(
+                f"DELETE FROM {table} t USING {changes_table} c "
+                "WHERE c.change = 'delete' AND "
+                f"{_key_matches(model, merge.natural_key, 'c.row_key')}"
+                f"{returning}"
+            )
+            deleted = max(cursor.rowcount, 0)
+            product_keys = _product_keys(cursor) if has_product_key else set()
+
+            updated = 0
+            if updates:
+                assignments = ", ".join(
+                    f"{column} = {expression}"
+                    for column, expression in updates.items()
+                )
+                matches = " AND ".join(
+                    f"t.{key} = {expression}"
+                    for key, expression in zip(
+                        merge.natural_key, key_expressions
+                    )
+                )
+                cursor.execute(
+                    f"UPDATE {table} t SET {assignments} "
+                    f"FROM {staging_table} {STAGING_ALIAS} {merge.joins} "
+                    f"JOIN {changes_table} c ON c.change = 'update' "
+                    f"AND c.{ROW_NUMBER_COLUMN} = "
+                    f"{STAGING_ALIAS}.{ROW_NUMBER_COLUMN} "
+                    f"WHERE {matches}{returning}"
+                )
+                updated = max(cursor.rowcount, 0)
+                if has_product_key:
+                    product_keys |= _product_keys(cursor)
+
+            cursor.execute(
+                build_merge_sql(model, merge, staging_table, columns)
+                + (" RETURNING product_key" if has_product_key else "")
+            )
+            inserted = max(cursor.rowcount, 0)
+            if has_product_key:
+                product_keys |= _product_keys(cursor)
+
+            cursor.execute(
+                f"DELETE FROM {ROW_HASH_TABLE} h USING {changes_table} c "
+                "WHERE h.filename = %(filename)s AND h.row_key = c.row_key",
+                {"filename": filename},
+            )
+            cursor.execute(
+                f"INSERT INTO {ROW_HASH_TABLE} (filename, row_key, row_hash) "
+                "SELECT %(filename)s, d.row_key, d.row_hash "
+                f"FROM {delta_table} d JOIN {changes_table} c "
+                "ON c.row_key = d.row_key WHERE c.change <> 'delete'",
+                {"filename": filename},
+            )
+
+    changed = inserted + updated + deleted
+    logger.info(
+        f"Applied {file_path.name} as a delta: {inserted} inserted, "
+        f"{updated} updated, {deleted} deleted, "
+        f"{len(product_keys)} products affected"
+    )
+
+    return DeltaResult(
+        rows_processed=changed,
+        rows_skipped=max(staged - inserted - updated, 0),
+        total_processed=staged,
+        rows_inserted=inserted,
+        rows_updated=updated,
+        rows_deleted=deleted,
+        changed_product_keys=sorted(product_keys),
+    )
@@ -0,0 +1,67 @@
+import logging
+import time
+from typing import Any, Sequence
+
+from psycopg import Connection
+
+logger = logging.getLogger(__name__)
+
+GAPS_TABLE = "raw_product_attribute_gaps"
+
+# A gap is an attribute of one of a product's categories that the product
+# has no value for.
+_GAPS_SELECT = (
+    "SELECT DISTINCT pc.product_key, ca.attribute_key "
+    "FROM raw_product_categories pc "
+    "JOIN raw_category_attributes ca ON ca.category_key = pc.category_key "
+    "WHERE NOT EXISTS (SELECT 1 FROM raw_product_attribute_values pav "
+    "WHERE pav.product_key = pc.product_key "
+    "AND pav.attribute_key = ca.attribute_key)"
+)
+
+
+def derive_gaps(
+    connection: Connection[Any], product_keys: Sequence[str] | None = None
+) -> int:
+    """
+    Rebuild raw_product_attribute_gaps from the categories, category
+    attributes and attribute values already loaded.
+
+    Without product_keys every gap is replaced. With product_keys only the
+    gaps of those products are, which is enough after a delta load that
+    changed nothing but their categories or values. Either way the old
+    gaps are deleted and the new ones written with a single INSERT ...
+    SELECT, in one transaction. Returns the number of gaps written.
+    """
+    start = time.perf_counter()
+    with connection.transaction():
+        with connection.cursor() as cursor:
+            if product_keys is None:
+                cursor.execute(f"TRUNCATE {GAPS_TABLE}")
+                cursor.execute(
+                    f"INSERT INTO {GAPS_TABLE} (product_key, attribute_key) "
+                    f"{_GAPS_SELECT}"
+                )
+            else:
+                keys = list(product_keys)
+                cursor.execute(
+                    f"DELETE FROM {GAPS_TABLE} WHERE product_key = ANY(%s)",
+                    (keys,),
+                )
+                cursor.execute(
+                    f"INSERT INTO {GAPS_TABLE} (product_key, attribute_key) "
+                    f"{_GAPS_SELECT} AND pc.product_key = ANY(%s)",
+                    (keys,),
+                )
+            derived = max(cursor.rowcount, 0)
+
+    scope = (
+        "all products"
+        if product_keys is None
+        else f"{len(product_keys)} products"
+    )
+    logger.info(
+        f"Derived {derived} attribute gaps for {scope} in "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+    return derived
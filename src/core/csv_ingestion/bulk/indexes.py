@@ -0,0 +1,123 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+from psycopg import Connection
+from psycopg_pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_WORK_MEM = "1GB"
+
+
+@dataclass(frozen=True)
+class SecondaryIndex:
+    """A secondary index dropped for a load, and how to recreate it."""
+
+    name: str
+    table: str
+    definition: str
+
+
+def find_deferrable_indexes(
+    connection: Connection[Any], table: str, natural_key: Sequence[str]
+) -> list[SecondaryIndex]:
+    """
+    The secondary indexes of table that a load does not need.
+
+    Indexes backing a primary key or unique constraint are always kept, as
+    are indexes leading with the first natural key column when no
+    constraint does: set-based merges probe the target on its natural key,
+    and without such an index every batch would scan the whole table.
+    """
+    rows = connection.execute(
+        "SELECT i.relname, pg_get_indexdef(ix.indexrelid), a.attname, "
+        "EXISTS (SELECT 1 FROM pg_constraint c "
+        "WHERE c.conindid = ix.indexrelid) "
+        "FROM pg_index ix "
+        "JOIN pg_class i ON i.oid = ix.indexrelid "
+        "LEFT JOIN pg_attribute a "
+        "ON a.attrelid = ix.indrelid AND a.attnum = ix.indkey[0] "
+        "WHERE ix.indrelid = %s::regclass",
+        (table,),
+    ).fetchall()
+
+    leading_key = natural_key[0] if natural_key else None
+    key_served = any(
+        is_constraint and column == leading_key
+        for _, _, column, is_constraint in rows
+    )
+    return [
+        # Indexes on a partitioned parent are reported as "ON ONLY", which
+        # would not cascade to the partitions when recreated.
+        SecondaryIndex(name, table, definition.replace(" ON ONLY ", " ON ", 1))
+        for name, definition, column, is_constraint in rows
+        if not is_constraint and (key_served or column != leading_key)
+    ]
+
+
+def drop_indexes(
+    connection: Connection[Any], indexes: Sequence[SecondaryIndex]
+) -> None:
+    """Drop indexes in a single transaction."""
+    with connection.transaction():
+        for index in indexes:
+            connection.execute(f"DROP INDEX IF EXISTS {index.name}")
+    logger.info(f"Dropped {len(indexes)} secondary indexes")
+
+
+def _rebuild_index(pool: ConnectionPool[Any], index: SecondaryIndex) -> float:
+    start = time.perf_counter()
+    with pool.connection() as connection:
+        with connection.transaction():
+            connection.execute(
+                f"SET LOCAL maintenance_work_mem = '{MAINTENANCE_WORK_MEM}'"
+            )
+            connection.execute(index.definition)
+    seconds = time.perf_counter() - start
+    logger.debug(f"Rebuilt {index.name} in {seconds:.1f}s")
+    return seconds
+
+
+def rebuild_indexes(
+    pool: ConnectionPool[Any],
+    indexes: Sequence[SecondaryIndex],
+    workers: int = 4,
+) -> None:
+    """
+    Recreate indexes, building up to workers of them at once, each on its
+    own connection from pool.
+
+    Every index is attempted even if another fails; the first error is
+    raised once all builds have finished.
+    """
+    if not indexes:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_rebuild_index, pool, index) for index in indexes
+        ]
+    first_error: BaseException | None = None
+    for index, future in zip(indexes, futures):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Failed to rebuild {index.name}: {error}")
+            first_error = first_error or error
+    if first_error is not None:
+        raise first_error
+    logger.info(f"Rebuilt {len(indexes)} secondary indexes")
+
+
+def refresh_materialized_views(
+    connection: Connection[Any], views: Sequence[str]
+) -> None:
+    """
+    Refresh materialized views without blocking their readers. Each view
+    needs a unique index.
+    """
+    for view in views:
+        start = time.perf_counter()
+        connection.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+        logger.info(f"Refreshed {view} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Float, Integer
+
+STAGING_ALIAS = "s"
+ROW_NUMBER_COLUMN = "_row"
+
+
+@dataclass(frozen=True)
+class StagingMerge:
+    """
+    Describes how a staged file is merged into its raw_* table.
+
+    natural_key lists the target columns the per-row units of work use to
+    detect duplicates. select overrides the SQL expression used for a target
+    column; anything not overridden is copied from the staging column of the
+    same name. Expressions refer to the staging table as "s" and may use any
+    tables brought in through joins. prepare can add derived columns (listed
+    in derived_columns) to each batch before it is copied. insert_only lists
+    generated columns that are set when a row is inserted and left alone
+    when a delta load updates it. references maps staging columns that
+    are resolved through joins rather than foreign keys to the
+    "table.column" they must exist in, so validation can check them.
+    """
+
+    natural_key: tuple[str, ...]
+    select: dict[str, str] = field(default_factory=dict)
+    joins: str = ""
+    derived_columns: tuple[str, ...] = ()
+    prepare: Callable[[list[dict[str, str]]], None] | None = None
+    insert_only: tuple[str, ...] = ()
+    references: dict[str, str] = field(default_factory=dict)
+
+
+def _cast(column: Any) -> str:
+    """Cast a TEXT staging column to the type of the target column."""
+    expression = f"{STAGING_ALIAS}.{column.name}"
+    if isinstance(column.type, Float):
+        return f"NULLIF(trim({expression}), '')::double precision"
+    if isinstance(column.type, Integer):
+        return f"NULLIF(trim({expression}), '')::integer"
+    return expression
+
+
+def merge_columns(
+    model: Any, merge: StagingMerge, staging_columns: Sequence[str]
+) -> dict[str, str]:
+    """Map each target column that can be filled to its SQL expression."""
+    columns: dict[str, str] = {}
+    for column in model.__table__.columns:
+        if column.name in merge.select:
+            columns[column.name] = merge.select[column.name]
+        elif column.name in staging_columns:
+            columns[column.name] = _cast(column)
+    return columns
+
+
+def build_merge_sql(
+    model: Any,
+    merge: StagingMerge,
+    staging_table: str,
+    staging_columns: Sequence[str],
+) -> str:
+    """
+    Build the set-based INSERT that moves a staged batch into its target.
+
+    Rows whose natural key already exists in the target, or appears earlier
+    in the batch, are skipped, matching the first-wins behaviour of the
+    per-row units of work. Without a natural key every row is inserted.
+    """
+    table = model.__table__.name
+    columns = merge_columns(model, merge, staging_columns)
+    if not merge.natural_key:
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"SELECT {', '.join(columns.values())} "
+            f"FROM {staging_table} {STAGING_ALIAS} {merge.joins} "
+            f"ORDER BY {STAGING_ALIAS}.{ROW_NUMBER_COLUMN}"
+        )
+
+    key_expressions = [columns[key] for key in merge.natural_key]
+    key_list = ", ".join(key_expressions)
+    existing = " AND ".join(
+        f"t.{key} = {expression}"
+        for key, expression in zip(merge.natural_key, key_expressions)
+    )
+
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"SELECT DISTINCT ON ({key_list}) {', '.join(columns.values())} "
+        f"FROM {staging_table} {STAGING_ALIAS} {merge.joins} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {existing}) "
+        f"ORDER BY {key_list}, {STAGING_ALIAS}.{ROW_NUMBER_COLUMN} "
+        "ON CONFLICT DO NOTHING"
+    )
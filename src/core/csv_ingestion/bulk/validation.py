@@ -0,0 +1,238 @@
+import json
+import logging
+from collections import Counter
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterator
+from uuid import uuid4
+
+from psycopg import Connection, Cursor
+
+from src.core.csv_ingestion.bulk.copy_loader import (
+    copy_file,
+    header_staging_columns,
+)
+from src.core.csv_ingestion.bulk.merge import (
+    ROW_NUMBER_COLUMN,
+    STAGING_ALIAS,
+    StagingMerge,
+    merge_columns,
+)
+from src.core.csv_ingestion.processors.excel_processor import iter_excel_rows
+from src.core.csv_ingestion.processors.types import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+
+class RejectReason(str, Enum):
+    MISSING_PARENT = "missing_parent"
+    DUPLICATE_IN_FILE = "duplicate_in_file"
+    ALREADY_LOADED = "already_loaded"
+
+
+# Each check selects: row, reason, column, value, duplicate_of, record.
+_RECORD = f"to_jsonb({STAGING_ALIAS}) - '{ROW_NUMBER_COLUMN}'"
+
+
+class StagingValidator:
+    """
+    Validates files by staging them and checking every row at once.
+
+    Each file is copied into a temporary table, then one anti-join per
+    reference finds rows whose parent key does not exist, and one window
+    query per file finds natural keys repeated within the file or already
+    in the target. Rejected rows are written as JSON lines, one report per
+    file in reject_dir.
+
+    Staging tables are dropped on commit, so files validated in the same
+    transaction stay staged: a parent file validated earlier counts as
+    loaded when its children are checked, which is how a whole directory
+    is validated before anything is ingested.
+    """
+
+    def __init__(self, connection: Connection[Any], reject_dir: Path) -> None:
+        self.connection = connection
+        self.reject_dir = reject_dir
+        self._staged: dict[str, tuple[str, list[str]]] = {}
+
+    def _stage(
+        self,
+        cursor: Cursor[Any],
+        table: str,
+        file_path: Path,
+        column_mapping: dict[str, str],
+    ) -> tuple[str, list[str], int]:
+        staging_table = f"validate_{table}_{uuid4().hex[:8]}"
+        if file_path.suffix.lower() == ".xlsx":
+            columns = list(column_mapping.values())
+        else:
+            columns = header_staging_columns(file_path, column_mapping)
+        column_definitions = ", ".join(f"{column} TEXT" for column in columns)
+        cursor.execute(
+            f"CREATE TEMP TABLE {staging_table} ("
+            f"{ROW_NUMBER_COLUMN} BIGINT GENERATED ALWAYS AS IDENTITY, "
+            f"{column_definitions}) ON COMMIT DROP"
+        )
+
+        if file_path.suffix.lower() == ".xlsx":
+            with cursor.copy(
+                f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN"
+            ) as copy:
+                for row in iter_excel_rows(file_path, column_mapping):
+                    copy.write_row([row[column] for column in columns])
+            staged = cursor.rowcount
+        else:
+            staged = copy_file(cursor, staging_table, file_path, columns)
+        cursor.execute(f"ANALYZE {staging_table}")
+        return staging_table, columns, staged
+
+    def _missing_parent_checks(
+        self,
+        model: Any,
+        merge: StagingMerge,
+        staging_table: str,
+        columns: list[str],
+    ) -> Iterator[str]:
+        references = dict(merge.references)
+        for column in model.__table__.columns:
+            if column.name in merge.select or column.name not in columns:
+                continue
+            for foreign_key in column.foreign_keys:
+                references[column.name] = (
+                    f"{foreign_key.column.table.name}."
+                    f"{foreign_key.column.name}"
+                )
+
+        for column, reference in references.items():
+            parent_table, parent_column = reference.split(".")
+            value = f"{STAGING_ALIAS}.{column}"
+            absent = (
+                f"NOT EXISTS (SELECT 1 FROM {parent_table} p "
+                f"WHERE p.{parent_column} = {value})"
+            )
+            staged_parent = self._staged.get(parent_table)
+            if staged_parent is not None and parent_column in staged_parent[1]:
+                absent += (
+                    f" AND NOT EXISTS (SELECT 1 FROM {staged_parent[0]} p "
+                    f"WHERE p.{parent_column} = {value})"
+                )
+            yield (
+                f"SELECT {STAGING_ALIAS}.{ROW_NUMBER_COLUMN}, "
+                f"'{RejectReason.MISSING_PARENT.value}', '{column}', "
+                f"{value}, NULL::bigint, {_RECORD} "
+                f"FROM {staging_table} {STAGING_ALIAS} WHERE {absent}"
+            )
+
+    def _duplicate_checks(
+        self,
+        model: Any,
+        merge: StagingMerge,
+        staging_table: str,
+        columns: list[str],
+    ) -> Iterator[str]:
+        if not merge.natural_key:
+            return
+        table = model.__table__.name
+        expressions = merge_columns(model, merge, columns)
+        key_expressions = [expressions[key] for key in merge.natural_key]
+        key_list = ", ".join(key_expressions)
+        key_value = (
+            f"concat_ws(',', {key_list})"
+            if len(key_expressions) > 1
+            else key_list
+        )
+        key_name = ",".join(merge.natural_key)
+        row = f"{STAGING_ALIAS}.{ROW_NUMBER_COLUMN}"
+
+        yield (
+            f"SELECT {ROW_NUMBER_COLUMN}, "
+            f"'{RejectReason.DUPLICATE_IN_FILE.value}', '{key_name}', "
+            "key_value, first_row, record FROM ("
+            f"SELECT {row}, {key_value} AS key_value, "
+            f"first_value({row}) OVER keys AS first_row, "
+            f"{_RECORD} AS record "
+            f"FROM {staging_table} {STAGING_ALIAS} {merge.joins} "
+            f"WINDOW keys AS (PARTITION BY {key_list} ORDER BY {row})"
+            f") keyed WHERE {ROW_NUMBER_COLUMN} <> first_row"
+        )
+
+        existing = " AND ".join(
+            f"t.{key} = {expression}"
+            for key, expression in zip(merge.natural_key, key_expressions)
+        )
+        yield (
+            f"SELECT {row}, '{RejectReason.ALREADY_LOADED.value}', "
+            f"'{key_name}', {key_value}, NULL::bigint, {_RECORD} "
+            f"FROM {staging_table} {STAGING_ALIAS} {merge.joins} "
+            f"WHERE EXISTS (SELECT 1 FROM {table} t WHERE {existing})"
+        )
+
+    def validate(
+        self,
+        filename: str,
+        model: Any,
+        merge: StagingMerge,
+        file_path: Path,
+        column_mapping: dict[str, str],
+    ) -> ValidationResult:
+        """
+        Stage a file, check it, and write its rejected rows to
+        reject_dir/<filename>.jsonl. Row numbers count data rows from 1.
+        """
+        table = model.__table__.name
+        reasons: Counter[str] = Counter()
+        rejected_rows: set[int] = set()
+        report_path = self.reject_dir / f"{filename}.jsonl"
+        self.reject_dir.mkdir(parents=True, exist_ok=True)
+
+        with self.connection.cursor() as cursor:
+            staging_table, columns, staged = self._stage(
+                cursor, table, file_path, column_mapping
+            )
+            checks = [
+                *self._missing_parent_checks(
+                    model, merge, staging_table, columns
+                ),
+                *self._duplicate_checks(model, merge, staging_table, columns),
+            ]
+            with open(report_path, "w", encoding="utf-8") as report:
+                for check in checks:
+                    for (
+                        row,
+                        reason,
+                        column,
+                        value,
+                        duplicate_of,
+                        record,
+                    ) in cursor.stream(check):
+                        reject = {
+                            "file": filename,
+                            "row": row,
+                            "reason": reason,
+                            "column": column,
+                            "value": value,
+                            "record": record,
+                        }
+                        if duplicate_of is not None:
+                            reject["duplicate_of"] = duplicate_of
+                        report.write(json.dumps(reject) + "\n")
+                        reasons[reason] += 1
+                        rejected_rows.add(row)
+
+        self._staged[table] = (staging_table, columns)
+
+        if rejected_rows:
+            logger.warning(
+                f"{filename}: {len(rejected_rows)} of {staged} rows rejected "
+                f"({', '.join(f'{n} {r}' for r, n in reasons.items())}), "
+                f"see {report_path}"
+            )
+        else:
+            logger.info(f"{filename}: all {staged} rows are valid")
+
+        return ValidationResult(
+            rows_processed=staged - len(rejected_rows),
+            rows_skipped=len(rejected_rows),
+            total_processed=staged,
+            rejections=dict(reasons),
+        )
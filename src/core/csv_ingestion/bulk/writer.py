@@ -0,0 +1,120 @@
+import logging
+from types import TracebackType
+from typing import Any, Iterable, Sequence
+from uuid import uuid4
+
+from psycopg import Connection
+
+from src.core.csv_ingestion.bulk.merge import (
+    ROW_NUMBER_COLUMN,
+    StagingMerge,
+    build_merge_sql,
+)
+from src.core.csv_ingestion.processors.types import ColumnBatch
+
+logger = logging.getLogger(__name__)
+
+
+class BulkWriter:
+    """
+    Streams batches of rows into a temporary staging table with COPY and
+    merges each batch into its raw_* table with a single INSERT ... SELECT.
+
+    Each batch is copied and merged in its own transaction, so the staging
+    table (ON COMMIT DELETE ROWS) is empty again once a batch is written.
+    """
+
+    def __init__(
+        self,
+        connection: Connection[Any],
+        model: Any,
+        merge: StagingMerge,
+        columns: Sequence[str],
+    ) -> None:
+        self.connection = connection
+        self.model = model
+        self.merge = merge
+        self.columns = [*columns, *merge.derived_columns]
+        self.staging_table = (
+            f"staging_{model.__table__.name}_{uuid4().hex[:8]}"
+        )
+        self._merge_sql = build_merge_sql(
+            model, merge, self.staging_table, self.columns
+        )
+
+    def __enter__(self) -> "BulkWriter":
+        column_definitions = ", ".join(
+            f"{column} TEXT" for column in self.columns
+        )
+        self.connection.execute(
+            f"CREATE TEMP TABLE {self.staging_table} ("
+            f"{ROW_NUMBER_COLUMN} BIGINT GENERATED ALWAYS AS IDENTITY, "
+            f"{column_definitions}) ON COMMIT DELETE ROWS"
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.connection.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+
+    def write_columns(self, columns: ColumnBatch) -> int:
+        """
+        Copy a column-oriented batch into staging and merge it.
+
+        Returns the number of rows inserted into the target.
+        """
+        if self.merge.prepare is not None:
+            names = list(columns)
+            return self.write_batch(
+                [dict(zip(names, values)) for values in zip(*columns.values())]
+            )
+        return self._copy_and_merge(
+            zip(*(columns[column] for column in self.columns)),
+            len(next(iter(columns.values()), [])),
+        )
+
+    def write_batch(self, rows: list[dict[str, str]]) -> int:
+        """
+        Copy a batch into staging and merge it into the target table.
+
+        Returns the number of rows inserted into the target.
+        """
+        if not rows:
+            return 0
+
+        if self.merge.prepare is not None:
+            self.merge.prepare(rows)
+
+        return self._copy_and_merge(
+            ([row[column] for column in self.columns] for row in rows),
+            len(rows),
+        )
+
+    def _copy_and_merge(
+        self, values: Iterable[Sequence[str]], count: int
+    ) -> int:
+        if not count:
+            return 0
+
+        with self.connection.transaction():
+            with self.connection.cursor() as cursor:
+                with cursor.copy(
+                    f"COPY {self.staging_table} ({', '.join(self.columns)}) "
+                    "FROM STDIN"
+                ) as copy:
+                    for row in values:
+                        copy.write_row(row)
+
+                cursor.execute(f"ANALYZE {self.staging_table}")
+                cursor.execute(self._merge_sql)
+                inserted = max(cursor.rowcount, 0)
+
+        logger.debug(
+            f"Merged {inserted} of {count} staged rows into "
+            f"{self.model.__table__.name}"
+        )
+        return inserted
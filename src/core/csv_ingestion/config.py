@@ -1,21 +1,23 @@
+from src.core.csv_ingestion.bulk import StagingMerge, load_partitioned_table
 from src.core.csv_ingestion.uow import (
+    assign_code_types,
+    build_category_allowable_value_row,
+    build_recommendation_row,
+    build_rich_text_source_row,
     create_attribute,
     create_attribute_allowable_value_applicable_in_every_category,
     create_attribute_allowable_value_in_any_category,
-    create_bq_batch16_qa_complete,
     create_category,
     create_category_allowable_value,
     create_category_attribute,
     create_product,
     create_product_attribute_allowable_value,
-    create_product_attribute_gap,
     create_product_attribute_value,
     create_product_category,
     create_recommendation,
     create_rich_text_source,
 )
 from src.core.infrastructure.database.input_data.records import (
-    HumanRecommendationRecord,
     RawAttributeAllowableValueApplicableInEveryCategoryRecord,
     RawAttributeAllowableValueInAnyCategoryRecord,
     RawAttributeRecord,
@@ -23,7 +25,6 @@ from src.core.infrastructure.database.input_data.records import (
     RawCategoryAttributeRecord,
     RawCategoryRecord,
     RawProductAttributeAllowableValueRecord,
-    RawProductAttributeGapRecord,
     RawProductAttributeValueRecord,
     RawProductCategoryRecord,
     RawProductRecord,
@@ -39,12 +40,10 @@ create_globally_allowed = (
 )
 
 
-# NOTE: Ingestion takes a very long time if the
-# ProductAttributeAllowableValue.csv is included.
-# It is much more efficient for our purposes to skip over it.
-# This is because the ProductAttributeAllowableValue.csv
-# is a very large file and it takes a very long time to ingest.
-# We can skip over it by not including it in the FILE_CONFIGS.
+# NOTE: ProductAttributeAllowableValue.csv is far too large to ingest row by
+# row. Files with a "loader" are always loaded with it: a single COPY into
+# staging, with the target's indexes rebuilt after the load when it starts
+# empty. Its table is hash partitioned on product_key (see schema/).
 
 
 class CSVConfig:
@@ -59,6 +58,11 @@ class CSVConfig:
                 "SystemName": "system_name",
                 "FriendlyName": "friendly_name",
             },
+            "merge": StagingMerge(
+                natural_key=("system_name",),
+                derived_columns=("code_type",),
+                prepare=assign_code_types,
+            ),
         },
         "Category": {
             "model": RawCategoryRecord,
@@ -68,6 +72,7 @@ class CSVConfig:
                 "SystemName": "system_name",
                 "FriendlyName": "friendly_name",
             },
+            "merge": StagingMerge(natural_key=("system_name",)),
         },
         "Attribute": {
             "model": RawAttributeRecord,
@@ -79,6 +84,7 @@ class CSVConfig:
                 "AttributeType": "attribute_type",
                 "UnitMeasureType": "unit_measure_type",
             },
+            "merge": StagingMerge(natural_key=("system_name",)),
         },
         "ProductCategory": {
             "model": RawProductCategoryRecord,
@@ -87,6 +93,7 @@ class CSVConfig:
                 "ProductKey": "product_key",
                 "CategoryKey": "category_key",
             },
+            "merge": StagingMerge(natural_key=("product_key", "category_key")),
         },
         "CategoryAttribute": {
             "model": RawCategoryAttributeRecord,
@@ -96,6 +103,9 @@ class CSVConfig:
                 "CategoryKey": "category_key",
                 "AttributeKey": "attribute_key",
             },
+            "merge": StagingMerge(
+                natural_key=("category_key", "attribute_key")
+            ),
         },
         "ProductAttributeValue": {
             "model": RawProductAttributeValueRecord,
@@ -105,14 +115,11 @@ class CSVConfig:
                 "AttributeKey": "attribute_key",
                 "Value": "value",
             },
-        },
-        "ProductAttributeGaps": {
-            "model": RawProductAttributeGapRecord,
-            "create_func": create_product_attribute_gap,
-            "column_mapping": {
-                "ProductKey": "product_key",
-                "AttributeKey": "attribute_key",
-            },
+            # The table's primary key: a product holds one value per
+            # attribute, so later values for the same attribute are skipped.
+            "merge": StagingMerge(
+                natural_key=("product_key", "attribute_key")
+            ),
         },
         "ProductAttributeAllowableValue": {
             "model": RawProductAttributeAllowableValueRecord,
@@ -122,6 +129,7 @@ class CSVConfig:
                 "AttributeKey": "attribute_key",
                 "Value": "value",
             },
+            "loader": load_partitioned_table,
         },
         "CategoryAllowableValue": {
             "model": RawCategoryAllowableValueRecord,
@@ -136,6 +144,36 @@ class CSVConfig:
                 "MaximumUnit": "maximum_unit",
                 "RangeQualifierEnum": "range_qualifier",
             },
+            "merge": StagingMerge(
+                natural_key=("category_key", "attribute_key", "value"),
+                select={
+                    "category_key": "ca.category_key",
+                    "attribute_key": "ca.attribute_key",
+                    "unit_type": "trim(s.unit_type)",
+                    "minimum_value": (
+                        "NULLIF(trim(s.minimum_value), '')::double precision"
+                    ),
+                    "minimum_unit": "trim(s.minimum_unit)",
+                    "maximum_value": (
+                        "NULLIF(trim(s.maximum_value), '')::double precision"
+                    ),
+                    "maximum_unit": "trim(s.maximum_unit)",
+                    "range_qualifier": "trim(s.range_qualifier)",
+                },
+                joins=(
+                    "JOIN raw_category_attributes ca "
+                    "ON ca.category_attribute_key = s.category_attribute_key"
+                ),
+                references={
+                    "category_attribute_key": (
+                        "raw_category_attributes.category_attribute_key"
+                    ),
+                },
+            ),
+            # Rows are resolved through raw_category_attributes, which is not
+            # a foreign key of the model.
+            "depends_on": ("CategoryAttribute",),
+            "build_row": build_category_allowable_value_row,
         },
         "Recommendation": {
             "model": RawRecommendationRecord,
@@ -146,6 +184,15 @@ class CSVConfig:
                 "RecommendedValue": "value",
                 "ConfidenceScore": "confidence",
             },
+            "merge": StagingMerge(
+                natural_key=("product_key", "attribute_key", "value"),
+                select={
+                    "recommendation_key": "gen_random_uuid()::text",
+                    "created_at": "now()",
+                },
+                insert_only=("recommendation_key", "created_at"),
+            ),
+            "build_row": build_recommendation_row,
         },
         "RichTextSource": {
             "model": RawRichTextSourceRecord,
@@ -156,6 +203,12 @@ class CSVConfig:
                 "RichTextName": "name",
                 "RichTextPriority": "priority",
             },
+            "merge": StagingMerge(
+                natural_key=("product_key", "name"),
+                select={"source_key": "gen_random_uuid()::text"},
+                insert_only=("source_key",),
+            ),
+            "build_row": build_rich_text_source_row,
         },
         "AttributeAllowableValuesApplicableInEveryCategory": {
             "model": GloballyAllowedValueRecord,
@@ -164,6 +217,7 @@ class CSVConfig:
                 "AttributeKey": "attribute_key",
                 "AllowableValue": "value",
             },
+            "merge": StagingMerge(natural_key=("attribute_key", "value")),
         },
         "AttributeAllowableValueInAnyCategory": {
             "model": RawAttributeAllowableValueInAnyCategoryRecord,
@@ -172,21 +226,6 @@ class CSVConfig:
                 "AttributeKey": "attribute_key",
                 "Value": "value",
             },
-        },
-        "Output QA file for B&Q Batch 16 - B&Q QA Complete": {
-            "model": HumanRecommendationRecord,
-            "create_func": create_bq_batch16_qa_complete,
-            "column_mapping": {
-                "Product Reference": "product_reference",
-                "Attribute Reference": "attribute_reference",
-                "Attribute Name": "attribute_name",
-                "Recommendation": "recommendation",
-                "Unit": "unit",
-                "Override": "override",
-                "Alternative Override": "alternative_override",
-                "Action": "action",
-                "Link to site": "link_to_site",
-                "Comment": "comment",
-            },
+            "merge": StagingMerge(natural_key=("attribute_key", "value")),
         },
     }
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+
+from src.common.db import db_session
+from src.core.infrastructure.database.input_data.records import (
+    IngestionManifestRecord,
+)
+from src.core.infrastructure.database.input_data.repositories import (
+    IngestionManifestRepository,
+)
+
+
+class IngestionStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def file_fingerprint(file_path: Path) -> str:
+    """
+    Identify a file's contents by its size and modification time, which
+    changes whenever the file is rewritten, without reading it.
+    """
+    stat = file_path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def begin_file(filename: str, fingerprint: str, resume: bool) -> int | None:
+    """
+    Record the start of a file's ingestion and return the row to start from.
+
+    When resuming, a file that completed with the same fingerprint returns
+    None and should be skipped, and an interrupted run of the same file
+    continues after its last committed row. Otherwise the file starts over.
+    """
+    now = datetime.now(timezone.utc)
+    with db_session().begin() as session:
+        repo = IngestionManifestRepository(session)
+        entry = repo.find_by_filename(filename)
+
+        if entry is None:
+            entry = repo.create(
+                IngestionManifestRecord(filename=filename, started_at=now)
+            )
+        elif resume and entry.content_hash == fingerprint:
+            if entry.status == IngestionStatus.COMPLETED:
+                return None
+            entry.status = IngestionStatus.RUNNING
+            entry.updated_at = now
+            return entry.rows_committed
+
+        entry.content_hash = fingerprint
+        entry.rows_committed = 0
+        entry.status = IngestionStatus.RUNNING
+        entry.started_at = now
+        entry.updated_at = now
+        entry.completed_at = None
+        return 0
+
+
+def checkpoint_file(filename: str, rows_committed: int) -> None:
+    """Record that the first rows_committed rows of a file are committed."""
+    with db_session().begin() as session:
+        entry = IngestionManifestRepository(session).get_by_id(filename)
+        entry.rows_committed = rows_committed
+        entry.updated_at = datetime.now(timezone.utc)
+
+
+def finish_file(
+    filename: str, status: IngestionStatus, rows_committed: int | None = None
+) -> None:
+    """Mark a file's ingestion as completed or failed."""
+    now = datetime.now(timezone.utc)
+    with db_session().begin() as session:
+        entry = IngestionManifestRepository(session).get_by_id(filename)
+        entry.status = status
+        entry.updated_at = now
+        if rows_committed is not None:
+            entry.rows_committed = rows_committed
+        if status == IngestionStatus.COMPLETED:
+            entry.completed_at = now
@@ -1,6 +1,25 @@
+from src.core.csv_ingestion.processors.async_pipeline import (
+    process_file_async,
+)
+from src.core.csv_ingestion.processors.bulk_processor import (
+    process_file_bulk,
+)
 from src.core.csv_ingestion.processors.csv_processor import process_csv_file
 from src.core.csv_ingestion.processors.excel_processor import (
+    cache_excel_as_csv,
     process_excel_file,
 )
+from src.core.csv_ingestion.processors.parallel_csv import (
+    has_rfc_quoting,
+    process_csv_file_parallel,
+)
 
-__all__ = ["process_csv_file", "process_excel_file"]
+__all__ = [
+    "cache_excel_as_csv",
+    "has_rfc_quoting",
+    "process_csv_file",
+    "process_csv_file_parallel",
+    "process_excel_file",
+    "process_file_async",
+    "process_file_bulk",
+]
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from tqdm import tqdm
+
+from src.core.csv_ingestion.processors.csv_processor import iter_csv_rows
+from src.core.csv_ingestion.processors.excel_processor import iter_excel_rows
+from src.core.csv_ingestion.processors.types import (
+    AsyncBatchWriter,
+    ProcessingResult,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 4
+
+Batch = list[dict[str, str]]
+
+
+def _read_batches(
+    file_path: Path,
+    batch_size: int,
+    column_mapping: dict[str, str] | None,
+    row_limit: int | None,
+    start_row: int,
+    put: Callable[[Batch | None], None],
+    stop: threading.Event,
+) -> None:
+    """Read and parse a file into batches, handing each one to put."""
+    try:
+        if file_path.suffix.lower() == ".xlsx":
+            rows = iter_excel_rows(file_path, column_mapping)
+        else:
+            rows = iter_csv_rows(file_path, column_mapping)
+        rows = islice(rows, start_row, None)
+        if row_limit:
+            rows = islice(rows, row_limit)
+
+        while not stop.is_set() and (batch := list(islice(rows, batch_size))):
+            put(batch)
+    finally:
+        put(None)
+
+
+async def process_file_async(
+    file_path: Path,
+    writer: AsyncBatchWriter,
+    batch_size: int = 1000,
+    column_mapping: dict[str, str] | None = None,
+    row_limit: int | None = None,
+    start_row: int = 0,
+    on_checkpoint: Callable[[int], Awaitable[None]] | None = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> ProcessingResult:
+    """
+    Stream a CSV or Excel file through an async batch writer, reading and
+    parsing the next batches in a thread while the current one is written.
+
+    At most queue_size parsed batches wait for the writer, so memory stays
+    bounded however far the reader gets ahead. on_checkpoint is awaited
+    with the number of source rows consumed once each batch is committed.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Batch | None] = asyncio.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def put(batch: Batch | None) -> None:
+        # Blocks the reader thread while the queue is full.
+        asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+
+    rows_processed = 0
+    total_processed = 0
+
+    logger.debug(
+        f"Loading {file_path} asynchronously (limit: {row_limit or 'none'})"
+    )
+
+    pbar = tqdm(
+        desc=file_path.name,
+        unit="rows",
+        leave=True,
+        bar_format=(
+            "{l_bar}{bar}| {n_fmt}/{total_fmt} "
+            "[{elapsed}<{remaining}, {rate_fmt}]"
+        ),
+        dynamic_ncols=True,
+        total=None,
+    )
+
+    reader = loop.run_in_executor(
+        None,
+        _read_batches,
+        file_path,
+        batch_size,
+        column_mapping,
+        row_limit,
+        start_row,
+        put,
+        stop,
+    )
+    try:
+        while (batch := await queue.get()) is not None:
+            rows_processed += await writer.write_batch(batch)
+            total_processed += len(batch)
+            pbar.update(len(batch))
+            if on_checkpoint is not None:
+                await on_checkpoint(start_row + total_processed)
+    finally:
+        # If the writer failed, stop the reader and unblock its last put.
+        stop.set()
+        while not reader.done():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                await asyncio.sleep(0.01)
+        pbar.close()
+    await reader
+
+    rows_skipped = total_processed - rows_processed
+    logger.info(
+        f"Processed {rows_processed} rows from {file_path.name} "
+        f"({rows_skipped} duplicates skipped)"
+    )
+
+    return ProcessingResult(
+        rows_processed=rows_processed,
+        rows_skipped=rows_skipped,
+        total_processed=total_processed,
+    )
@@ -0,0 +1,77 @@
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Callable
+
+from tqdm import tqdm
+
+from src.core.csv_ingestion.processors.csv_processor import iter_csv_rows
+from src.core.csv_ingestion.processors.excel_processor import iter_excel_rows
+from src.core.csv_ingestion.processors.types import (
+    BatchWriter,
+    ProcessingResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def process_file_bulk(
+    file_path: Path,
+    writer: BatchWriter,
+    batch_size: int = 1000,
+    column_mapping: dict[str, str] | None = None,
+    row_limit: int | None = None,
+    start_row: int = 0,
+    on_checkpoint: Callable[[int], None] | None = None,
+) -> ProcessingResult:
+    """
+    Stream a CSV or Excel file through a batch writer, such as a BulkWriter
+    (one COPY and merge per batch) or a BatchedUnitOfWork.
+
+    on_checkpoint is called with the number of source rows consumed once
+    each batch has been committed.
+    """
+    rows_processed = 0
+    total_processed = 0
+
+    logger.debug(f"Bulk loading {file_path} (limit: {row_limit or 'none'})")
+
+    pbar = tqdm(
+        desc=file_path.name,
+        unit="rows",
+        leave=True,
+        bar_format=(
+            "{l_bar}{bar}| {n_fmt}/{total_fmt} "
+            "[{elapsed}<{remaining}, {rate_fmt}]"
+        ),
+        dynamic_ncols=True,
+        total=None,
+    )
+
+    if file_path.suffix.lower() == ".xlsx":
+        rows = iter_excel_rows(file_path, column_mapping)
+    else:
+        rows = iter_csv_rows(file_path, column_mapping)
+    rows = islice(rows, start_row, None)
+    if row_limit:
+        rows = islice(rows, row_limit)
+
+    while batch := list(islice(rows, batch_size)):
+        rows_processed += writer.write_batch(batch)
+        total_processed += len(batch)
+        pbar.update(len(batch))
+        if on_checkpoint is not None:
+            on_checkpoint(start_row + total_processed)
+
+    pbar.close()
+    rows_skipped = total_processed - rows_processed
+    logger.info(
+        f"Processed {rows_processed} rows from {file_path.name} "
+        f"({rows_skipped} duplicates skipped)"
+    )
+
+    return ProcessingResult(
+        rows_processed=rows_processed,
+        rows_skipped=rows_skipped,
+        total_processed=total_processed,
+    )
@@ -1,7 +1,8 @@
 import csv
 import logging
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from tqdm import tqdm
 
@@ -10,12 +11,31 @@ from src.core.csv_ingestion.processors.types import ProcessingResult
 logger = logging.getLogger(__name__)
 
 
+def iter_csv_rows(
+    file_path: Path,
+    column_mapping: dict[str, str] | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield the rows of a CSV file, renamed through column_mapping."""
+    with open(file_path, newline="", encoding="utf-8-sig") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for line in reader:
+            if column_mapping:
+                yield {
+                    param_name: line[col_name]
+                    for col_name, param_name in column_mapping.items()
+                }
+            else:
+                yield line
+
+
 def process_csv_file(
     file_path: Path,
     create_func: Callable[..., Any],
     batch_size: int = 1000,
     column_mapping: dict[str, str] | None = None,
     row_limit: int | None = None,
+    start_row: int = 0,
+    on_checkpoint: Callable[[int], None] | None = None,
 ) -> ProcessingResult:
     rows_processed = 0
     rows_skipped = 0
@@ -35,43 +55,37 @@ def process_csv_file(
         total=None,
     )
 
-    with open(file_path, newline="", encoding="utf-8-sig") as csvfile:
-        reader = csv.DictReader(csvfile)
+    rows = islice(iter_csv_rows(file_path, column_mapping), start_row, None)
 
-        while True:
-            batch = []
-            for _ in range(batch_size):
-                try:
-                    line = next(reader)
-                    if column_mapping:
-                        mapped_line = {
-                            param_name: line[col_name]
-                            for col_name, param_name in column_mapping.items()
-                        }
-                    else:
-                        mapped_line = line
-                    batch.append(mapped_line)
-                except StopIteration:
-                    break
-
-            if not batch:
+    while True:
+        batch = []
+        for _ in range(batch_size):
+            try:
+                batch.append(next(rows))
+            except StopIteration:
                 break
 
-            for record in batch:
-                if row_limit and total_processed >= row_limit:
-                    break
-
-                result = create_func(**record)
-                if result is None:
-                    rows_skipped += 1
-                else:
-                    rows_processed += 1
-                total_processed += 1
-                pbar.update(1)
+        if not batch:
+            break
 
+        for record in batch:
             if row_limit and total_processed >= row_limit:
                 break
 
+            result = create_func(**record)
+            if result is None:
+                rows_skipped += 1
+            else:
+                rows_processed += 1
+            total_processed += 1
+            pbar.update(1)
+
+        if on_checkpoint is not None:
+            on_checkpoint(start_row + total_processed)
+
+        if row_limit and total_processed >= row_limit:
+            break
+
     pbar.close()
     logger.info(
         f"Processed {rows_processed} rows from {file_path.name} "
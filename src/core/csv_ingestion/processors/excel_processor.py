@@ -1,6 +1,10 @@
+import csv
+import hashlib
 import logging
+from datetime import date, datetime, time
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 from openpyxl import load_workbook
 from tqdm import tqdm
@@ -10,12 +14,136 @@ from src.core.csv_ingestion.processors.types import ProcessingResult
 logger = logging.getLogger(__name__)
 
 
+def _convert_float(value: float) -> str:
+    # Excel stores every number as a float; keep integral codes like 123.0
+    # as "123".
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _convert_temporal(value: date | time) -> str:
+    return value.isoformat()
+
+
+CELL_CONVERTERS: dict[type, Callable[[Any], str]] = {
+    str: str,
+    int: str,
+    float: _convert_float,
+    bool: str,
+    datetime: _convert_temporal,
+    date: _convert_temporal,
+    time: _convert_temporal,
+}
+
+
+class _ColumnConverter:
+    """Converts the cells of one column, caching the converter per type."""
+
+    def __init__(self) -> None:
+        self._cell_type: type | None = None
+        self._convert: Callable[[Any], str] = str
+
+    def __call__(self, value: Any) -> str:
+        if value is None:
+            return ""
+        if type(value) is not self._cell_type:
+            self._cell_type = type(value)
+            self._convert = CELL_CONVERTERS.get(type(value), str)
+        return self._convert(value)
+
+
+def iter_excel_rows(
+    file_path: Path,
+    column_mapping: dict[str, str] | None = None,
+) -> Iterator[dict[str, str]]:
+    """
+    Yield the data rows of the active worksheet as strings, renamed through
+    column_mapping.
+
+    The workbook is streamed in read-only mode and only cell values are
+    read; the header row is used for the keys and not yielded.
+    """
+    wb = load_workbook(filename=file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        if ws is None:
+            raise ValueError(f"No active worksheet found in {file_path}")
+
+        rows = ws.iter_rows(values_only=True)
+        header = [
+            str(value) if value is not None else "" for value in next(rows, ())
+        ]
+        if column_mapping:
+            positions = [
+                (header.index(col_name), param_name)
+                for col_name, param_name in column_mapping.items()
+            ]
+        else:
+            positions = list(enumerate(header))
+        converters = [_ColumnConverter() for _ in positions]
+
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            yield {
+                name: convert(
+                    values[position] if position < len(values) else None
+                )
+                for (position, name), convert in zip(positions, converters)
+            }
+    finally:
+        wb.close()
+
+
+def cache_excel_as_csv(
+    file_path: Path,
+    cache_dir: Path,
+    column_mapping: dict[str, str] | None = None,
+) -> Path:
+    """
+    Convert a workbook to a CSV of its mapped columns in cache_dir, once.
+
+    The cached file is keyed on the workbook's name, size and modification
+    time, so later runs reuse it until the workbook changes. Its header uses
+    the original column names, so it can be read with the same mapping.
+    """
+    stat = file_path.stat()
+    fingerprint = hashlib.sha256(
+        f"{file_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+    ).hexdigest()[:16]
+    cached = cache_dir / f"{file_path.stem}.{fingerprint}.csv"
+    if cached.exists():
+        logger.debug(f"Using cached CSV {cached} for {file_path.name}")
+        return cached
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    rows = iter_excel_rows(file_path, column_mapping)
+    first = next(rows, None)
+    if column_mapping:
+        columns = list(column_mapping.items())
+    else:
+        columns = [(name, name) for name in first or {}]
+
+    partial = cached.with_suffix(".partial")
+    with open(partial, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow([col_name for col_name, _ in columns])
+        if first is not None:
+            for row in chain([first], rows):
+                writer.writerow([row[name] for _, name in columns])
+    partial.rename(cached)
+
+    logger.info(f"Cached {file_path.name} as {cached}")
+    return cached
+
+
 def process_excel_file(
     file_path: Path,
     create_func: Callable[..., Any],
     batch_size: int = 1000,
     column_mapping: dict[str, str] | None = None,
     row_limit: int | None = None,
+    start_row: int = 0,
+    on_checkpoint: Callable[[int], None] | None = None,
 ) -> ProcessingResult:
     rows_processed = 0
     rows_skipped = 0
@@ -35,67 +163,22 @@ def process_excel_file(
         total=None,
     )
 
-    wb = load_workbook(filename=file_path, read_only=True)
-    ws = wb.active
-    if ws is None:
-        raise ValueError(f"No active worksheet found in {file_path}")
-
-    headers = [
-        str(cell.value) if cell.value is not None else ""
-        for cell in next(ws.rows)
-    ]
-
-    batch = []
-    for row in ws.rows:
-        if row_limit and total_processed >= row_limit:
-            break
-
-        row_dict: dict[str, str] = dict(
-            zip(
-                headers,
-                [
-                    str(cell.value) if cell.value is not None else ""
-                    for cell in row
-                ],
-            )
-        )
-
-        if column_mapping:
-            mapped_row = {
-                param_name: row_dict[col_name]
-                for col_name, param_name in column_mapping.items()
-            }
-        else:
-            mapped_row = row_dict
-
-        batch.append(mapped_row)
-
-        if len(batch) >= batch_size:
-            for record in batch:
-                if row_limit and total_processed >= row_limit:
-                    break
-
-                result = create_func(**record)
-                if result is None:
-                    rows_skipped += 1
-                else:
-                    rows_processed += 1
-                total_processed += 1
-                pbar.update(1)
-
-            batch = []  # Clear batch after processing
-
-    for record in batch:
-        if row_limit and total_processed >= row_limit:
-            break
-
-        result = create_func(**record)
-        if result is None:
-            rows_skipped += 1
-        else:
-            rows_processed += 1
-        total_processed += 1
-        pbar.update(1)
+    rows = islice(iter_excel_rows(file_path, column_mapping), start_row, None)
+    if row_limit:
+        rows = islice(rows, row_limit)
+
+    while batch := list(islice(rows, batch_size)):
+        for record in batch:
+            result = create_func(**record)
+            if result is None:
+                rows_skipped += 1
+            else:
+                rows_processed += 1
+            total_processed += 1
+            pbar.update(1)
+
+        if on_checkpoint is not None:
+            on_checkpoint(start_row + total_processed)
 
     pbar.close()
     logger.info(
@@ -0,0 +1,288 @@
+import csv
+import io
+import logging
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Callable, Iterator
+
+from tqdm import tqdm
+
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.processors.types import (
+    ColumnBatch,
+    ColumnWriter,
+    ProcessingResult,
+)
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK_SIZE = 1 << 16
+DEFAULT_CHUNK_BYTES = 32 << 20
+PROBE_BYTES = 1 << 20
+UTF8_BOM = b"\xef\xbb\xbf"
+
+# A quoted field may run past the end of the probe.
+_FIELD = re.compile(rb'"(?:[^"]|"")*(?:"|\Z)|[^,"\r\n]*')
+_SEPARATOR = re.compile(rb",|\r?\n")
+
+
+def has_rfc_quoting(file_path: Path, probe_bytes: int = PROBE_BYTES) -> bool:
+    """
+    Whether the start of the file quotes fields as RFC 4180 does: a quote
+    only opens a field, and inside one it is doubled or closes the field.
+
+    split_csv tracks quoted fields by quote parity, which a bare quote in an
+    unquoted field throws off.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read(probe_bytes)
+    position = len(UTF8_BOM) if data.startswith(UTF8_BOM) else 0
+    # An unquoted field can be empty, so a field always matches.
+    while (field := _FIELD.match(data, position)) is not None:
+        if field.end() == len(data):
+            return True
+        separator = _SEPARATOR.match(data, field.end())
+        if separator is None:
+            return False
+        position = separator.end()
+    return False
+
+
+def _count_quotes(file_path: Path, start: int, end: int) -> int:
+    """Count the quote characters in a byte range of the file."""
+    count = 0
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(READ_BLOCK_SIZE << 4, remaining))
+            if not block:
+                break
+            count += block.count(b'"')
+            remaining -= len(block)
+    return count
+
+
+def _next_record_start(file_path: Path, position: int, in_quotes: bool) -> int:
+    """
+    Find the first record boundary at or after position.
+
+    A newline only ends a record when it is outside quotes. Doubled quotes
+    inside a quoted field flip the parity twice, so counting quote bytes is
+    enough to track whether a position is inside a field.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(position)
+        while block := file.read(READ_BLOCK_SIZE):
+            offset = 0
+            while (newline := block.find(b"\n", offset)) != -1:
+                in_quotes ^= block.count(b'"', offset, newline) % 2 == 1
+                if not in_quotes:
+                    return position + newline + 1
+                offset = newline + 1
+            in_quotes ^= block.count(b'"', offset) % 2 == 1
+            position += len(block)
+    return position
+
+
+def split_csv(
+    file_path: Path,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    executor: ProcessPoolExecutor | None = None,
+) -> tuple[list[str], list[tuple[int, int]]]:
+    """
+    Split a CSV into byte ranges that each hold whole records.
+
+    Returns the header and the ranges of the data records. Nominal split
+    points are counted for quotes in parallel to know whether each one falls
+    inside a quoted field, and then moved forward to the next newline that
+    is outside quotes, so quoted newlines never straddle two ranges.
+    """
+    size = file_path.stat().st_size
+    with open(file_path, "rb") as file:
+        has_bom = file.read(len(UTF8_BOM)) == UTF8_BOM
+    header_start = len(UTF8_BOM) if has_bom else 0
+    data_start = _next_record_start(file_path, header_start, False)
+
+    with open(file_path, "rb") as file:
+        file.seek(header_start)
+        header_bytes = file.read(data_start - header_start)
+    header = next(csv.reader(io.StringIO(header_bytes.decode("utf-8"))), [])
+
+    nominal = list(range(data_start, size, max(chunk_bytes, 1)))
+    if len(nominal) <= 1:
+        return header, [(data_start, size)] if data_start < size else []
+
+    segments = list(zip(nominal, [*nominal[1:], size]))
+    if executor is not None:
+        counts = list(
+            executor.map(
+                _count_quotes,
+                repeat(file_path),
+                [start for start, _ in segments],
+                [end for _, end in segments],
+            )
+        )
+    else:
+        counts = [_count_quotes(file_path, s, e) for s, e in segments]
+
+    # A nominal start is inside quotes when an odd number of quotes precede
+    # it, counting from the first data byte.
+    aligned = [data_start]
+    in_quotes = False
+    for (start, _), count in zip(segments[1:], counts):
+        in_quotes ^= count % 2 == 1
+        boundary = _next_record_start(file_path, start, in_quotes)
+        if boundary > aligned[-1]:
+            aligned.append(boundary)
+    aligned.append(size)
+
+    ranges = [
+        (start, end) for start, end in zip(aligned, aligned[1:]) if end > start
+    ]
+    return header, ranges
+
+
+def parse_range(
+    file_path: Path,
+    start: int,
+    end: int,
+    header: list[str],
+    column_mapping: dict[str, str] | None = None,
+) -> ColumnBatch:
+    """
+    Parse the records in a byte range into column-oriented lists, renamed
+    through column_mapping.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8")
+
+    if column_mapping:
+        positions = [
+            (header.index(col_name), param_name)
+            for col_name, param_name in column_mapping.items()
+        ]
+    else:
+        positions = list(enumerate(header))
+
+    columns: ColumnBatch = {name: [] for _, name in positions}
+    appenders = [
+        (position, columns[name].append) for position, name in positions
+    ]
+    for record in csv.reader(io.StringIO(text, newline="")):
+        if not record:
+            continue
+        for position, append in appenders:
+            append(record[position] if position < len(record) else "")
+    return columns
+
+
+def iter_csv_column_batches(
+    file_path: Path,
+    column_mapping: dict[str, str] | None = None,
+    workers: int = 2,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> Iterator[ColumnBatch]:
+    """
+    Parse a CSV in a process pool and yield column batches in file order,
+    one per byte range of roughly chunk_bytes.
+    """
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=setup_logging,
+    ) as executor:
+        header, ranges = split_csv(file_path, chunk_bytes, executor)
+        logger.debug(
+            f"Parsing {file_path.name} in {len(ranges)} ranges with "
+            f"{workers} workers"
+        )
+        # Keep a bounded number of ranges in flight so parsed batches do not
+        # pile up in memory when the writer is slower than the parsers.
+        pending: deque[Future[ColumnBatch]] = deque()
+        for start, end in ranges:
+            pending.append(
+                executor.submit(
+                    parse_range, file_path, start, end, header, column_mapping
+                )
+            )
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _batch_length(batch: ColumnBatch) -> int:
+    return len(next(iter(batch.values()), []))
+
+
+def process_csv_file_parallel(
+    file_path: Path,
+    writer: ColumnWriter,
+    workers: int,
+    batch_size: int = 1000,
+    column_mapping: dict[str, str] | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    start_row: int = 0,
+    on_checkpoint: Callable[[int], None] | None = None,
+) -> ProcessingResult:
+    """
+    Parse a CSV with several processes and write the parsed columns, in file
+    order, through writer.write_columns in batches of batch_size rows.
+
+    The file should pass has_rfc_quoting, or its ranges may split records.
+    """
+    rows_processed = 0
+    total_processed = 0
+    to_skip = start_row
+
+    logger.debug(f"Parsing {file_path} with {workers} workers")
+
+    pbar = tqdm(
+        desc=file_path.name,
+        unit="rows",
+        leave=True,
+        bar_format=(
+            "{l_bar}{bar}| {n_fmt}/{total_fmt} "
+            "[{elapsed}<{remaining}, {rate_fmt}]"
+        ),
+        dynamic_ncols=True,
+        total=None,
+    )
+
+    for batch in iter_csv_column_batches(
+        file_path, column_mapping, workers, chunk_bytes
+    ):
+        if to_skip:
+            skipped = min(to_skip, _batch_length(batch))
+            batch = {name: values[skipped:] for name, values in batch.items()}
+            to_skip -= skipped
+        for offset in range(0, _batch_length(batch), batch_size):
+            end = offset + batch_size
+            columns = {
+                name: values[offset:end] for name, values in batch.items()
+            }
+            length = _batch_length(columns)
+            rows_processed += writer.write_columns(columns)
+            total_processed += length
+            pbar.update(length)
+            if on_checkpoint is not None:
+                on_checkpoint(start_row + total_processed)
+
+    pbar.close()
+    rows_skipped = total_processed - rows_processed
+    logger.info(
+        f"Processed {rows_processed} rows from {file_path.name} "
+        f"({rows_skipped} duplicates skipped)"
+    )
+
+    return ProcessingResult(
+        rows_processed=rows_processed,
+        rows_skipped=rows_skipped,
+        total_processed=total_processed,
+    )
@@ -1,3 +1,5 @@
+from typing import Protocol
+
 from pydantic import BaseModel
 
 
@@ -7,3 +9,48 @@ class ProcessingResult(BaseModel):
     rows_processed: int
     rows_skipped: int
     total_processed: int
+
+
+class DeltaResult(ProcessingResult):
+    """Result of applying a file as a delta against its previous load."""
+
+    rows_inserted: int
+    rows_updated: int
+    rows_deleted: int
+    changed_product_keys: list[str]
+
+
+class ValidationResult(ProcessingResult):
+    """
+    Result of validating a staged file: rows_skipped counts the rejected
+    rows, rejections counts them by reason (a row can have several).
+    """
+
+    rejections: dict[str, int]
+
+
+class BatchWriter(Protocol):
+    """Anything that can persist a batch of mapped rows."""
+
+    def write_batch(self, rows: list[dict[str, str]]) -> int:
+        """Write a batch and return the number of rows inserted."""
+        ...
+
+
+class AsyncBatchWriter(Protocol):
+    """Anything that can persist a batch of mapped rows asynchronously."""
+
+    async def write_batch(self, rows: list[dict[str, str]]) -> int:
+        """Write a batch and return the number of rows inserted."""
+        ...
+
+
+ColumnBatch = dict[str, list[str]]
+
+
+class ColumnWriter(Protocol):
+    """Anything that can persist a column-oriented batch of mapped rows."""
+
+    def write_columns(self, columns: ColumnBatch) -> int:
+        """Write a batch and return the number of rows inserted."""
+        ...
@@ -0,0 +1,197 @@
+import glob
+import hashlib
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Iterator
+
+from psycopg import Connection
+
+from src.common.db import ConnectionProvider
+from src.common.logs import setup_logging
+from src.core.csv_ingestion.bulk.merge import ROW_NUMBER_COLUMN
+from src.core.csv_ingestion.processors.csv_processor import iter_csv_rows
+from src.core.csv_ingestion.processors.excel_processor import iter_excel_rows
+from src.core.csv_ingestion.processors.types import ProcessingResult
+from src.core.csv_ingestion.report import FileReport, IngestionReport
+
+logger = logging.getLogger(__name__)
+
+QA_TABLE = "human_recommendations"
+QA_COLUMN_MAPPING = {
+    "Product Reference": "product_reference",
+    "Attribute Reference": "attribute_reference",
+    "Attribute Name": "attribute_name",
+    "Recommendation": "recommendation",
+    "Unit": "unit",
+    "Override": "override",
+    "Alternative Override": "alternative_override",
+    "Action": "action",
+    "Link to site": "link_to_site",
+    "Comment": "comment",
+}
+QA_COLUMNS = list(QA_COLUMN_MAPPING.values())
+QA_SUFFIXES = (".csv", ".xlsx")
+
+# The rows of a parsed QA file and the seconds it took to parse.
+ParsedFile = tuple[list[list[str]], float]
+
+# Separates the values of a row when hashing it, as in delta row hashes.
+_VALUE_SEPARATOR = "\x1f"
+
+
+def recommendation_content_hash(row: dict[str, str]) -> str:
+    """
+    Identify a QA row by its content, so that the same recommendation read
+    from any batch file, on any run, maps to the same human_recommendations
+    row.
+    """
+    values = _VALUE_SEPARATOR.join(row[column] or "" for column in QA_COLUMNS)
+    return hashlib.md5(values.encode("utf-8")).hexdigest()
+
+
+def find_qa_files(pattern: str) -> list[Path]:
+    """The CSV and Excel files matching a glob pattern, sorted by name."""
+    return sorted(
+        Path(path)
+        for path in glob.glob(pattern, recursive=True)
+        if Path(path).suffix.lower() in QA_SUFFIXES
+    )
+
+
+def _parse_qa_file(file_path: Path) -> ParsedFile:
+    """
+    Read a QA batch file into rows of QA_COLUMNS plus their content hash.
+
+    Runs in a worker process, so that workbooks are parsed side by side.
+    """
+    start = time.perf_counter()
+    if file_path.suffix.lower() == ".xlsx":
+        rows = iter_excel_rows(file_path, QA_COLUMN_MAPPING)
+    else:
+        rows = iter_csv_rows(file_path, QA_COLUMN_MAPPING)
+    parsed = [
+        [
+            *(row[column] or "" for column in QA_COLUMNS),
+            recommendation_content_hash(row),
+        ]
+        for row in rows
+    ]
+    return parsed, time.perf_counter() - start
+
+
+def _parse_in_order(
+    executor: ProcessPoolExecutor, file_paths: list[Path], ahead: int
+) -> Iterator[tuple[Path, list[list[str]], float]]:
+    """
+    Parse files in the executor and yield each one, in order, as soon as it
+    is parsed. At most ahead files are parsed beyond the one being merged,
+    so parsed files do not pile up in memory when merging is slower.
+    """
+    pending: deque[tuple[Path, Future[ParsedFile]]] = deque()
+    for file_path in file_paths:
+        pending.append((file_path, executor.submit(_parse_qa_file, file_path)))
+        if len(pending) > ahead:
+            path, parsed = pending.popleft()
+            yield path, *parsed.result()
+    while pending:
+        path, parsed = pending.popleft()
+        yield path, *parsed.result()
+
+
+def _merge_batch(
+    connection: Connection[Any],
+    staging_table: str,
+    source_batch: str,
+    rows: list[list[str]],
+) -> int:
+    """
+    Copy one batch file into staging and insert the recommendations that
+    are not loaded yet. Returns the number of rows inserted.
+    """
+    columns = [*QA_COLUMNS, "content_hash"]
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {staging_table}")
+        with cursor.copy(
+            f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(f"ANALYZE {staging_table}")
+        cursor.execute(
+            f"INSERT INTO {QA_TABLE} ({', '.join(columns)}, source_batch) "
+            f"SELECT DISTINCT ON (content_hash) {', '.join(columns)}, %s "
+            f"FROM {staging_table} "
+            f"ORDER BY content_hash, {ROW_NUMBER_COLUMN} "
+            "ON CONFLICT (content_hash) DO NOTHING",
+            (source_batch,),
+        )
+        return max(cursor.rowcount, 0)
+
+
+def ingest_qa_files(pattern: str, workers: int = 4) -> IngestionReport:
+    """
+    Load every QA batch file matching pattern into human_recommendations.
+
+    Files are parsed in up to workers processes and merged in name order,
+    in one transaction, while later files are still being parsed. Each
+    recommendation is keyed on a hash of its content: rows already loaded,
+    by this run or an earlier one, are skipped, so re-running the same
+    batches changes nothing. source_batch records the file (without its
+    suffix) a recommendation was first loaded from.
+    """
+    file_paths = find_qa_files(pattern)
+    if not file_paths:
+        raise ValueError(f"No QA files match {pattern}")
+    logger.info(f"Ingesting {len(file_paths)} QA batch files")
+
+    start = time.perf_counter()
+    files: list[FileReport] = []
+    staging_table = f"staging_{QA_TABLE}"
+    column_definitions = ", ".join(
+        f"{column} TEXT" for column in [*QA_COLUMNS, "content_hash"]
+    )
+    with (
+        ConnectionProvider.psycopgpool() as pool,
+        pool.connection() as connection,
+        connection.transaction(),
+        ProcessPoolExecutor(
+            max_workers=min(workers, len(file_paths)),
+            mp_context=get_context("spawn"),
+            initializer=setup_logging,
+        ) as executor,
+    ):
+        connection.execute(
+            f"CREATE TEMP TABLE {staging_table} ("
+            f"{ROW_NUMBER_COLUMN} BIGINT GENERATED ALWAYS AS IDENTITY, "
+            f"{column_definitions}) ON COMMIT DROP"
+        )
+        for file_path, rows, parse_seconds in _parse_in_order(
+            executor, file_paths, workers
+        ):
+            merge_start = time.perf_counter()
+            inserted = _merge_batch(
+                connection, staging_table, file_path.stem, rows
+            )
+            files.append(
+                FileReport(
+                    filename=file_path.name,
+                    seconds=parse_seconds + time.perf_counter() - merge_start,
+                    result=ProcessingResult(
+                        rows_processed=inserted,
+                        rows_skipped=len(rows) - inserted,
+                        total_processed=len(rows),
+                    ),
+                )
+            )
+            logger.debug(
+                f"{file_path.name}: {inserted} of {len(rows)} "
+                "recommendations are new"
+            )
+
+    report = IngestionReport(files=files, seconds=time.perf_counter() - start)
+    logger.info(f"QA ingestion finished:\n{report.format()}")
+    return report
@@ -0,0 +1,48 @@
+from pydantic import BaseModel
+
+from src.core.csv_ingestion.processors.types import (
+    DeltaResult,
+    ProcessingResult,
+)
+
+
+class FileReport(BaseModel):
+    """Outcome and timing of ingesting a single file."""
+
+    filename: str
+    seconds: float
+    result: ProcessingResult
+
+
+class IngestionReport(BaseModel):
+    """Outcome and timing of an ingestion run."""
+
+    files: list[FileReport]
+    seconds: float
+    phases: dict[str, float] = {}
+
+    @property
+    def changed_product_keys(self) -> list[str]:
+        """Product keys touched by files that were applied as a delta."""
+        keys: set[str] = set()
+        for file in self.files:
+            if isinstance(file.result, DeltaResult):
+                keys.update(file.result.changed_product_keys)
+        return sorted(keys)
+
+    def format(self) -> str:
+        """Render the report as a table, slowest file first."""
+        width = max((len(file.filename) for file in self.files), default=4)
+        lines = [
+            f"{'File':<{width}}  {'Seconds':>9}  {'Rows':>12}  {'Skipped':>12}"
+        ]
+        for file in sorted(self.files, key=lambda f: f.seconds, reverse=True):
+            lines.append(
+                f"{file.filename:<{width}}  {file.seconds:>9.1f}  "
+                f"{file.result.rows_processed:>12}  "
+                f"{file.result.rows_skipped:>12}"
+            )
+        lines.append(f"{'Total':<{width}}  {self.seconds:>9.1f}")
+        for phase, seconds in self.phases.items():
+            lines.append(f"{phase.capitalize():<{width}}  {seconds:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,114 @@
+import logging
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from multiprocessing import get_context
+from typing import Any, Callable, TypeVar
+
+from src.common.logs import setup_logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def build_dependency_graph(
+    file_configs: dict[str, dict[str, Any]],
+) -> dict[str, set[str]]:
+    """
+    Map each configured file to the files that must be ingested before it.
+
+    Dependencies come from the foreign keys of each file's model, plus any
+    files listed under "depends_on" for lookups that are not foreign keys.
+    """
+    files_by_table = {
+        config["model"].__table__.name: filename
+        for filename, config in file_configs.items()
+        if config
+    }
+
+    graph: dict[str, set[str]] = {}
+    for filename, config in file_configs.items():
+        if not config:
+            continue
+        dependencies = set(config.get("depends_on", ()))
+        for column in config["model"].__table__.columns:
+            for foreign_key in column.foreign_keys:
+                parent = files_by_table.get(foreign_key.column.table.name)
+                if parent is not None and parent != filename:
+                    dependencies.add(parent)
+        graph[filename] = dependencies & set(files_by_table.values())
+    return graph
+
+
+def topological_order(graph: dict[str, set[str]]) -> list[str]:
+    """Order the files so that every file follows its dependencies."""
+    order: list[str] = []
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(
+                f"Circular file dependencies: {', '.join(sorted(remaining))}"
+            )
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return order
+
+
+def run_in_dependency_order(
+    graph: dict[str, set[str]],
+    task: Callable[[str], T],
+    workers: int,
+) -> list[T]:
+    """
+    Run task for every file in a process pool, starting each file as soon as
+    all of its dependencies have finished.
+
+    task must be picklable. Once a file fails no new files are started; the
+    files already running are allowed to finish and the first error is
+    raised.
+    """
+    topological_order(graph)
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    results: list[T] = []
+    running: dict[Future[T], str] = {}
+    error: BaseException | None = None
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=setup_logging,
+    ) as executor:
+
+        def submit_ready() -> None:
+            for name in [n for n, deps in remaining.items() if not deps]:
+                logger.debug(f"Scheduling {name}")
+                running[executor.submit(task, name)] = name
+                del remaining[name]
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results.append(future.result())
+                except BaseException as e:
+                    logger.error(f"Ingestion of {name} failed: {e}")
+                    error = error or e
+                    continue
+                for deps in remaining.values():
+                    deps.discard(name)
+            if error is None:
+                submit_ready()
+
+    if error is not None:
+        raise error
+    return results
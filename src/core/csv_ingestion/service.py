@@ -1,17 +1,102 @@
+import asyncio
 import logging
+import time
+from dataclasses import dataclass, replace
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable, cast
 
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 from pydantic import BaseModel
 
+from src.common.db import ConnectionProvider, db_session
+from src.core.csv_ingestion.bulk import (
+    AsyncBulkWriter,
+    BulkWriter,
+    RejectReason,
+    SecondaryIndex,
+    StagingMerge,
+    StagingValidator,
+    apply_delta,
+    derive_gaps,
+    drop_indexes,
+    find_deferrable_indexes,
+    rebuild_indexes,
+    refresh_materialized_views,
+)
 from src.core.csv_ingestion.config import CSVConfig
+from src.core.csv_ingestion.manifest import (
+    IngestionStatus,
+    begin_file,
+    checkpoint_file,
+    file_fingerprint,
+    finish_file,
+)
 from src.core.csv_ingestion.processors import (
+    cache_excel_as_csv,
+    has_rfc_quoting,
     process_csv_file,
+    process_csv_file_parallel,
     process_excel_file,
+    process_file_async,
+    process_file_bulk,
+)
+from src.core.csv_ingestion.processors.types import (
+    DeltaResult,
+    ProcessingResult,
+    ValidationResult,
+)
+from src.core.csv_ingestion.report import FileReport, IngestionReport
+from src.core.csv_ingestion.scheduler import (
+    build_dependency_graph,
+    run_in_dependency_order,
+    topological_order,
+)
+from src.core.csv_ingestion.uow import (
+    BatchedUnitOfWork,
+    assign_code_types,
+    copy_row,
+)
+from src.core.csv_ingestion.uow.batch import RowBuilder
+from src.core.infrastructure.database.input_data.allowable_values import (
+    ALLOWABLE_VALUES,
+)
+from src.core.infrastructure.database.input_data.reference_cache import (
+    REFERENCE_CACHE,
+)
+from src.core.infrastructure.database.input_data.reference_data import (
+    BUMP_VERSION_SQL,
+)
+from src.core.infrastructure.database.input_data.reference_snapshot import (
+    write_snapshot,
 )
 
 logger = logging.getLogger(__name__)
 
+# Materialized views refreshed after an index-deferred load.
+REFRESHED_VIEWS = ("product_summary",)
+
+# Files that raw_product_attribute_gaps is derived from.
+GAP_SOURCES = ("ProductCategory", "CategoryAttribute", "ProductAttributeValue")
+
+# Files that allowable_values_resolved is derived from, and the view.
+ALLOWABLE_VALUE_SOURCES = (
+    "CategoryAllowableValue",
+    "AttributeAllowableValuesApplicableInEveryCategory",
+    "AttributeAllowableValueInAnyCategory",
+)
+ALLOWABLE_VALUES_VIEW = "allowable_values_resolved"
+
+# Files cached in memory by REFERENCE_CACHE or its snapshot.
+REFERENCE_SOURCES = (
+    "Attribute",
+    "Category",
+    "CategoryAttribute",
+    "CategoryAllowableValue",
+    "AttributeAllowableValuesApplicableInEveryCategory",
+    "AttributeAllowableValueInAnyCategory",
+)
+
 
 class RequiredFiles(BaseModel):
     """Configuration for required files in a directory."""
@@ -51,63 +136,806 @@ def _validate_required_files(
         )
 
 
+@dataclass(frozen=True)
+class IngestionOptions:
+    """Settings shared by every file of an ingestion run."""
+
+    batch_size: int = 1000
+    row_limit: int | None = None
+    identifier_type: str | None = None
+    bulk: bool = False
+    resume: bool = False
+    delta: bool = False
+    excel_cache_dir: Path | None = None
+    parse_workers: int = 1
+    reject_dir: Path | None = None
+
+
+def _staging_merge(
+    filename: str, config: dict[str, Any], options: IngestionOptions
+) -> StagingMerge:
+    """The configured merge for a file, with any run overrides applied."""
+    merge = cast(StagingMerge, config["merge"])
+    if filename == "Product" and options.identifier_type is not None:
+        merge = replace(
+            merge,
+            prepare=partial(
+                assign_code_types, code_type=options.identifier_type
+            ),
+        )
+    return merge
+
+
+def _checked_merge(config: dict[str, Any]) -> StagingMerge:
+    """
+    The merge a file is validated against. Files without one, like those
+    with a dedicated loader, are keyed on their table's primary key.
+    """
+    if "merge" in config:
+        return cast(StagingMerge, config["merge"])
+    table = cast(Any, config["model"]).__table__
+    return StagingMerge(
+        natural_key=tuple(column.name for column in table.primary_key)
+    )
+
+
+def _file_path(directory: Path, filename: str) -> Path:
+    file_path = directory / f"{filename}.xlsx"
+    if not file_path.exists():
+        file_path = directory / f"{filename}.csv"
+    return file_path
+
+
+def _validate_file(
+    validator: StagingValidator, filename: str, file_path: Path
+) -> ValidationResult:
+    config = CSVConfig.FILE_CONFIGS[filename]
+    return validator.validate(
+        filename,
+        config["model"],
+        _checked_merge(config),
+        file_path,
+        cast(dict[str, str], config["column_mapping"]),
+    )
+
+
+def _orphans(result: ProcessingResult) -> int:
+    """The rows of a validated file whose parent row does not exist"""
+    if not isinstance(result, ValidationResult):
+        return 0
+    return result.rejections.get(RejectReason.MISSING_PARENT.value, 0)
+
+
+def validate_files(
+    directory: Path, reject_dir: Path, pool: ConnectionPool[Any]
+) -> list[FileReport]:
+    """
+    Validate every configured file without ingesting anything.
+
+    Files are staged in dependency order in one transaction, so a row whose
+    parent is in a parent file of the same directory is not an orphan.
+    """
+    graph = build_dependency_graph(CSVConfig.FILE_CONFIGS)
+    files = []
+    with pool.connection() as connection:
+        with connection.transaction():
+            validator = StagingValidator(connection, reject_dir)
+            for filename in topological_order(graph):
+                start = time.perf_counter()
+                result = _validate_file(
+                    validator, filename, _file_path(directory, filename)
+                )
+                files.append(
+                    FileReport(
+                        filename=filename,
+                        seconds=time.perf_counter() - start,
+                        result=result,
+                    )
+                )
+    return files
+
+
+def _delta_load(
+    pool: ConnectionPool[Any],
+    filename: str,
+    file_path: Path,
+    config: dict[str, Any],
+    options: IngestionOptions,
+) -> ProcessingResult:
+    """Apply a single CSV as a delta against its previous load."""
+    with pool.connection() as connection:
+        return apply_delta(
+            connection,
+            filename,
+            config["model"],
+            _staging_merge(filename, config, options),
+            file_path,
+            cast(dict[str, str], config["column_mapping"]),
+            options.batch_size,
+        )
+
+
+def _batched_load(
+    filename: str,
+    file_path: Path,
+    config: dict[str, Any],
+    options: IngestionOptions,
+    start_row: int,
+) -> ProcessingResult:
+    """
+    Load a single file in batches, detecting duplicates against natural keys
+    preloaded from the target table.
+    """
+    merge = _staging_merge(filename, config, options)
+    unit_of_work = BatchedUnitOfWork(
+        config["model"],
+        merge.natural_key,
+        cast(RowBuilder, config.get("build_row", copy_row)),
+        prepare=merge.prepare,
+    )
+    return process_file_bulk(
+        file_path,
+        unit_of_work,
+        options.batch_size,
+        cast(dict[str, str], config["column_mapping"]),
+        options.row_limit,
+        start_row,
+        partial(checkpoint_file, filename),
+    )
+
+
+def _bulk_load(
+    pool: ConnectionPool[Any],
+    filename: str,
+    file_path: Path,
+    config: dict[str, Any],
+    options: IngestionOptions,
+    start_row: int,
+) -> ProcessingResult:
+    """Load a single file through staging and a set-based merge."""
+    merge = _staging_merge(filename, config, options)
+    column_mapping = cast(dict[str, str], config["column_mapping"])
+
+    with pool.connection() as connection:
+        with BulkWriter(
+            connection, config["model"], merge, list(column_mapping.values())
+        ) as writer:
+            if (
+                options.parse_workers > 1
+                and options.row_limit is None
+                and file_path.suffix.lower() == ".csv"
+            ):
+                if has_rfc_quoting(file_path):
+                    return process_csv_file_parallel(
+                        file_path,
+                        writer,
+                        options.parse_workers,
+                        options.batch_size,
+                        column_mapping,
+                        start_row=start_row,
+                        on_checkpoint=partial(checkpoint_file, filename),
+                    )
+                logger.warning(
+                    f"{filename} has quotes outside quoted fields; "
+                    "parsing it in a single process"
+                )
+            return process_file_bulk(
+                file_path,
+                writer,
+                options.batch_size,
+                column_mapping,
+                options.row_limit,
+                start_row,
+                partial(checkpoint_file, filename),
+            )
+
+
+def _drop_deferrable_indexes(
+    pool: ConnectionPool[Any],
+) -> list[SecondaryIndex]:
+    """Drop the secondary indexes of every configured target table."""
+    indexes = []
+    with pool.connection() as connection:
+        for config in CSVConfig.FILE_CONFIGS.values():
+            if not config:
+                continue
+            indexes += find_deferrable_indexes(
+                connection,
+                cast(Any, config["model"]).__table__.name,
+                _checked_merge(config).natural_key,
+            )
+        drop_indexes(connection, indexes)
+    return indexes
+
+
+def _ingest_all(
+    directory: Path,
+    options: IngestionOptions,
+    workers: int,
+    pool: ConnectionPool[Any],
+) -> list[FileReport]:
+    """Ingest every configured file in dependency order."""
+    graph = build_dependency_graph(CSVConfig.FILE_CONFIGS)
+    if workers > 1:
+        return run_in_dependency_order(
+            graph,
+            partial(ingest_file, directory=directory, options=options),
+            workers,
+        )
+    return [
+        ingest_file(filename, directory, options, pool)
+        for filename in topological_order(graph)
+    ]
+
+
+def _skipped_result() -> ProcessingResult:
+    return ProcessingResult(
+        rows_processed=0, rows_skipped=0, total_processed=0
+    )
+
+
+async def _ingest_file_async(
+    filename: str,
+    directory: Path,
+    options: IngestionOptions,
+    pool: AsyncConnectionPool[Any],
+    sync_pool: ConnectionPool[Any],
+) -> FileReport:
+    """
+    Ingest a single file through the async pipeline: batches are read and
+    parsed in a thread while earlier ones are copied and merged through the
+    async pool. Files the pipeline does not cover (dedicated loaders and
+    delta loads) are ingested synchronously in a thread, on sync_pool.
+    """
+    config = CSVConfig.FILE_CONFIGS[filename]
+    if "merge" not in config or "loader" in config or options.delta:
+        return await asyncio.to_thread(
+            ingest_file, filename, directory, options, sync_pool
+        )
+
+    file_path = _file_path(directory, filename)
+    column_mapping = cast(dict[str, str], config["column_mapping"])
+
+    async def checkpoint(rows_committed: int) -> None:
+        await asyncio.to_thread(checkpoint_file, filename, rows_committed)
+
+    start = time.perf_counter()
+    start_row = await asyncio.to_thread(
+        begin_file, filename, file_fingerprint(file_path), options.resume
+    )
+    if start_row is None:
+        logger.info(f"Skipping {filename}: unchanged since last ingestion")
+        result = _skipped_result()
+    else:
+        if start_row:
+            logger.info(f"Resuming {filename} after row {start_row}")
+        try:
+            if (
+                options.excel_cache_dir is not None
+                and file_path.suffix.lower() == ".xlsx"
+            ):
+                file_path = await asyncio.to_thread(
+                    cache_excel_as_csv,
+                    file_path,
+                    options.excel_cache_dir,
+                    column_mapping,
+                )
+            async with pool.connection() as connection:
+                async with AsyncBulkWriter(
+                    connection,
+                    config["model"],
+                    _staging_merge(filename, config, options),
+                    list(column_mapping.values()),
+                ) as writer:
+                    result = await process_file_async(
+                        file_path,
+                        writer,
+                        options.batch_size,
+                        column_mapping,
+                        options.row_limit,
+                        start_row,
+                        checkpoint,
+                    )
+        except Exception:
+            await asyncio.to_thread(
+                finish_file, filename, IngestionStatus.FAILED
+            )
+            raise
+        await asyncio.to_thread(
+            _record_finished,
+            filename,
+            options,
+            start_row + result.total_processed,
+        )
+
+    return FileReport(
+        filename=filename,
+        seconds=time.perf_counter() - start,
+        result=result,
+    )
+
+
+async def _ingest_all_async(
+    directory: Path,
+    options: IngestionOptions,
+    workers: int,
+    sync_pool: ConnectionPool[Any],
+) -> list[FileReport]:
+    """
+    Ingest every configured file on the async pool, up to workers files at
+    once, each starting when the files it depends on have finished. Files
+    the async pipeline does not cover share sync_pool.
+    """
+    graph = build_dependency_graph(CSVConfig.FILE_CONFIGS)
+    running = asyncio.Semaphore(workers)
+    tasks: dict[str, asyncio.Task[FileReport]] = {}
+
+    async with ConnectionProvider.async_psycopgpool() as pool:
+
+        async def run(filename: str) -> FileReport:
+            await asyncio.gather(
+                *(tasks[parent] for parent in graph[filename])
+            )
+            async with running:
+                return await _ingest_file_async(
+                    filename, directory, options, pool, sync_pool
+                )
+
+        # A failed file cancels the files still running or waiting.
+        async with asyncio.TaskGroup() as group:
+            for filename in topological_order(graph):
+                tasks[filename] = group.create_task(run(filename))
+
+    return [task.result() for task in tasks.values()]
+
+
 def ingest_files(
     directory: Path | str = Path("data"),
     batch_size: int = 1000,
     row_limit: int | None = None,
     identifier_type: str | None = None,
-) -> None:
+    bulk: bool = False,
+    workers: int = 1,
+    resume: bool = False,
+    delta: bool = False,
+    excel_cache_dir: Path | str | None = None,
+    parse_workers: int = 1,
+    defer_indexes: bool = False,
+    index_workers: int = 4,
+    reject_dir: Path | str | None = None,
+    validate_only: bool = False,
+    use_async: bool = False,
+) -> IngestionReport:
     """
     Ingest all files from the specified directory into the database.
     Only processes files that are explicitly configured in
     CSVConfig.FILE_CONFIGS.
+
+    Files are written in batches: the natural keys already in each target
+    table are loaded once per file and duplicates are skipped in memory.
+    Excel workbooks are streamed values-only; with excel_cache_dir they are
+    converted to a CSV there once and read from it on later runs.
+
+    With bulk=True, files that have a merge configured are streamed into
+    a staging table with COPY and merged set-based in batches of batch_size
+    rows instead of being created one row at a time. Files with a dedicated
+    loader configured are always loaded with it. With parse_workers > 1,
+    bulk CSV files are split into byte ranges parsed by that many processes
+    and written in file order (not combined with row_limit).
+
+    With workers > 1, files are ingested in a process pool as soon as the
+    files they reference through foreign keys have been ingested, each
+    worker using its own connections.
+
+    With use_async=True, files are instead ingested as asyncio tasks on the
+    async connection pool, workers at a time in the same dependency order.
+    Each file is read and parsed in a thread that stays a bounded number of
+    batches ahead of the COPY and merge of earlier batches.
+
+    Progress is checkpointed per batch in the ingestion_manifest table. With
+    resume=True, files whose size and modification time are unchanged since
+    they last completed are skipped, and files interrupted in any earlier
+    run continue from their last committed row.
+
+    With delta=True, CSV files that have a merge configured are compared
+    with their previous load row by row, and only inserts, updates and
+    deletes are applied. The report lists the product keys they touched.
+
+    With defer_indexes=True, the secondary indexes of the target tables are
+    dropped before loading (except those the merges look keys up with) and
+    rebuilt afterwards, index_workers at a time, even if the load fails.
+    The materialized views in REFRESHED_VIEWS are then refreshed
+    concurrently. The report times each phase.
+
+    With reject_dir, every file is first staged and checked for foreign
+    keys with no parent row and for natural keys repeated in the file or
+    already loaded, and the rejected rows are written to
+    reject_dir/<file>.jsonl with their reasons. If any row has no parent,
+    nothing is ingested; repeated keys are skipped while loading, as they
+    are without validation. With validate_only=True, every file is checked
+    (into reject_dir, "rejects" by default) and nothing is ingested.
+
+    Once the files are loaded, raw_product_attribute_gaps is derived from
+    the product categories, category attributes and attribute values: for
+    the products a delta load touched, or for every product otherwise. If
+    any of ALLOWABLE_VALUE_SOURCES changed, allowable_values_resolved is
+    refreshed. If any of REFERENCE_SOURCES changed, reference_data_version
+    is bumped so that processes caching them reload and, when
+    REFERENCE_SNAPSHOT_PATH is set, the reference snapshot is written
+    again.
     """
     directory = Path(directory)
     _validate_required_files(
         directory,
         RequiredFiles.from_config(CSVConfig.FILE_CONFIGS),
     )
+    options = IngestionOptions(
+        batch_size,
+        row_limit,
+        identifier_type,
+        bulk,
+        resume,
+        delta,
+        Path(excel_cache_dir) if excel_cache_dir is not None else None,
+        parse_workers,
+        Path(reject_dir) if reject_dir is not None else None,
+    )
 
     for filename, config in CSVConfig.FILE_CONFIGS.items():
         if not config:
             logger.info(f"Skipping {filename} as it is not configured")
-            continue
 
-        try:
-            logger.debug(f"Starting to process {filename}")
-            file_path = directory / f"{filename}.xlsx"
-            if not file_path.exists():
-                file_path = directory / f"{filename}.csv"
-
-            create_func = cast(Callable[..., Any], config["create_func"])
-            column_mapping = cast(
-                dict[str, str] | None, config.get("column_mapping")
+    if validate_only or options.reject_dir is not None:
+        start = time.perf_counter()
+        with ConnectionProvider.psycopgpool() as pool:
+            files = validate_files(
+                directory, options.reject_dir or Path("rejects"), pool
+            )
+        report = IngestionReport(
+            files=files, seconds=time.perf_counter() - start
+        )
+        logger.info(f"Validation finished:\n{report.format()}")
+        if validate_only:
+            return report
+        orphans = sum(_orphans(file.result) for file in files)
+        if orphans:
+            logger.error(
+                f"Not ingesting: {orphans} rows have no parent row, see "
+                f"{options.reject_dir}"
             )
+            return report
+        # Every file has been checked together; loading them checks each
+        # again only against what is already loaded.
+        options = replace(options, reject_dir=None)
 
-            if filename == "Product" and identifier_type is not None:
-                create_func = cast(
-                    Callable[..., Any],
-                    lambda **kwargs: create_func(
-                        **kwargs, code_type=identifier_type
-                    ),
-                )
+    phases: dict[str, float] = {}
+    start = time.perf_counter()
+    with ConnectionProvider.psycopgpool() as pool:
+        deferred: list[SecondaryIndex] = []
+        if defer_indexes:
+            phase_start = time.perf_counter()
+            deferred = _drop_deferrable_indexes(pool)
+            phases["drop indexes"] = time.perf_counter() - phase_start
 
-            if file_path.suffix.lower() == ".xlsx":
-                process_excel_file(
-                    file_path,
-                    create_func,
-                    batch_size,
-                    column_mapping,
-                    row_limit,
+        phase_start = time.perf_counter()
+        try:
+            if use_async:
+                files = asyncio.run(
+                    _ingest_all_async(directory, options, workers, pool)
                 )
             else:
-                process_csv_file(
-                    file_path,
-                    create_func,
-                    batch_size,
-                    column_mapping,
-                    row_limit,
+                files = _ingest_all(directory, options, workers, pool)
+            phases["load"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            _derive_gaps(pool, files)
+            phases["derive gaps"] = time.perf_counter() - phase_start
+
+            phase_start = time.perf_counter()
+            if _refresh_allowable_values(pool, files):
+                phases["refresh allowable values"] = (
+                    time.perf_counter() - phase_start
                 )
-        except Exception as e:
-            logger.error(f"Error processing {filename}: {str(e)}")
+
+            reference_changed = _bump_reference_version(pool, files)
+            snapshot_path = REFERENCE_CACHE.snapshot_path
+            if snapshot_path is not None and (
+                reference_changed or not snapshot_path.exists()
+            ):
+                phase_start = time.perf_counter()
+                with db_session().begin() as session:
+                    write_snapshot(session, snapshot_path)
+                phases["write snapshot"] = time.perf_counter() - phase_start
+        except BaseException:
+            _rebuild_after_failure(pool, deferred, index_workers)
+            raise
+        if deferred:
+            phase_start = time.perf_counter()
+            rebuild_indexes(pool, deferred, index_workers)
+            phases["rebuild indexes"] = time.perf_counter() - phase_start
+
+        if defer_indexes:
+            phase_start = time.perf_counter()
+            with pool.connection() as connection:
+                refresh_materialized_views(connection, REFRESHED_VIEWS)
+            phases["refresh views"] = time.perf_counter() - phase_start
+
+    report = IngestionReport(
+        files=files, seconds=time.perf_counter() - start, phases=phases
+    )
+    logger.info(f"Ingestion finished:\n{report.format()}")
+    return report
+
+
+def _rebuild_after_failure(
+    pool: ConnectionPool[Any], indexes: list[SecondaryIndex], workers: int
+) -> None:
+    """
+    Rebuild the indexes dropped for a load that failed. A rebuild failure
+    is logged rather than raised, so that it does not mask the load's.
+    """
+    try:
+        rebuild_indexes(pool, indexes, workers)
+    except Exception as e:
+        logger.error(f"Failed to rebuild indexes after a failed load: {e}")
+
+
+def _changed(result: ProcessingResult) -> bool:
+    if isinstance(result, DeltaResult):
+        return bool(
+            result.rows_inserted + result.rows_updated + result.rows_deleted
+        )
+    return bool(result.rows_processed)
+
+
+def _gap_product_keys(files: list[FileReport]) -> list[str] | None:
+    """
+    The products whose gaps a run may have changed, or None when the gaps
+    of every product have to be derived again.
+
+    Only delta loads report the products they touched; any other load that
+    wrote rows to a gap source, or a change to category attributes, can
+    affect any product.
+    """
+    product_keys: set[str] = set()
+    for file in files:
+        if file.filename not in GAP_SOURCES:
+            continue
+        result = file.result
+        if (
+            not isinstance(result, DeltaResult)
+            or file.filename == "CategoryAttribute"
+        ):
+            if _changed(result):
+                return None
+            continue
+        product_keys.update(result.changed_product_keys)
+    return sorted(product_keys)
+
+
+def _derive_gaps(pool: ConnectionPool[Any], files: list[FileReport]) -> None:
+    product_keys = _gap_product_keys(files)
+    if product_keys == []:
+        logger.info("No attribute gaps to derive")
+        return
+    with pool.connection() as connection:
+        derive_gaps(connection, product_keys)
+
+
+def _refresh_allowable_values(
+    pool: ConnectionPool[Any], files: list[FileReport]
+) -> bool:
+    """
+    Refresh allowable_values_resolved if an allowable-value file changed.
+    This runs before the reference version is bumped, so that processes
+    reloading at the new version never read the view's old contents.
+    """
+    if not any(
+        file.filename in ALLOWABLE_VALUE_SOURCES and _changed(file.result)
+        for file in files
+    ):
+        return False
+    with pool.connection() as connection:
+        refresh_materialized_views(connection, (ALLOWABLE_VALUES_VIEW,))
+    ALLOWABLE_VALUES.invalidate()
+    return True
+
+
+def _bump_reference_version(
+    pool: ConnectionPool[Any], files: list[FileReport]
+) -> bool:
+    """Bump reference_data_version if a reference file changed"""
+    if not any(
+        file.filename in REFERENCE_SOURCES and _changed(file.result)
+        for file in files
+    ):
+        return False
+    with pool.connection() as connection:
+        connection.execute(BUMP_VERSION_SQL)
+    REFERENCE_CACHE.invalidate()
+    logger.info("Reference data changed; bumped its version")
+    return True
+
+
+def _loads_in_one_transaction(
+    file_path: Path, config: dict[str, Any], options: IngestionOptions
+) -> bool:
+    """
+    Whether the file goes through a dedicated loader or a delta load, which
+    commit it in a single transaction and always start from its first row.
+    """
+    suffix = file_path.suffix.lower()
+    as_csv = suffix == ".csv" or (
+        suffix == ".xlsx" and options.excel_cache_dir is not None
+    )
+    return as_csv and (
+        "loader" in config or (options.delta and "merge" in config)
+    )
+
+
+def _record_finished(
+    filename: str, options: IngestionOptions, rows_committed: int
+) -> None:
+    # A row-limited run stays resumable rather than complete.
+    if options.row_limit is None:
+        finish_file(filename, IngestionStatus.COMPLETED, rows_committed)
+    else:
+        checkpoint_file(filename, rows_committed)
+
+
+def ingest_file(
+    filename: str,
+    directory: Path,
+    options: IngestionOptions,
+    pool: ConnectionPool[Any] | None = None,
+) -> FileReport:
+    """
+    Ingest a single configured file and time it.
+
+    Without a pool, a connection pool is opened for this file alone, which
+    is how the workers of a parallel ingestion get their own connections.
+
+    With options.reject_dir, the file is validated first and not loaded if
+    any of its rows has no parent row.
+    """
+    if pool is None:
+        with ConnectionProvider.psycopgpool() as own_pool:
+            return ingest_file(filename, directory, options, own_pool)
+
+    file_path = _file_path(directory, filename)
+    config = CSVConfig.FILE_CONFIGS[filename]
+
+    start = time.perf_counter()
+    start_row = begin_file(
+        filename, file_fingerprint(file_path), options.resume
+    )
+    if start_row is None:
+        logger.info(f"Skipping {filename}: unchanged since last ingestion")
+        result = _skipped_result()
+    else:
+        if start_row and _loads_in_one_transaction(file_path, config, options):
+            logger.info(f"Restarting {filename}: it loads in one transaction")
+            start_row = 0
+        elif start_row:
+            logger.info(f"Resuming {filename} after row {start_row}")
+        try:
+            if options.reject_dir is not None:
+                with pool.connection() as connection:
+                    with connection.transaction():
+                        validation = _validate_file(
+                            StagingValidator(connection, options.reject_dir),
+                            filename,
+                            file_path,
+                        )
+                if _orphans(validation):
+                    raise ValueError(
+                        f"{filename}: {_orphans(validation)} rows have no "
+                        f"parent row, see {options.reject_dir}"
+                    )
+            result = _ingest_file(
+                file_path,
+                filename,
+                config,
+                options,
+                pool,
+                start_row,
+            )
+        except Exception:
+            finish_file(filename, IngestionStatus.FAILED)
             raise
+        _record_finished(filename, options, start_row + result.total_processed)
+
+    return FileReport(
+        filename=filename,
+        seconds=time.perf_counter() - start,
+        result=result,
+    )
+
+
+def _ingest_file(
+    file_path: Path,
+    filename: str,
+    config: dict[str, Any],
+    options: IngestionOptions,
+    pool: ConnectionPool[Any],
+    start_row: int = 0,
+) -> ProcessingResult:
+    """
+    Ingest one file, starting after start_row source rows.
+
+    Files with a dedicated loader, and files applied as a delta, are loaded
+    in a single transaction and always start from the beginning.
+    """
+    try:
+        logger.debug(f"Starting to process {filename}")
+
+        if (
+            options.excel_cache_dir is not None
+            and file_path.suffix.lower() == ".xlsx"
+        ):
+            file_path = cache_excel_as_csv(
+                file_path,
+                options.excel_cache_dir,
+                cast(dict[str, str] | None, config.get("column_mapping")),
+            )
+
+        if "loader" in config and file_path.suffix.lower() == ".csv":
+            loader = cast(Callable[..., ProcessingResult], config["loader"])
+            with pool.connection() as connection:
+                return loader(
+                    connection,
+                    config["model"],
+                    file_path,
+                    config["column_mapping"],
+                    options.row_limit,
+                )
+
+        if (
+            options.delta
+            and "merge" in config
+            and file_path.suffix.lower() == ".csv"
+        ):
+            return _delta_load(pool, filename, file_path, config, options)
+
+        if options.bulk and "merge" in config:
+            return _bulk_load(
+                pool, filename, file_path, config, options, start_row
+            )
+
+        if "merge" in config:
+            return _batched_load(
+                filename, file_path, config, options, start_row
+            )
+
+        create_func = cast(Callable[..., Any], config["create_func"])
+        column_mapping = cast(
+            dict[str, str] | None, config.get("column_mapping")
+        )
+
+        if filename == "Product" and options.identifier_type is not None:
+            create_func = partial(
+                create_func, code_type=options.identifier_type
+            )
+
+        if file_path.suffix.lower() == ".xlsx":
+            return process_excel_file(
+                file_path,
+                create_func,
+                options.batch_size,
+                column_mapping,
+                options.row_limit,
+                start_row,
+                partial(checkpoint_file, filename),
+            )
+        return process_csv_file(
+            file_path,
+            create_func,
+            options.batch_size,
+            column_mapping,
+            options.row_limit,
+            start_row,
+            partial(checkpoint_file, filename),
+        )
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {str(e)}")
+        raise
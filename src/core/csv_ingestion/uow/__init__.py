@@ -1,27 +1,36 @@
 from src.core.csv_ingestion.uow.attribute import create_attribute
+from src.core.csv_ingestion.uow.batch import (
+    BatchedUnitOfWork,
+    IngestionLookups,
+    copy_row,
+)
 from src.core.csv_ingestion.uow.category import create_category
 from src.core.csv_ingestion.uow.category_allowable_value import (
+    build_category_allowable_value_row,
     create_category_allowable_value,
 )
 from src.core.csv_ingestion.uow.category_attribute import (
     create_category_attribute,
 )
-from src.core.csv_ingestion.uow.human_recommendations import (
-    create_bq_batch16_qa_complete,
+from src.core.csv_ingestion.uow.product import (
+    assign_code_types,
+    create_product,
 )
-from src.core.csv_ingestion.uow.product import create_product
 from src.core.csv_ingestion.uow.product_attribute_allowable_value import (
     create_product_attribute_allowable_value,
 )
-from src.core.csv_ingestion.uow.product_attribute_gap import (
-    create_product_attribute_gap,
-)
 from src.core.csv_ingestion.uow.product_attribute_value import (
     create_product_attribute_value,
 )
 from src.core.csv_ingestion.uow.product_category import create_product_category
-from src.core.csv_ingestion.uow.recommendation import create_recommendation
-from src.core.csv_ingestion.uow.rich_text_source import create_rich_text_source
+from src.core.csv_ingestion.uow.recommendation import (
+    build_recommendation_row,
+    create_recommendation,
+)
+from src.core.csv_ingestion.uow.rich_text_source import (
+    build_rich_text_source_row,
+    create_rich_text_source,
+)
 from src.core.csv_ingestion.uow.shared_attribute_values import (
     create_attribute_allowable_value_in_any_category,
 )
@@ -36,12 +45,17 @@ __all__ = [
     "create_product_category",
     "create_category_attribute",
     "create_product_attribute_value",
-    "create_product_attribute_gap",
     "create_product_attribute_allowable_value",
     "create_category_allowable_value",
     "create_recommendation",
     "create_rich_text_source",
     "create_attribute_allowable_value_applicable_in_every_category",
     "create_attribute_allowable_value_in_any_category",
-    "create_bq_batch16_qa_complete",
+    "assign_code_types",
+    "BatchedUnitOfWork",
+    "IngestionLookups",
+    "copy_row",
+    "build_category_allowable_value_row",
+    "build_recommendation_row",
+    "build_rich_text_source_row",
 ]
@@ -0,0 +1,100 @@
+import logging
+from functools import cached_property
+from typing import Any, Callable, Sequence
+
+from src.common.db import db_session
+from src.core.infrastructure.database.input_data.repositories import (
+    RawCategoryAttributeRepository,
+    Repository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionLookups:
+    """Reference data loaded once per file and shared by its row builders."""
+
+    @cached_property
+    def category_attributes(self) -> dict[str, tuple[str, str]]:
+        """category_attribute_key -> (category_key, attribute_key)"""
+        with db_session().begin() as session:
+            return RawCategoryAttributeRepository(session).get_key_map()
+
+
+RowBuilder = Callable[
+    [dict[str, str], IngestionLookups], dict[str, Any] | None
+]
+
+
+def copy_row(row: dict[str, str], lookups: IngestionLookups) -> dict[str, Any]:
+    """Default row builder: the mapped CSV columns are the target columns."""
+    return dict(row)
+
+
+class BatchedUnitOfWork:
+    """
+    Batch counterpart of the per-row create_* units of work.
+
+    The natural keys already in the target table are read once, when the
+    first batch arrives. From then on duplicates (against the table or
+    earlier in the file) are detected in memory, and each batch of new rows
+    is written with one executemany in its own transaction. Without a
+    natural key every row is inserted. prepare, like StagingMerge.prepare,
+    can add derived columns to each whole batch before its rows are built.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        natural_key: Sequence[str],
+        build_row: RowBuilder = copy_row,
+        lookups: IngestionLookups | None = None,
+        prepare: Callable[[list[dict[str, str]]], None] | None = None,
+    ) -> None:
+        self.model = model
+        self.natural_key = tuple(natural_key)
+        self.build_row = build_row
+        self.lookups = lookups or IngestionLookups()
+        self.prepare = prepare
+        self._existing_keys: set[tuple[Any, ...]] | None = None
+
+    def _load_existing_keys(self) -> set[tuple[Any, ...]]:
+        with db_session().begin() as session:
+            keys = Repository(session, self.model).get_distinct_values(
+                *self.natural_key
+            )
+        logger.debug(
+            f"Loaded {len(keys)} existing keys from "
+            f"{self.model.__table__.name}"
+        )
+        return keys
+
+    def write_batch(self, rows: list[dict[str, str]]) -> int:
+        """
+        Write the rows of a batch that are not duplicates.
+
+        Returns the number of rows inserted.
+        """
+        if self._existing_keys is None:
+            self._existing_keys = (
+                self._load_existing_keys() if self.natural_key else set()
+            )
+
+        if self.prepare is not None:
+            self.prepare(rows)
+
+        new_rows = []
+        for row in rows:
+            record = self.build_row(row, self.lookups)
+            if record is None:
+                continue
+            if self.natural_key:
+                key = tuple(record[column] for column in self.natural_key)
+                if key in self._existing_keys:
+                    continue
+                self._existing_keys.add(key)
+            new_rows.append(record)
+
+        with db_session().begin() as session:
+            Repository(session, self.model).insert_many(new_rows)
+        return len(new_rows)
@@ -1,4 +1,7 @@
+from typing import Any
+
 from src.common.db import db_session
+from src.core.csv_ingestion.uow.batch import IngestionLookups
 from src.core.infrastructure.database.input_data.records import (
     RawCategoryAllowableValueRecord,
     RawCategoryAttributeRecord,
@@ -59,3 +62,34 @@ def create_category_allowable_value(
         )
 
         return repo.create(category_allowable_value)
+
+
+def build_category_allowable_value_row(
+    row: dict[str, str], lookups: IngestionLookups
+) -> dict[str, Any] | None:
+    """
+    Batch counterpart of create_category_allowable_value, resolving the
+    category attribute from the preloaded map instead of per row.
+    """
+    keys = lookups.category_attributes.get(row["category_attribute_key"])
+    if keys is None:
+        return None
+    category_key, attribute_key = keys
+
+    minimum_value = row.get("minimum_value", "")
+    maximum_value = row.get("maximum_value", "")
+    return {
+        "category_key": category_key,
+        "attribute_key": attribute_key,
+        "value": row["value"],
+        "unit_type": row.get("unit_type", "").strip(),
+        "minimum_value": (
+            float(minimum_value) if minimum_value.strip() else None
+        ),
+        "minimum_unit": row.get("minimum_unit", "").strip(),
+        "maximum_value": (
+            float(maximum_value) if maximum_value.strip() else None
+        ),
+        "maximum_unit": row.get("maximum_unit", "").strip(),
+        "range_qualifier": row.get("range_qualifier", "").strip(),
+    }
@@ -1,5 +1,8 @@
 from src.common.db import db_session
-from src.core.domain.product_identifiers import process_code_type
+from src.core.domain.product_identifiers import (
+    process_code_type,
+    process_code_types,
+)
 from src.core.infrastructure.database.input_data.records import (
     RawProductRecord,
 )
@@ -37,3 +40,23 @@ def create_product(
         )
 
         return repo.create(product)
+
+
+def assign_code_types(
+    rows: list[dict[str, str]], code_type: str | None = None
+) -> None:
+    """
+    Add the detected (or forced) code_type to a batch of product rows,
+    classifying the whole batch at once. Rows that already carry a
+    code_type keep it unless one is forced.
+    """
+    pending = (
+        rows
+        if code_type is not None
+        else [r for r in rows if not r.get("code_type")]
+    )
+    code_types = process_code_types(
+        [row["system_name"] for row in pending], code_type
+    )
+    for row, detected in zip(pending, code_types):
+        row["code_type"] = detected
@@ -1,6 +1,8 @@
+from typing import Any
 from uuid import uuid4
 
 from src.common.db import db_session
+from src.core.csv_ingestion.uow.batch import IngestionLookups
 from src.core.infrastructure.database.input_data.records import (
     RawRecommendationRecord,
 )
@@ -36,3 +38,15 @@ def create_recommendation(
         )
 
         return repo.create(recommendation)
+
+
+def build_recommendation_row(
+    row: dict[str, str], lookups: IngestionLookups
+) -> dict[str, Any]:
+    """Batch counterpart of create_recommendation."""
+    confidence = row.get("confidence", "")
+    return {
+        **row,
+        "recommendation_key": str(uuid4()),
+        "confidence": float(confidence) if confidence.strip() else None,
+    }
@@ -1,6 +1,8 @@
+from typing import Any
 from uuid import uuid4
 
 from src.common.db import db_session
+from src.core.csv_ingestion.uow.batch import IngestionLookups
 from src.core.infrastructure.database.input_data.records import (
     RawRichTextSourceRecord,
 )
@@ -31,3 +33,15 @@ def create_rich_text_source(
         )
 
         return repo.create(source)
+
+
+def build_rich_text_source_row(
+    row: dict[str, str], lookups: IngestionLookups
+) -> dict[str, Any]:
+    """Batch counterpart of create_rich_text_source."""
+    priority = row.get("priority", "")
+    return {
+        **row,
+        "source_key": str(uuid4()),
+        "priority": int(priority) if priority.strip() else None,
+    }
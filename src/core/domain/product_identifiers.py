@@ -1,5 +1,55 @@
 import re
 from enum import Enum
+from typing import Sequence
+
+import numpy as np
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-zA-Z0-9]")
+_GTIN = re.compile(r"\d{8}|\d{12,13}")
+_ISBN10 = re.compile(r"\d{9}[\dX]")
+_SKU = re.compile(r"[A-Z0-9]{6,12}")
+
+# Longest code that can be anything other than OTHER (EAN-13 / ISBN-13).
+_MAX_CODE_LENGTH = 13
+
+# GS1 weights for a code right-aligned in _MAX_CODE_LENGTH digits: the
+# check digit weighs 1, then 3 and 1 alternate leftwards. A code is valid
+# when the weighted sum of all its digits is a multiple of 10.
+_GS1_WEIGHTS = np.array(
+    [3 if (_MAX_CODE_LENGTH - 1 - i) % 2 else 1 for i in range(13)],
+    dtype=np.int32,
+)
+_ISBN10_WEIGHTS = np.arange(10, 0, -1, dtype=np.int32)
+
+
+def _normalize(code: str) -> str:
+    if code.isascii() and code.isalnum():
+        return code
+    return _NON_ALPHANUMERIC.sub("", code)
+
+
+def _gs1_valid(code: str) -> bool:
+    """Whether a digit string's GS1 check digit (its last digit) is valid."""
+    total = sum(
+        int(digit) * (3 if position % 2 else 1)
+        for position, digit in enumerate(reversed(code))
+    )
+    return total % 10 == 0
+
+
+def _isbn10_valid(code: str) -> bool:
+    total = sum(
+        (10 - position) * (10 if character == "X" else int(character))
+        for position, character in enumerate(code)
+    )
+    return total % 11 == 0
+
+
+def _byte_matrix(codes: np.ndarray, width: int) -> np.ndarray:
+    """The bytes of fixed-width codes as a (len(codes), width) matrix."""
+    return np.frombuffer(
+        codes.astype(f"S{width}").tobytes(), dtype=np.uint8
+    ).reshape(len(codes), width)
 
 
 class ProductIdentifierType(str, Enum):
@@ -22,28 +72,97 @@ class ProductIdentifierType(str, Enum):
 
     @classmethod
     def detect_code_type(cls, code: str) -> "ProductIdentifierType":
-        code = re.sub(r"[^a-zA-Z0-9]", "", code)
-
-        # EAN-13: 13 digits
-        if re.match(r"^\d{13}$", code):
-            return cls.EAN
-        # EAN-8: 8 digits
-        elif re.match(r"^\d{8}$", code):
-            return cls.EAN
-        # UPC-A: 12 digits
-        elif re.match(r"^\d{12}$", code):
-            return cls.UPC
-        # ISBN-13: 13 digits starting with 978 or 979
-        elif re.match(r"^(978|979)\d{10}$", code):
-            return cls.ISBN
-        # ISBN-10: 10 digits or 9 digits + X
-        elif re.match(r"^\d{9}[\dX]$", code):
+        """
+        Classify a single product code, as classify_many does for a batch.
+        """
+        code = _normalize(code)
+        if _GTIN.fullmatch(code) and _gs1_valid(code):
+            if len(code) == 13 and code.startswith(("978", "979")):
+                return cls.ISBN
+            return cls.UPC if len(code) == 12 else cls.EAN
+        if _ISBN10.fullmatch(code) and _isbn10_valid(code):
             return cls.ISBN
-        # SKU: Typically alphanumeric with specific patterns
-        elif re.match(r"^[A-Z0-9]{6,12}$", code):
+        if _SKU.fullmatch(code):
             return cls.SKU
-        else:
-            return cls.OTHER
+        return cls.OTHER
+
+    @classmethod
+    def classify_many(
+        cls, codes: Sequence[str]
+    ) -> list["ProductIdentifierType"]:
+        """
+        Classify a column of product codes in one vectorized pass.
+
+        Separators are ignored. GTINs (EAN-13, EAN-8, UPC-A) and ISBNs only
+        match when their check digit is valid, and a valid 978/979 GTIN is
+        an ISBN-13 rather than an EAN. Codes failing their check digit are
+        classified as if they had no structure (usually SKU or OTHER).
+        """
+        members = list(cls)
+        return [members[index] for index in _classify(codes).tolist()]
+
+
+def _classify(codes: Sequence[str]) -> np.ndarray:
+    """The position in ProductIdentifierType of each code's type."""
+    if not codes:
+        # np.char.zfill cannot reduce over a zero-size array.
+        return np.empty(0, dtype=np.intp)
+    # Longer codes can only be OTHER; blank them so the array stays narrow
+    # whatever the longest system name is.
+    raw = np.array(
+        [
+            code if len(code) <= _MAX_CODE_LENGTH else ""
+            for code in map(_normalize, codes)
+        ],
+        dtype=f"S{_MAX_CODE_LENGTH}",
+    )
+    lengths = np.char.str_len(raw)
+    zero = ord("0")
+
+    gs1 = _byte_matrix(np.char.zfill(raw, _MAX_CODE_LENGTH), 13) - zero
+    gs1_valid = np.char.isdigit(raw) & (
+        (gs1.astype(np.int32) @ _GS1_WEIGHTS) % 10 == 0
+    )
+
+    isbn10 = _byte_matrix(raw, 10).astype(np.int32) - zero
+    check = isbn10[:, 9]
+    isbn10[:, 9] = np.where(check == ord("X") - zero, 10, check)
+    isbn10_valid = (
+        (lengths == 10)
+        & np.char.isdigit(raw.astype("S9"))
+        & (isbn10[:, 9] >= 0)
+        & (isbn10[:, 9] <= 10)
+        & ((isbn10 @ _ISBN10_WEIGHTS) % 11 == 0)
+    )
+
+    characters = _byte_matrix(raw, _MAX_CODE_LENGTH)
+    has_lowercase = ((characters >= ord("a")) & (characters <= ord("z"))).any(
+        axis=1
+    )
+    bookland = np.char.startswith(raw, b"978") | np.char.startswith(
+        raw, b"979"
+    )
+
+    members = list(ProductIdentifierType)
+    is_sku = (
+        (lengths >= 6)
+        & (lengths <= 12)
+        & np.char.isalnum(raw)
+        & ~has_lowercase
+    )
+    # In priority order: the first matching condition wins.
+    conditions = [
+        (ProductIdentifierType.ISBN, gs1_valid & (lengths == 13) & bookland),
+        (ProductIdentifierType.EAN, gs1_valid & np.isin(lengths, (8, 13))),
+        (ProductIdentifierType.UPC, gs1_valid & (lengths == 12)),
+        (ProductIdentifierType.ISBN, isbn10_valid),
+        (ProductIdentifierType.SKU, is_sku),
+    ]
+    return np.select(
+        [condition for _, condition in conditions],
+        [members.index(identifier) for identifier, _ in conditions],
+        default=members.index(ProductIdentifierType.OTHER),
+    )
 
 
 def process_code_type(system_name: str, code_type: str | None = None) -> str:
@@ -55,3 +174,14 @@ def process_code_type(system_name: str, code_type: str | None = None) -> str:
     if code_type is not None:
         return ProductIdentifierType.validate_code_type(code_type).value
     return ProductIdentifierType.detect_code_type(system_name).value
+
+
+def process_code_types(
+    system_names: Sequence[str], code_type: str | None = None
+) -> list[str]:
+    """Batch counterpart of process_code_type."""
+    if code_type is not None:
+        value = ProductIdentifierType.validate_code_type(code_type).value
+        return [value] * len(system_names)
+    values = [identifier.value for identifier in ProductIdentifierType]
+    return [values[index] for index in _classify(system_names).tolist()]
@@ -1,20 +1,28 @@
 import random
-
-from sqlalchemy import select
+from typing import Any, Iterable, Iterator, TypeVar
+
+from sqlalchemy import (
+    Select,
+    and_,
+    distinct,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from src.core.domain.models import ProductDetails, ProductGaps
-from src.core.domain.types import (
-    ProductAttributeGap,
-    ProductAttributeValue,
-    ProductDescriptor,
+from src.core.domain.types import ProductAttributeGap
+from src.core.infrastructure.database.input_data.allowable_values import (
+    EVERY_CATEGORY,
 )
 from src.core.infrastructure.database.input_data.records import (
+    AllowableValueResolvedRecord,
     HumanRecommendationRecord,
-    RawAttributeAllowableValueApplicableInEveryCategoryRecord,
-    RawAttributeAllowableValueInAnyCategoryRecord,
     RawAttributeRecord,
-    RawCategoryAllowableValueRecord,
     RawCategoryRecord,
     RawProductAttributeGapRecord,
     RawProductAttributeValueRecord,
@@ -32,13 +40,265 @@ from src.core.infrastructure.database.input_data.repositories import (
     RawProductCategoryRepository,
     RawProductRepository,
     RawRichTextSourceRepository,
+    chunked,
 )
 
-# Type aliases for long record names
-GloballyAllowedValueRecord = (
-    RawAttributeAllowableValueApplicableInEveryCategoryRecord
+T = TypeVar("T")
+
+# Rows fetched per round trip when streaming product details.
+PRODUCT_DETAILS_PAGE_SIZE = 500
+
+
+# Statements shared by the sync and asyncio repositories.
+
+
+def _json_object(**fields: Any) -> Any:
+    """json_build_object of fields, with their names as SQL literals"""
+    arguments: list[Any] = []
+    for name, value in fields.items():
+        arguments += [literal_column(f"'{name}'"), value]
+    return func.json_build_object(*arguments)
+
+
+def _json_array(value: Any, *order_by: Any) -> Any:
+    """json_agg of value, or an empty array when there are no rows"""
+    if order_by:
+        value = aggregate_order_by(value, *order_by)
+    return func.coalesce(func.json_agg(value), func.json_build_array())
+
+
+# One row per product holding the whole ProductDetails as JSON, assembled
+# by correlated subqueries so that a product costs a single round trip.
+_PRODUCT_DETAILS = select(
+    _json_object(
+        product_key=RawProductRecord.product_key,
+        product_code=RawProductRecord.system_name,
+        code_type=RawProductRecord.code_type,
+        product_name=RawProductRecord.friendly_name,
+        product_description=select(
+            _json_array(
+                _json_object(
+                    descriptor=RawRichTextSourceRecord.name,
+                    value=RawRichTextSourceRecord.content,
+                ),
+                RawRichTextSourceRecord.priority,
+            )
+        )
+        .where(
+            RawRichTextSourceRecord.product_key == RawProductRecord.product_key
+        )
+        .scalar_subquery(),
+        categories=select(_json_array(RawCategoryRecord.friendly_name))
+        .join_from(
+            RawProductCategoryRecord,
+            RawCategoryRecord,
+            RawProductCategoryRecord.category_key
+            == RawCategoryRecord.category_key,
+        )
+        .where(
+            RawProductCategoryRecord.product_key
+            == RawProductRecord.product_key
+        )
+        .scalar_subquery(),
+        attributes=select(
+            _json_array(
+                _json_object(
+                    attribute=RawAttributeRecord.friendly_name,
+                    value=RawProductAttributeValueRecord.value,
+                )
+            )
+        )
+        .join_from(
+            RawProductAttributeValueRecord,
+            RawAttributeRecord,
+            RawProductAttributeValueRecord.attribute_key
+            == RawAttributeRecord.attribute_key,
+        )
+        .where(
+            RawProductAttributeValueRecord.product_key
+            == RawProductRecord.product_key
+        )
+        .scalar_subquery(),
+    )
 )
-SharedAllowedValueRecord = RawAttributeAllowableValueInAnyCategoryRecord
+
+
+def _product_details_statement(product_key: str) -> Select:
+    return _PRODUCT_DETAILS.where(RawProductRecord.product_key == product_key)
+
+
+def _product_details_many_statement(product_keys: list[str]) -> Select:
+    return _PRODUCT_DETAILS.where(
+        RawProductRecord.product_key.in_(product_keys)
+    )
+
+
+def _product_details_page_statement(
+    after: str | None, page_size: int
+) -> Select:
+    statement = _PRODUCT_DETAILS.order_by(RawProductRecord.product_key).limit(
+        page_size
+    )
+    if after is None:
+        return statement
+    return statement.where(RawProductRecord.product_key > after)
+
+
+def _product_details(product_key: str, details: Any) -> ProductDetails:
+    if details is None:
+        raise ValueError(
+            f"No {RawProductRecord.__name__} found with id {product_key}"
+        )
+    return ProductDetails.model_validate(details)
+
+
+def _found_in_order(
+    product_keys: list[str], found: dict[str, T]
+) -> dict[str, T]:
+    """found in the order of product_keys, raising if any is missing"""
+    missing = [key for key in dict.fromkeys(product_keys) if key not in found]
+    if missing:
+        raise ValueError(
+            f"No {RawProductRecord.__name__} found with ids "
+            f"{', '.join(missing)}"
+        )
+    return {key: found[key] for key in product_keys}
+
+
+def _allowable_values(attribute_key: Any) -> Any:
+    """
+    The allowable values of attribute_key in the categories of the
+    enclosing product or in every category, deduplicated and sorted by code
+    point like Python sorts them, or NULL if there are none
+    """
+    value = func.unnest(
+        AllowableValueResolvedRecord.allowable_values
+    ).column_valued("value")
+    ordered = value.collate("C")
+    return (
+        select(func.array_agg(aggregate_order_by(distinct(ordered), ordered)))
+        .select_from(AllowableValueResolvedRecord)
+        .where(
+            AllowableValueResolvedRecord.attribute_key == attribute_key,
+            or_(
+                AllowableValueResolvedRecord.category_key == EVERY_CATEGORY,
+                AllowableValueResolvedRecord.category_key.in_(
+                    select(RawProductCategoryRecord.category_key)
+                    .where(
+                        RawProductCategoryRecord.product_key
+                        == RawProductRecord.product_key
+                    )
+                    .correlate(RawProductRecord)
+                ),
+            ),
+        )
+        .scalar_subquery()
+    )
+
+
+# Gap statements return a row per gap of each product: the product's key
+# and name, then the attribute's key, friendly name and allowable values.
+# A product without gaps gets a single row with no attribute.
+
+
+def _product_gaps_statement(product_keys: list[str]) -> Select:
+    return (
+        select(
+            RawProductRecord.product_key,
+            RawProductRecord.friendly_name,
+            RawProductAttributeGapRecord.attribute_key,
+            RawAttributeRecord.friendly_name,
+            _allowable_values(RawProductAttributeGapRecord.attribute_key),
+        )
+        .outerjoin(
+            RawProductAttributeGapRecord,
+            RawProductAttributeGapRecord.product_key
+            == RawProductRecord.product_key,
+        )
+        .outerjoin(
+            RawAttributeRecord,
+            RawAttributeRecord.attribute_key
+            == RawProductAttributeGapRecord.attribute_key,
+        )
+        .where(RawProductRecord.product_key.in_(product_keys))
+        .order_by(
+            RawProductRecord.product_key,
+            RawProductAttributeGapRecord.attribute_key,
+        )
+    )
+
+
+def _recommended_gaps_statement(product_keys: list[str]) -> Select:
+    """
+    Gaps for the accepted recommendations of each product, in the order
+    they were made. A recommendation whose attribute_reference names more
+    than one attribute is matched to the one with the lowest key.
+    """
+    return (
+        select(
+            RawProductRecord.product_key,
+            RawProductRecord.friendly_name,
+            RawAttributeRecord.attribute_key,
+            RawAttributeRecord.friendly_name,
+            _allowable_values(RawAttributeRecord.attribute_key),
+        )
+        .outerjoin(
+            HumanRecommendationRecord,
+            and_(
+                HumanRecommendationRecord.product_reference
+                == RawProductRecord.system_name,
+                HumanRecommendationRecord.action == "Accept Recommendation",
+            ),
+        )
+        .outerjoin(
+            RawAttributeRecord,
+            RawAttributeRecord.system_name
+            == HumanRecommendationRecord.attribute_reference,
+        )
+        .where(RawProductRecord.product_key.in_(product_keys))
+        .distinct(RawProductRecord.product_key, HumanRecommendationRecord.id)
+        .order_by(
+            RawProductRecord.product_key,
+            HumanRecommendationRecord.id,
+            RawAttributeRecord.attribute_key,
+        )
+    )
+
+
+def _product_gaps(rows: Iterable[Any]) -> dict[str, ProductGaps]:
+    """
+    ProductGaps by product key from the rows of a gap statement, leaving
+    out gaps without allowable values
+    """
+    products: dict[str, tuple[str, list[ProductAttributeGap]]] = {}
+    for product_key, product_name, attribute_key, name, values in rows:
+        _, gaps = products.setdefault(product_key, (product_name, []))
+        if attribute_key is None or not values:
+            continue
+        if name is None:
+            raise ValueError(
+                f"No {RawAttributeRecord.__name__} found with id "
+                f"{attribute_key}"
+            )
+        gaps.append(
+            ProductAttributeGap(attribute=name, allowable_values=values)
+        )
+    return {
+        product_key: ProductGaps(
+            product_code=product_key, product_name=product_name, gaps=gaps
+        )
+        for product_key, (product_name, gaps) in products.items()
+    }
+
+
+def _single_product_gaps(product_key: str, rows: Iterable[Any]) -> ProductGaps:
+    """The product's gaps, which are empty for a product without any"""
+    found = _product_gaps(rows)
+    if product_key not in found:
+        raise ValueError(
+            f"No {RawProductRecord.__name__} found with id {product_key}"
+        )
+    return found[product_key]
 
 
 class FacetIdentificationRepository:
@@ -64,93 +324,10 @@ class FacetIdentificationRepository:
             RawCategoryAllowableValueRepository(session)
         )
 
-    def _get_allowable_values_for_attribute(
-        self, category_keys: list[str], attribute_key: str
-    ) -> set[str]:
-        """Get all allowable values for an attribute across categories"""
-        category_values = set(
-            av.value
-            for av in self.session.scalars(
-                select(RawCategoryAllowableValueRecord).where(
-                    RawCategoryAllowableValueRecord.category_key.in_(
-                        category_keys
-                    ),
-                    RawCategoryAllowableValueRecord.attribute_key
-                    == attribute_key,
-                )
-            ).all()
-        )
-
-        global_values = set(
-            av.value
-            for av in self.session.scalars(
-                select(GloballyAllowedValueRecord).where(
-                    GloballyAllowedValueRecord.attribute_key == attribute_key
-                )
-            ).all()
-        )
-
-        any_category_values = set(
-            av.value
-            for av in self.session.scalars(
-                select(SharedAllowedValueRecord).where(
-                    SharedAllowedValueRecord.attribute_key == attribute_key
-                )
-            ).all()
-        )
-
-        return category_values | global_values | any_category_values
-
     def get_product_details(self, product_key: str) -> ProductDetails:
-        product = self.product_repo.get_by_id(product_key)
-
-        categories = [
-            cat.friendly_name
-            for cat in self.session.scalars(
-                select(RawCategoryRecord)
-                .join(
-                    RawProductCategoryRecord,
-                    RawCategoryRecord.category_key
-                    == RawProductCategoryRecord.category_key,
-                )
-                .where(RawProductCategoryRecord.product_key == product_key)
-            ).all()
-        ]
-
-        attributes = [
-            ProductAttributeValue(
-                attribute=attr.friendly_name, value=val.value
-            )
-            for attr, val in self.session.execute(
-                select(RawAttributeRecord, RawProductAttributeValueRecord)
-                .join(
-                    RawProductAttributeValueRecord,
-                    RawAttributeRecord.attribute_key
-                    == RawProductAttributeValueRecord.attribute_key,
-                )
-                .where(
-                    RawProductAttributeValueRecord.product_key == product_key
-                )
-            ).all()
-        ]
-
-        descriptions = [
-            ProductDescriptor(descriptor=rt.name, value=rt.content)
-            for rt in self.session.scalars(
-                select(RawRichTextSourceRecord)
-                .where(RawRichTextSourceRecord.product_key == product_key)
-                .order_by(RawRichTextSourceRecord.priority)
-            ).all()
-        ]
-
-        return ProductDetails(
-            product_key=product.product_key,
-            product_code=product.system_name,
-            product_name=product.friendly_name,
-            product_description=descriptions,
-            categories=categories,
-            attributes=attributes,
-            code_type=product.code_type,
+        return _product_details(
+            product_key,
+            self.session.scalar(_product_details_statement(product_key)),
         )
 
     def find_product_details(self, product_key: str) -> ProductDetails | None:
@@ -159,35 +336,37 @@ class FacetIdentificationRepository:
         except ValueError:
             return None
 
-    def get_product_gaps(self, product_key: str) -> ProductGaps:
-        product = self.product_repo.get_by_id(product_key)
+    def get_product_details_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductDetails]:
+        """
+        Details by product key, in the order of product_keys, raising if
+        any of the products does not exist.
+        """
+        keys = list(product_keys)
+        return _found_in_order(keys, self.find_product_details_many(keys))
+
+    def find_product_details_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductDetails]:
+        """
+        Details by product key of the products that exist, with one query
+        per chunk of keys.
+        """
+        details: dict[str, ProductDetails] = {}
+        for chunk in chunked(product_keys):
+            for row in self.session.scalars(
+                _product_details_many_statement(chunk)
+            ):
+                product = ProductDetails.model_validate(row)
+                details[product.product_key] = product
+        return details
 
-        product_categories = self.product_category_repo.get_by_product_key(
-            product_key
-        )
-        category_keys = [pc.category_key for pc in product_categories]
-
-        gaps = self.product_attribute_gap_repo.get_by_product_key(product_key)
-
-        gap_details = []
-        for gap in gaps:
-            allowable_values = self._get_allowable_values_for_attribute(
-                category_keys, gap.attribute_key
-            )
-
-            if allowable_values:
-                attribute = self.attribute_repo.get_by_id(gap.attribute_key)
-                gap_details.append(
-                    ProductAttributeGap(
-                        attribute=attribute.friendly_name,
-                        allowable_values=sorted(allowable_values),
-                    )
-                )
-
-        return ProductGaps(
-            product_code=product.product_key,
-            product_name=product.friendly_name,
-            gaps=gap_details,
+    def get_product_gaps(self, product_key: str) -> ProductGaps:
+        """The product's gaps, which are empty for a product without any"""
+        return _single_product_gaps(
+            product_key,
+            self.session.execute(_product_gaps_statement([product_key])),
         )
 
     def find_product_gaps(self, product_key: str) -> ProductGaps | None:
@@ -196,6 +375,23 @@ class FacetIdentificationRepository:
         except ValueError:
             return None
 
+    def get_product_gaps_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductGaps]:
+        """
+        Gaps by product key, in the order of product_keys, with one query
+        per chunk of keys. Raises if any of the products does not exist;
+        products without gaps get none.
+        """
+        keys = list(product_keys)
+        found: dict[str, ProductGaps] = {}
+        for chunk in chunked(keys):
+            product_gaps = _product_gaps(
+                self.session.execute(_product_gaps_statement(chunk))
+            )
+            found.update(product_gaps)
+        return _found_in_order(keys, found)
+
     def get_product_gaps_with_ground_truth(
         self, product_key: str
     ) -> list[tuple[ProductAttributeGap, str | None]]:
@@ -272,53 +468,54 @@ class FacetIdentificationRepository:
     def get_product_gaps_from_recommendations(
         self, product_key: str
     ) -> ProductGaps:
-        product = self.product_repo.get_by_id(product_key)
-
-        recommendations = self.session.scalars(
-            select(HumanRecommendationRecord).where(
-                HumanRecommendationRecord.product_reference
-                == product.system_name,
-                HumanRecommendationRecord.action == "Accept Recommendation",
-            )
-        ).all()
-
-        product_categories = self.product_category_repo.get_by_product_key(
-            product_key
-        )
-        category_keys = [pc.category_key for pc in product_categories]
-
-        gap_details = []
-        for rec in recommendations:
-            attribute = self.session.scalars(
-                select(RawAttributeRecord).where(
-                    RawAttributeRecord.system_name == rec.attribute_reference
-                )
-            ).first()
-
-            if attribute:
-                allowable_values = self._get_allowable_values_for_attribute(
-                    category_keys, attribute.attribute_key
-                )
-
-                if allowable_values:
-                    gap_details.append(
-                        ProductAttributeGap(
-                            attribute=attribute.friendly_name,
-                            allowable_values=sorted(allowable_values),
-                        )
-                    )
-
-        return ProductGaps(
-            product_code=product.product_key,
-            product_name=product.friendly_name,
-            gaps=gap_details,
+        return _single_product_gaps(
+            product_key,
+            self.session.execute(_recommended_gaps_statement([product_key])),
         )
 
     def get_all_product_details(self) -> list[ProductDetails]:
-        products = self.product_repo.get_all()
+        return list(self.iter_product_details())
+
+    def iter_product_details(
+        self,
+        product_keys: Iterable[str] | None = None,
+        page_size: int = PRODUCT_DETAILS_PAGE_SIZE,
+    ) -> Iterator[ProductDetails]:
+        """
+        Stream the details of every product, or of the products of
+        product_keys that exist, from a server-side cursor page_size rows
+        at a time, so that memory stays bounded by the page rather than
+        the catalogue. The session must stay open while iterating.
+        """
+        statements: Iterable[Select]
+        if product_keys is None:
+            statements = [_PRODUCT_DETAILS]
+        else:
+            statements = (
+                _product_details_many_statement(chunk)
+                for chunk in chunked(product_keys, page_size)
+            )
+        for statement in statements:
+            for row in self.session.scalars(
+                statement.execution_options(yield_per=page_size)
+            ):
+                yield ProductDetails.model_validate(row)
+
+    def get_product_details_page(
+        self,
+        after: str | None = None,
+        page_size: int = PRODUCT_DETAILS_PAGE_SIZE,
+    ) -> list[ProductDetails]:
+        """
+        The details of the first page_size products by key after the key
+        after, or from the start. Paging by key keeps each page a short
+        index range scan, so a caller can use a new session per page.
+        """
         return [
-            self.get_product_details(product.product_key)
-            for product in products
+            ProductDetails.model_validate(row)
+            for row in self.session.scalars(
+                _product_details_page_statement(after, page_size)
+            )
         ]
 
     def get_random_product_key(
@@ -354,3 +551,83 @@ class FacetIdentificationRepository:
         if not keys:
             return None
         return random.choice(keys)
+
+
+class AsyncFacetIdentificationRepository:
+    """
+    Asyncio counterpart of FacetIdentificationRepository for the inference
+    path, so that its queries do not block the event loop between LLM
+    calls. Queries on one AsyncSession run one at a time.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_product_details(self, product_key: str) -> ProductDetails:
+        return _product_details(
+            product_key,
+            await self.session.scalar(_product_details_statement(product_key)),
+        )
+
+    async def find_product_details(
+        self, product_key: str
+    ) -> ProductDetails | None:
+        try:
+            return await self.get_product_details(product_key)
+        except ValueError:
+            return None
+
+    async def get_product_details_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductDetails]:
+        keys = list(product_keys)
+        return _found_in_order(
+            keys, await self.find_product_details_many(keys)
+        )
+
+    async def find_product_details_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductDetails]:
+        details: dict[str, ProductDetails] = {}
+        for chunk in chunked(product_keys):
+            for row in await self.session.scalars(
+                _product_details_many_statement(chunk)
+            ):
+                product = ProductDetails.model_validate(row)
+                details[product.product_key] = product
+        return details
+
+    async def get_product_gaps(self, product_key: str) -> ProductGaps:
+        """The product's gaps, which are empty for a product without any"""
+        return _single_product_gaps(
+            product_key,
+            await self.session.execute(_product_gaps_statement([product_key])),
+        )
+
+    async def find_product_gaps(self, product_key: str) -> ProductGaps | None:
+        try:
+            return await self.get_product_gaps(product_key)
+        except ValueError:
+            return None
+
+    async def get_product_gaps_many(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, ProductGaps]:
+        keys = list(product_keys)
+        found: dict[str, ProductGaps] = {}
+        for chunk in chunked(keys):
+            product_gaps = _product_gaps(
+                await self.session.execute(_product_gaps_statement(chunk))
+            )
+            found.update(product_gaps)
+        return _found_in_order(keys, found)
+
+    async def get_product_gaps_from_recommendations(
+        self, product_key: str
+    ) -> ProductGaps:
+        return _single_product_gaps(
+            product_key,
+            await self.session.execute(
+                _recommended_gaps_statement([product_key])
+            ),
+        )
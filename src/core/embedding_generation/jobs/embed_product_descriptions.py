@@ -1,16 +1,21 @@
 import logging
+from typing import Iterator
 
 from tqdm import tqdm
 
 from src.common.db import SessionLocal
 from src.core.domain.models import ProductDetails
-from src.core.domain.repositories import FacetIdentificationRepository
+from src.core.domain.repositories import (
+    PRODUCT_DETAILS_PAGE_SIZE,
+    FacetIdentificationRepository,
+)
 from src.core.embedding_generation.uow.create_embedding import create_embedding
 from src.core.embedding_generation.uow.update_embedding import update_embedding
 from src.core.facet_inference.concurrency import AsyncConcurrencyManager
 from src.core.infrastructure.database.embeddings.repository import (
     ProductEmbeddingRepository,
 )
+from src.core.infrastructure.database.input_data.repositories import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -37,18 +42,17 @@ def _get_product_description(product_details: ProductDetails) -> str:
     return "\n".join(description_parts)
 
 
-async def _embed_product_description(product_key: str) -> str:
+async def _embed_product_description(product_details: ProductDetails) -> str:
     """
     Create or update embedding for a single product.
 
     Returns status string.
     """
+    product_key = product_details.product_key
     logger.debug(f"Starting embedding for product: {product_key}")
     try:
+        description = _get_product_description(product_details)
         with SessionLocal() as session:
-            facet_repo = FacetIdentificationRepository(session)
-            product_details = facet_repo.get_product_details(product_key)
-            description = _get_product_description(product_details)
             embedding_repo = ProductEmbeddingRepository(session)
             found_embedding = embedding_repo.find(product_key)
 
@@ -69,33 +73,76 @@ async def _embed_product_description(product_key: str) -> str:
         return "error"
 
 
-async def create_embeddings_for_products(max_concurrency: int = 10) -> None:
+def _product_detail_pages(
+    product_keys: list[str] | None,
+) -> Iterator[list[ProductDetails]]:
     """
-    Create or update embeddings for all products.
+    The details of every product, or of the products of product_keys that
+    exist, a page at a time. Each page is read in its own short session,
+    so no connection is held while a page is being embedded.
     """
-    with SessionLocal() as session:
-        product_details = FacetIdentificationRepository(
-            session
-        ).get_all_product_details()
-        product_keys = [
-            product_details.product_key for product_details in product_details
-        ]
+    if product_keys is not None:
+        for chunk in chunked(product_keys, PRODUCT_DETAILS_PAGE_SIZE):
+            with SessionLocal() as session:
+                found = FacetIdentificationRepository(
+                    session
+                ).find_product_details_many(chunk)
+            yield list(found.values())
+        return
+
+    after: str | None = None
+    while True:
+        with SessionLocal() as session:
+            page = FacetIdentificationRepository(
+                session
+            ).get_product_details_page(after)
+        if not page:
+            return
+        yield page
+        after = page[-1].product_key
+
+
+async def create_embeddings_for_products(
+    max_concurrency: int = 10, product_keys: list[str] | None = None
+) -> None:
+    """
+    Create or update embeddings for all products, or only for product_keys
+    when given.
 
+    Products are read and embedded a page at a time, so memory does not
+    grow with the size of the catalogue.
+    """
     results = {"created": 0, "updated": 0, "skipped": 0, "error": 0}
     manager = AsyncConcurrencyManager(max_concurrent=max_concurrency)
-
-    statuses = await manager.execute(_embed_product_description, product_keys)
-    for status in tqdm(statuses, desc="Embedding products", unit="product"):
-        if status == "created":
-            results["created"] += 1
-        elif status == "updated":
-            results["updated"] += 1
-        elif status == "skipped":
-            results["skipped"] += 1
-        else:
-            results["error"] += 1
+    embedded: set[str] = set()
+
+    with tqdm(desc="Embedding products", unit="product") as progress:
+        for batch in _product_detail_pages(product_keys):
+            statuses = await manager.execute(_embed_product_description, batch)
+            for status in statuses:
+                if status == "created":
+                    results["created"] += 1
+                elif status == "updated":
+                    results["updated"] += 1
+                elif status == "skipped":
+                    results["skipped"] += 1
+                else:
+                    results["error"] += 1
+            if product_keys is not None:
+                embedded.update(details.product_key for details in batch)
+            progress.update(len(batch))
+
+    for product_key in set(product_keys or ()) - embedded:
+        logger.error(f"Product {product_key}: error - not found")
 
 
 async def embed_single_product(product_key: str) -> None:
     """Embed or update a single product by key"""
-    await _embed_product_description(product_key)
+    with SessionLocal() as session:
+        product_details = FacetIdentificationRepository(
+            session
+        ).find_product_details(product_key)
+    if product_details is None:
+        logger.error(f"Product {product_key}: error - not found")
+        return
+    await _embed_product_description(product_details)
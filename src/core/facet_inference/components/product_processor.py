@@ -3,9 +3,10 @@
 import logging
 from typing import Mapping, Sequence, Tuple
 
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.common.db import AsyncSessionLocal
 from src.core.domain.models import FacetPrediction
 from src.core.domain.repositories import FacetIdentificationRepository
 from src.core.domain.types import ProductAttributeGap
@@ -14,7 +15,11 @@ from src.core.facet_inference.data_loading.ground_truth_loader import (
     GroundTruthLoader,
 )
 from src.core.facet_inference.service import FacetInferenceService
+from src.core.infrastructure.database.input_data.allowable_values import (
+    ALLOWABLE_VALUES,
+)
 from src.core.infrastructure.database.input_data.records import (
+    AllowableValueResolvedRecord,
     RawAttributeRecord,
     RawProductRecord,
 )
@@ -34,7 +39,6 @@ class ProductProcessor:
         self.session = session
         self.repository = FacetIdentificationRepository(session)
         self.ground_truth_loader = GroundTruthLoader(session)
-        self.service = FacetInferenceService.from_session(session)
 
     def get_accepted_recommendations(
         self,
@@ -75,44 +79,15 @@ class ProductProcessor:
         return attribute.attribute_key if attribute else None
 
     def get_allowable_values(self, attribute_key: str) -> list[str]:
-        """Get allowable values for an attribute."""
-        category_values = list(
-            self.session.scalars(
-                select(text("value"))
-                .select_from(text("raw_category_allowable_values"))
-                .where(text("attribute_key = :attribute_key"))
-                .params(attribute_key=attribute_key)
-            ).all()
-        )
-
-        global_values = list(
-            self.session.scalars(
-                select(text("value"))
-                .select_from(
-                    text(
-                        "raw_attribute_allowable_values_"
-                        "applicable_in_every_category"
-                    )
-                )
-                .where(text("attribute_key = :attribute_key"))
-                .params(attribute_key=attribute_key)
-            ).all()
-        )
-
-        any_category_values = list(
-            self.session.scalars(
-                select(text("value"))
-                .select_from(
-                    text("raw_attribute_allowable_values_in_any_category")
-                )
-                .where(text("attribute_key = :attribute_key"))
-                .params(attribute_key=attribute_key)
-            ).all()
-        )
-
-        return sorted(
-            list(set(category_values + global_values + any_category_values))
-        )
+        """Get allowable values for an attribute, in any category."""
+        values = set()
+        for allowable_values in self.session.scalars(
+            select(AllowableValueResolvedRecord.allowable_values).where(
+                AllowableValueResolvedRecord.attribute_key == attribute_key
+            )
+        ):
+            values.update(allowable_values)
+        return sorted(values)
 
     async def process_product(
         self, product_ref: str, recommendations: Sequence[GroundTruthEntry]
@@ -134,13 +109,18 @@ class ProductProcessor:
 
         # Get product categories for allowable values
         product_categories = (
-            self.service.repository.product_category_repo.get_by_product_key(
+            self.repository.product_category_repo.get_by_product_key(
                 product_key
             )
         )
         category_keys = [pc.category_key for pc in product_categories]
 
         # Build gaps from recommendations
+        resolved = ALLOWABLE_VALUES.resolve(
+            self.session,
+            category_keys,
+            (rec.attribute_key for rec in recommendations),
+        )
         gaps = []
         seen_attributes = set()
 
@@ -148,11 +128,7 @@ class ProductProcessor:
             if rec.attribute_name in seen_attributes:
                 continue
 
-            allowable_values = list(
-                self.service.repository._get_allowable_values_for_attribute(
-                    category_keys, rec.attribute_key
-                )
-            )
+            allowable_values = list(resolved[rec.attribute_key])
 
             gaps.append(
                 ProductAttributeGap(
@@ -170,9 +146,11 @@ class ProductProcessor:
             logger.warning(f"No valid gaps found for product {product_key}")
             return product_key, []
 
-        predictions = await self.service.predict_for_product_key(
-            product_key, evaluation_mode=True
-        )
+        async with AsyncSessionLocal() as session:
+            service = FacetInferenceService.from_session(session)
+            predictions = await service.predict_for_product_key(
+                product_key, evaluation_mode=True
+            )
         logger.info(f"Generated {len(predictions)} predictions")
 
         return product_key, predictions
@@ -9,8 +9,6 @@ from sqlalchemy.orm import Session
 from src.core.domain.repositories import FacetIdentificationRepository
 from src.core.infrastructure.database.input_data.records import (
     HumanRecommendationRecord,
-    RawAttributeRecord,
-    RawProductRecord,
 )
 from src.core.infrastructure.database.input_data.repositories import (
     RawAttributeRepository,
@@ -58,23 +56,22 @@ class GroundTruthLoader:
             )
         ).all()
 
+        # Resolve every referenced product and attribute up front, in
+        # batches, rather than with two queries per recommendation
+        products = self.product_repo.find_many_by_system_name(
+            rec.product_reference for rec in recommendations
+        )
+        attributes = self.attribute_repo.find_many_by_system_name(
+            rec.attribute_reference for rec in recommendations
+        )
+
         entries = []
         for rec in recommendations:
-            # Get product details
-            product = self.session.scalars(
-                select(RawProductRecord).where(
-                    RawProductRecord.system_name == rec.product_reference
-                )
-            ).first()
+            product = products.get(rec.product_reference)
             if not product:
                 continue
 
-            # Get attribute details
-            attribute = self.session.scalars(
-                select(RawAttributeRecord).where(
-                    RawAttributeRecord.system_name == rec.attribute_reference
-                )
-            ).first()
+            attribute = attributes.get(rec.attribute_reference)
             if not attribute:
                 continue
 
@@ -7,10 +7,8 @@ from typing import Sequence
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.core.infrastructure.database.input_data.records import (
-    HumanRecommendationRecord,
-)
 from src.core.infrastructure.database.input_data.repositories import (
+    HumanRecommendationRepository,
     RawAttributeRepository,
 )
 from src.core.infrastructure.database.predictions.records import (
@@ -51,6 +49,7 @@ class PredictionLoader:
         self.session = session
         self.repo = PredictionResultRepository(session)
         self.attribute_repo = RawAttributeRepository(session)
+        self.recommendation_repo = HumanRecommendationRepository(session)
 
     def load_predictions(
         self, experiment_key: str
@@ -92,6 +91,12 @@ class PredictionLoader:
             predictions: Sequence of predictions to validate
             similarity_threshold: Minimum similarity ratio to consider a match
         """
+        ground_truths = self.recommendation_repo.find_many(
+            entry.recommendation_key
+            for entry in predictions
+            if entry.recommendation_key
+        )
+
         for entry in predictions:
             if entry.recommendation_key:
                 try:
@@ -103,13 +108,7 @@ class PredictionLoader:
                         f"attribute: {entry.attribute_key})"
                     )
 
-                    query = select(HumanRecommendationRecord).where(
-                        HumanRecommendationRecord.id
-                        == entry.recommendation_key
-                    )
-                    logger.info(f"Executing query: {query}")
-
-                    ground_truth = self.session.scalars(query).first()
+                    ground_truth = ground_truths.get(entry.recommendation_key)
 
                     if ground_truth:
                         # Compare predicted value with ground truth
@@ -148,16 +147,7 @@ class PredictionLoader:
                     else:
                         logger.warning(
                             f"No recommendation record found with ID "
-                            f"{entry.recommendation_key}. "
-                            f"Query returned no results.\n"
-                            f"SQL query was: {query}"
-                        )
-
-                        count_query = select(HumanRecommendationRecord)
-                        total_records = self.session.scalars(count_query).all()
-                        logger.info(
-                            f"Total records in human_recommendations table: "
-                            f"{len(total_records)}"
+                            f"{entry.recommendation_key}."
                         )
 
                 except Exception as e:
@@ -16,6 +16,12 @@ from src.core.facet_inference.data_loading.prediction_loader import (
     PredictionEntry,
     PredictionLoader,
 )
+from src.core.infrastructure.database.input_data.allowable_values import (
+    ALLOWABLE_VALUES,
+)
+from src.core.infrastructure.database.input_data.reference_cache import (
+    REFERENCE_CACHE,
+)
 from src.core.infrastructure.database.input_data.repositories import (
     RawAttributeRepository,
 )
@@ -51,11 +57,16 @@ class FacetInferenceOrchestrator:
         self.prediction_loader = PredictionLoader(session)
         self.attribute_repo = RawAttributeRepository(session)
 
-    async def run_experiment(self, limit: int | None = None) -> str:
+    async def run_experiment(
+        self,
+        limit: int | None = None,
+        product_keys: set[str] | None = None,
+    ) -> str:
         """Run a prediction experiment for multiple products.
 
         Args:
             limit: Optional limit on number of products to process
+            product_keys: Optional set of product keys to restrict the run to
 
         Returns:
             The experiment key for this run
@@ -80,6 +91,13 @@ class FacetInferenceOrchestrator:
                     logger.info(f"Reached limit of {limit} products")
                     break
 
+                if (
+                    product_keys is not None
+                    and recommendations
+                    and recommendations[0].product_key not in product_keys
+                ):
+                    continue
+
                 try:
                     product_key, predictions = (
                         await self.product_processor.process_product(
@@ -91,13 +109,22 @@ class FacetInferenceOrchestrator:
                         logger.error(f"No product key found for {product_ref}")
                         continue
 
+                    attributes = (
+                        self.attribute_repo.find_many_by_friendly_name(
+                            prediction.attribute for prediction in predictions
+                        )
+                    )
+
                     # Store each prediction individually and commit immediately
                     for prediction, recommendation in zip(
                         predictions, recommendations
                     ):
-                        attribute = self.attribute_repo.get_by_friendly_name(
-                            prediction.attribute
-                        )
+                        attribute = attributes.get(prediction.attribute)
+                        if attribute is None:
+                            raise ValueError(
+                                f"No attribute found with friendly name "
+                                f"{prediction.attribute}"
+                            )
 
                         self.prediction_repo.create_prediction(
                             experiment_key=experiment_key,
@@ -173,6 +200,17 @@ class FacetInferenceOrchestrator:
                 f"{correct_predictions} correct, "
                 f"{accuracy:.2%} accuracy"
             )
+            reference_stats = REFERENCE_CACHE.stats()
+            logger.debug(
+                f"Reference data cache: {reference_stats.hits} hits, "
+                f"{reference_stats.misses} misses"
+            )
+            allowable_stats = ALLOWABLE_VALUES.stats()
+            logger.debug(
+                f"Allowable values cache: {allowable_stats.hits} hits, "
+                f"{allowable_stats.misses} misses, "
+                f"{allowable_stats.entries} entries"
+            )
 
             return experiment_key
 
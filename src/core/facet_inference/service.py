@@ -1,9 +1,9 @@
 from typing import Sequence
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.domain.models import FacetPrediction, ProductDetails
-from src.core.domain.repositories import FacetIdentificationRepository
+from src.core.domain.repositories import AsyncFacetIdentificationRepository
 from src.core.domain.types import ProductAttributeGap
 from src.core.facet_inference.concurrency import AsyncConcurrencyManager
 from src.core.facet_inference.inference import ProductFacetPredictor
@@ -16,7 +16,7 @@ class FacetInferenceService:
 
     def __init__(
         self,
-        repository: FacetIdentificationRepository,
+        repository: AsyncFacetIdentificationRepository,
         max_concurrent: int = 32,
     ) -> None:
         self.repository = repository
@@ -26,11 +26,11 @@ class FacetInferenceService:
     @classmethod
     def from_session(
         cls,
-        session: Session,
+        session: AsyncSession,
         max_concurrent: int = 32,
     ) -> "FacetInferenceService":
-        """Create a service instance from a session."""
-        repository = FacetIdentificationRepository(session)
+        """Create a service instance from an asyncio session."""
+        repository = AsyncFacetIdentificationRepository(session)
         return cls(
             repository=repository,
             max_concurrent=max_concurrent,
@@ -48,16 +48,18 @@ class FacetInferenceService:
 
         This is largely a method for the demo rather than for production use.
         """
-        product_details = self.repository.get_product_details(product_key)
+        product_details = await self.repository.get_product_details(
+            product_key
+        )
 
         if evaluation_mode:
             product_gaps = (
-                self.repository.get_product_gaps_from_recommendations(
+                await self.repository.get_product_gaps_from_recommendations(
                     product_key
                 )
             )
         else:
-            product_gaps = self.repository.get_product_gaps(product_key)
+            product_gaps = await self.repository.get_product_gaps(product_key)
 
         predictor = ProductFacetPredictor(product_details, self.llm_client)
         return await self.concurrency_manager.execute(
@@ -75,7 +77,9 @@ class FacetInferenceService:
         This method is useful for handling specific attribute gaps or
         targeted predictions.
         """
-        product_details = self.repository.get_product_details(product_key)
+        product_details = await self.repository.get_product_details(
+            product_key
+        )
         predictor = ProductFacetPredictor(product_details, self.llm_client)
         return await self.concurrency_manager.execute(
             predictor.predict_gap, gaps
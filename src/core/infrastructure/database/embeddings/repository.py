@@ -1,8 +1,9 @@
 from datetime import datetime, timezone
-from typing import cast
+from typing import Any, cast
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import DateTime, String, exists, select, update
+from sqlalchemy import DateTime, Select, String, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, Session, mapped_column
 
 from src.common.clock import clock
@@ -47,6 +48,29 @@ class ProductEmbeddingRecord(Base):
         )
 
 
+def _similar_products_statement(
+    embedding: list[float], limit: int, distance_threshold: float
+) -> Select:
+    """Products within distance_threshold of embedding, nearest first"""
+    distance = ProductEmbeddingRecord.embedding.cosine_distance(embedding)
+    return (
+        select(ProductEmbeddingRecord.product_key, distance.label("distance"))
+        .where(distance <= distance_threshold)
+        .order_by("distance")
+        .limit(limit)
+    )
+
+
+def _similar_products(rows: Any) -> list[SimilarProductResult]:
+    return [
+        SimilarProductResult(
+            product_key=row.product_key,
+            distance=float(row.distance),
+        )
+        for row in rows
+    ]
+
+
 class ProductEmbeddingRepository:
     """Repository for managing product embeddings"""
 
@@ -110,32 +134,10 @@ class ProductEmbeddingRepository:
         if not source_embedding:
             raise ValueError(f"No embedding found for product {product_key}")
 
-        stmt = (
-            select(
-                ProductEmbeddingRecord.product_key,
-                ProductEmbeddingRecord.embedding.cosine_distance(
-                    source_embedding.embedding
-                ).label("distance"),
-            )
-            .where(
-                ProductEmbeddingRecord.embedding.cosine_distance(
-                    source_embedding.embedding
-                )
-                <= distance_threshold
-            )
-            .where(ProductEmbeddingRecord.product_key != product_key)
-            .order_by("distance")
-            .limit(limit)
-        )
-
-        result = self.session.execute(stmt)
-        return [
-            SimilarProductResult(
-                product_key=row.product_key,
-                distance=float(row.distance),
-            )
-            for row in result
-        ]
+        stmt = _similar_products_statement(
+            source_embedding.embedding, limit, distance_threshold
+        ).where(ProductEmbeddingRecord.product_key != product_key)
+        return _similar_products(self.session.execute(stmt))
 
     def find_similar_products_by_embedding(
         self,
@@ -148,27 +150,59 @@ class ProductEmbeddingRepository:
         embedding vector. Products with identical embeddings are excluded
         from results.
         """
-        stmt = (
-            select(
-                ProductEmbeddingRecord.product_key,
-                ProductEmbeddingRecord.embedding.cosine_distance(
-                    embedding
-                ).label("distance"),
-            )
-            .where(
-                ProductEmbeddingRecord.embedding.cosine_distance(embedding)
-                <= distance_threshold
-            )
-            .where(ProductEmbeddingRecord.embedding != embedding)
-            .order_by("distance")
-            .limit(limit)
-        )
+        stmt = _similar_products_statement(
+            embedding, limit, distance_threshold
+        ).where(ProductEmbeddingRecord.embedding != embedding)
+        return _similar_products(self.session.execute(stmt))
 
-        result = self.session.execute(stmt)
-        return [
-            SimilarProductResult(
-                product_key=row.product_key,
-                distance=float(row.distance),
-            )
-            for row in result
-        ]
+
+class AsyncProductEmbeddingRepository:
+    """
+    Asyncio counterpart of the similarity queries of
+    ProductEmbeddingRepository
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def find(self, product_key: str) -> ProductEmbedding | None:
+        """Find a product embedding by product key"""
+        record = await self.session.get(ProductEmbeddingRecord, product_key)
+        if not record:
+            return None
+        return record.to_dto()
+
+    async def find_similar_products_by_key(
+        self,
+        product_key: str,
+        limit: int = 10,
+        distance_threshold: float = 0.3,
+    ) -> list[SimilarProductResult]:
+        """
+        Find similar products using cosine distance, starting from a product
+        key. The source product is automatically excluded from results.
+        """
+        source_embedding = await self.find(product_key)
+        if not source_embedding:
+            raise ValueError(f"No embedding found for product {product_key}")
+
+        stmt = _similar_products_statement(
+            source_embedding.embedding, limit, distance_threshold
+        ).where(ProductEmbeddingRecord.product_key != product_key)
+        return _similar_products(await self.session.execute(stmt))
+
+    async def find_similar_products_by_embedding(
+        self,
+        embedding: list[float],
+        limit: int = 10,
+        distance_threshold: float = 0.3,
+    ) -> list[SimilarProductResult]:
+        """
+        Find similar products using cosine distance, starting from an
+        embedding vector. Products with identical embeddings are excluded
+        from results.
+        """
+        stmt = _similar_products_statement(
+            embedding, limit, distance_threshold
+        ).where(ProductEmbeddingRecord.embedding != embedding)
+        return _similar_products(await self.session.execute(stmt))
@@ -0,0 +1,201 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import config
+from src.core.infrastructure.database.input_data.records import (
+    AllowableValueResolvedRecord,
+)
+from src.core.infrastructure.database.input_data.reference_cache import (
+    REFERENCE_CACHE,
+)
+from src.core.infrastructure.database.input_data.reference_data import (
+    AllowableValueLookup,
+    ReferenceData,
+)
+
+# The category_key of the values allowed in every category.
+EVERY_CATEGORY = ""
+
+CategorySignature = frozenset[str]
+
+
+@dataclass(frozen=True)
+class AllowableValueCacheStats:
+    hits: int
+    misses: int
+    entries: int
+
+
+def _resolved_statement(
+    category_keys: Iterable[str], attribute_keys: Iterable[str]
+) -> Select:
+    return select(
+        AllowableValueResolvedRecord.attribute_key,
+        AllowableValueResolvedRecord.allowable_values,
+    ).where(
+        AllowableValueResolvedRecord.category_key.in_(
+            [*category_keys, EVERY_CATEGORY]
+        ),
+        AllowableValueResolvedRecord.attribute_key.in_(list(attribute_keys)),
+    )
+
+
+def _merged(
+    attribute_keys: Iterable[str], rows: Sequence[Any]
+) -> dict[str, tuple[str, ...]]:
+    """The sorted union of the rows' values for each attribute"""
+    values: dict[str, set[str]] = {key: set() for key in attribute_keys}
+    for attribute_key, allowable_values in rows:
+        values[attribute_key].update(allowable_values)
+    return {key: tuple(sorted(value)) for key, value in values.items()}
+
+
+def _from_snapshot(
+    lookup: AllowableValueLookup,
+    category_keys: Iterable[str],
+    attribute_keys: Iterable[str],
+) -> dict[str, tuple[str, ...]]:
+    categories = list(category_keys)
+    return {
+        key: tuple(sorted(lookup.values_for(categories, key)))
+        for key in attribute_keys
+    }
+
+
+class AllowableValueResolver:
+    """
+    Allowable values of attributes for the categories of a product,
+    memoised by the product's category set: products that share their
+    categories share one sorted tuple of values per attribute.
+
+    Values come from the mapped reference snapshot when there is one, and
+    otherwise from the allowable_values_resolved materialized view, with a
+    single query for all the attributes a lookup misses. The memo is
+    dropped whenever REFERENCE_CACHE moves to another version, which
+    ingestion bumps when allowable values change, and once it holds
+    max_entries values.
+    """
+
+    def __init__(
+        self, max_entries: int = config.ALLOWABLE_VALUES_CACHE_SIZE
+    ) -> None:
+        self._max_entries = max_entries
+        self._values: dict[tuple[CategorySignature, str], tuple[str, ...]] = {}
+        self._version: int | None = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _cached(
+        self,
+        reference: ReferenceData,
+        signature: CategorySignature,
+        attribute_keys: Iterable[str],
+    ) -> tuple[dict[str, tuple[str, ...]], list[str]]:
+        """The memoised values of attribute_keys, and the keys missing"""
+        found: dict[str, tuple[str, ...]] = {}
+        missing: list[str] = []
+        with self._lock:
+            if self._version != reference.version:
+                self._values.clear()
+                self._version = reference.version
+            for attribute_key in dict.fromkeys(attribute_keys):
+                values = self._values.get((signature, attribute_key))
+                if values is None:
+                    missing.append(attribute_key)
+                else:
+                    found[attribute_key] = values
+            self._hits += len(found)
+            self._misses += len(missing)
+        return found, missing
+
+    def _remember(
+        self,
+        reference: ReferenceData,
+        signature: CategorySignature,
+        values: dict[str, tuple[str, ...]],
+    ) -> None:
+        with self._lock:
+            if self._version != reference.version:
+                return
+            if len(self._values) + len(values) > self._max_entries:
+                self._values.clear()
+            for attribute_key, attribute_values in values.items():
+                self._values[(signature, attribute_key)] = attribute_values
+
+    def resolve(
+        self,
+        session: Session,
+        category_keys: Iterable[str],
+        attribute_keys: Iterable[str],
+    ) -> dict[str, tuple[str, ...]]:
+        """
+        The sorted allowable values of each of attribute_keys in any of
+        the categories, or in every category
+        """
+        reference = REFERENCE_CACHE.get(session)
+        signature = frozenset(category_keys)
+        found, missing = self._cached(reference, signature, attribute_keys)
+        if missing:
+            if reference.allowable_values is not None:
+                resolved = _from_snapshot(
+                    reference.allowable_values, signature, missing
+                )
+            else:
+                resolved = _merged(
+                    missing,
+                    session.execute(
+                        _resolved_statement(signature, missing)
+                    ).all(),
+                )
+            self._remember(reference, signature, resolved)
+            found.update(resolved)
+        return found
+
+    async def resolve_async(
+        self,
+        session: AsyncSession,
+        category_keys: Iterable[str],
+        attribute_keys: Iterable[str],
+    ) -> dict[str, tuple[str, ...]]:
+        """Asyncio counterpart of resolve"""
+        reference = await REFERENCE_CACHE.get_async(session)
+        signature = frozenset(category_keys)
+        found, missing = self._cached(reference, signature, attribute_keys)
+        if missing:
+            if reference.allowable_values is not None:
+                resolved = _from_snapshot(
+                    reference.allowable_values, signature, missing
+                )
+            else:
+                resolved = _merged(
+                    missing,
+                    (
+                        await session.execute(
+                            _resolved_statement(signature, missing)
+                        )
+                    ).all(),
+                )
+            self._remember(reference, signature, resolved)
+            found.update(resolved)
+        return found
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> AllowableValueCacheStats:
+        with self._lock:
+            return AllowableValueCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._values),
+            )
+
+
+ALLOWABLE_VALUES = AllowableValueResolver()
@@ -1,6 +1,15 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.common.db import Base
@@ -177,3 +186,44 @@ class HumanRecommendationRecord(Base):
     action: Mapped[str] = mapped_column(String)
     link_to_site: Mapped[str] = mapped_column(String)
     comment: Mapped[str] = mapped_column(String)
+    content_hash: Mapped[str] = mapped_column(String, unique=True)
+    source_batch: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class IngestionManifestRecord(Base):
+    __tablename__ = "ingestion_manifest"
+
+    filename: Mapped[str] = mapped_column(String, primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String)
+    rows_committed: Mapped[int] = mapped_column(BigInteger, default=0)
+    status: Mapped[str] = mapped_column(String)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class IngestionRowHashRecord(Base):
+    __tablename__ = "ingestion_row_hashes"
+
+    filename: Mapped[str] = mapped_column(String, primary_key=True)
+    row_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    row_hash: Mapped[str] = mapped_column(String)
+
+
+class ReferenceDataVersionRecord(Base):
+    __tablename__ = "reference_data_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+# Materialized view; category_key '' holds the values of every category.
+class AllowableValueResolvedRecord(Base):
+    __tablename__ = "allowable_values_resolved"
+
+    category_key: Mapped[str] = mapped_column(String, primary_key=True)
+    attribute_key: Mapped[str] = mapped_column(String, primary_key=True)
+    allowable_values: Mapped[list[str]] = mapped_column(ARRAY(Text))
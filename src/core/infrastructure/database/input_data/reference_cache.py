@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import config
+from src.core.infrastructure.database.input_data.reference_data import (
+    REFERENCE_STATEMENTS,
+    VERSION_STATEMENT,
+    ReferenceData,
+    build_reference_data,
+)
+from src.core.infrastructure.database.input_data.reference_snapshot import (
+    map_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReferenceCacheStats:
+    hits: int
+    misses: int
+    version: int | None
+
+
+def _configured_snapshot_path() -> Path | None:
+    path = config.REFERENCE_SNAPSHOT_PATH
+    return Path(path) if path else None
+
+
+class ReferenceDataCache:
+    """
+    Process-wide, read-only copy of the reference tables: attributes,
+    categories and the attributes of each category.
+
+    The tables are loaded on first use and served from memory afterwards.
+    At most every check_seconds a lookup reads reference_data_version, which
+    ingestion bumps whenever it changes one of them, and reloads the tables
+    if the version moved. invalidate() forces a reload in this process.
+
+    With a snapshot_path, a snapshot written by ingestion at the current
+    version is mapped instead of loading the tables, which also makes
+    allowable values available from memory.
+    """
+
+    def __init__(
+        self,
+        check_seconds: float = config.REFERENCE_CACHE_CHECK_SECONDS,
+        snapshot_path: Path | None = _configured_snapshot_path(),
+    ) -> None:
+        self._check_seconds = check_seconds
+        self._snapshot_path = snapshot_path
+        self._data: ReferenceData | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def snapshot_path(self) -> Path | None:
+        return self._snapshot_path
+
+    def _fresh(self) -> ReferenceData | None:
+        """The cached data, if it was checked recently enough"""
+        data = self._data
+        if (
+            data is not None
+            and time.monotonic() - self._checked_at < self._check_seconds
+        ):
+            with self._lock:
+                self._hits += 1
+            return data
+        return None
+
+    def _current(self, version: int) -> ReferenceData | None:
+        """The cached data, if it is still at version"""
+        with self._lock:
+            data = self._data
+            if data is None or data.version != version:
+                return None
+            self._checked_at = time.monotonic()
+            self._hits += 1
+            return data
+
+    def _mapped(self, version: int | None = None) -> ReferenceData | None:
+        """The snapshot, if there is one at version (or at any version)"""
+        if self._snapshot_path is None or not self._snapshot_path.exists():
+            return None
+        try:
+            data = map_snapshot(self._snapshot_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring reference snapshot: {str(e)}")
+            return None
+        if version is not None and data.version != version:
+            return None
+        return data
+
+    def _install(self, data: ReferenceData, source: str) -> ReferenceData:
+        with self._lock:
+            self._data = data
+            self._checked_at = time.monotonic()
+            self._misses += 1
+        logger.info(
+            f"Loaded reference data version {data.version} from {source}: "
+            f"{len(data.attributes)} attributes, "
+            f"{len(data.categories)} categories"
+        )
+        return data
+
+    def map_snapshot(self) -> bool:
+        """
+        Map the snapshot now, if there is one, without checking its version
+        until check_seconds have passed. Meant for process startup.
+        """
+        data = self._mapped()
+        if data is None:
+            return False
+        self._install(data, str(self._snapshot_path))
+        return True
+
+    def get(self, session: Session) -> ReferenceData:
+        """The reference data, loaded through session if needed"""
+        if (data := self._fresh()) is not None:
+            return data
+        version = session.scalar(VERSION_STATEMENT) or 0
+        if (data := self._current(version)) is not None:
+            return data
+        if (data := self._mapped(version)) is not None:
+            return self._install(data, str(self._snapshot_path))
+        rows = [
+            session.execute(statement).all()
+            for statement in REFERENCE_STATEMENTS
+        ]
+        return self._install(
+            build_reference_data(version, *rows), "the database"
+        )
+
+    async def get_async(self, session: AsyncSession) -> ReferenceData:
+        """Asyncio counterpart of get"""
+        if (data := self._fresh()) is not None:
+            return data
+        version = await session.scalar(VERSION_STATEMENT) or 0
+        if (data := self._current(version)) is not None:
+            return data
+        if (data := self._mapped(version)) is not None:
+            return self._install(data, str(self._snapshot_path))
+        rows = [
+            (await session.execute(statement)).all()
+            for statement in REFERENCE_STATEMENTS
+        ]
+        return self._install(
+            build_reference_data(version, *rows), "the database"
+        )
+
+    def invalidate(self) -> None:
+        """Reload the reference data on its next lookup"""
+        with self._lock:
+            self._data = None
+
+    def stats(self) -> ReferenceCacheStats:
+        with self._lock:
+            return ReferenceCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                version=self._data.version if self._data else None,
+            )
+
+
+REFERENCE_CACHE = ReferenceDataCache()
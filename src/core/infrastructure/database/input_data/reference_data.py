@@ -0,0 +1,156 @@
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, NamedTuple, Protocol, Sequence
+
+from sqlalchemy import Select, select
+
+from src.core.infrastructure.database.input_data.records import (
+    RawAttributeAllowableValueApplicableInEveryCategoryRecord,
+    RawAttributeAllowableValueInAnyCategoryRecord,
+    RawAttributeRecord,
+    RawCategoryAllowableValueRecord,
+    RawCategoryAttributeRecord,
+    RawCategoryRecord,
+    ReferenceDataVersionRecord,
+)
+
+GloballyAllowedValueRecord = (
+    RawAttributeAllowableValueApplicableInEveryCategoryRecord
+)
+SharedAllowedValueRecord = RawAttributeAllowableValueInAnyCategoryRecord
+
+
+class AttributeReference(NamedTuple):
+    attribute_key: str
+    system_name: str
+    friendly_name: str
+    attribute_type: str
+    unit_measure_type: str
+
+
+class CategoryReference(NamedTuple):
+    category_key: str
+    system_name: str
+    friendly_name: str
+
+
+class AllowableValueLookup(Protocol):
+    def values_for(
+        self, category_keys: Sequence[str], attribute_key: str
+    ) -> set[str]:
+        """
+        The values allowed for an attribute in any of the categories, or in
+        every category, or in any category at all.
+        """
+        ...
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """
+    One snapshot of the attributes, categories and category attributes.
+
+    allowable_values is only available from a mapped snapshot; without it,
+    allowable values are queried.
+    """
+
+    version: int
+    attributes: Mapping[str, AttributeReference]
+    attributes_by_system_name: Mapping[str, AttributeReference]
+    attributes_by_friendly_name: Mapping[str, AttributeReference]
+    categories: Mapping[str, CategoryReference]
+    categories_by_system_name: Mapping[str, CategoryReference]
+    category_attributes: Mapping[str, frozenset[str]]
+    allowable_values: AllowableValueLookup | None = None
+
+    def attribute_keys_for_categories(
+        self, category_keys: Iterable[str]
+    ) -> set[str]:
+        """The attributes of any of the given categories"""
+        return set().union(
+            *(
+                self.category_attributes.get(category_key, ())
+                for category_key in category_keys
+            )
+        )
+
+
+VERSION_STATEMENT = select(ReferenceDataVersionRecord.version)
+
+# Attributes, categories and category attributes, in the order
+# build_reference_data takes their rows.
+REFERENCE_STATEMENTS: tuple[Select, ...] = (
+    select(
+        RawAttributeRecord.attribute_key,
+        RawAttributeRecord.system_name,
+        RawAttributeRecord.friendly_name,
+        RawAttributeRecord.attribute_type,
+        RawAttributeRecord.unit_measure_type,
+    ).order_by(RawAttributeRecord.attribute_key),
+    select(
+        RawCategoryRecord.category_key,
+        RawCategoryRecord.system_name,
+        RawCategoryRecord.friendly_name,
+    ).order_by(RawCategoryRecord.category_key),
+    select(
+        RawCategoryAttributeRecord.category_key,
+        RawCategoryAttributeRecord.attribute_key,
+    ),
+)
+
+# Category, global and any-category allowable values.
+ALLOWABLE_VALUE_STATEMENTS: tuple[Select, ...] = (
+    select(
+        RawCategoryAllowableValueRecord.category_key,
+        RawCategoryAllowableValueRecord.attribute_key,
+        RawCategoryAllowableValueRecord.value,
+    ),
+    select(
+        GloballyAllowedValueRecord.attribute_key,
+        GloballyAllowedValueRecord.value,
+    ),
+    select(
+        SharedAllowedValueRecord.attribute_key,
+        SharedAllowedValueRecord.value,
+    ),
+)
+
+BUMP_VERSION_SQL = (
+    "INSERT INTO reference_data_version (id, version, updated_at) "
+    "VALUES (1, 1, now()) ON CONFLICT (id) DO UPDATE SET "
+    "version = reference_data_version.version + 1, updated_at = now()"
+)
+
+
+def _by_first(references: Sequence[Any], field: str) -> dict[str, Any]:
+    # Names are not guaranteed to be unique: keep the reference with the
+    # lowest key, so that lookups by name are deterministic.
+    indexed: dict[str, Any] = {}
+    for reference in references:
+        indexed.setdefault(getattr(reference, field), reference)
+    return indexed
+
+
+def build_reference_data(
+    version: int,
+    attribute_rows: Sequence[Any],
+    category_rows: Sequence[Any],
+    category_attribute_rows: Sequence[Any],
+) -> ReferenceData:
+    """Index the rows of REFERENCE_STATEMENTS into dicts"""
+    attributes = [AttributeReference(*row) for row in attribute_rows]
+    categories = [CategoryReference(*row) for row in category_rows]
+    category_attributes: dict[str, set[str]] = {}
+    for category_key, attribute_key in category_attribute_rows:
+        category_attributes.setdefault(category_key, set()).add(attribute_key)
+    return ReferenceData(
+        version=version,
+        attributes={a.attribute_key: a for a in attributes},
+        attributes_by_system_name=_by_first(attributes, "system_name"),
+        attributes_by_friendly_name=_by_first(attributes, "friendly_name"),
+        categories={c.category_key: c for c in categories},
+        categories_by_system_name=_by_first(categories, "system_name"),
+        category_attributes={
+            category_key: frozenset(attribute_keys)
+            for category_key, attribute_keys in category_attributes.items()
+        },
+    )
@@ -0,0 +1,393 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping, Sequence, TypeVar
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from src.core.infrastructure.database.input_data.reference_data import (
+    ALLOWABLE_VALUE_STATEMENTS,
+    REFERENCE_STATEMENTS,
+    VERSION_STATEMENT,
+    AttributeReference,
+    CategoryReference,
+    ReferenceData,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Layout: MAGIC, the length of a JSON header, the header, then each array
+# of the header's sections, aligned to _ALIGNMENT bytes. Every string is
+# stored once, in UTF-8 byte order, and tables refer to strings by their
+# position in that order (-1 for NULL).
+MAGIC = b"AIDAREF1"
+_HEADER_LENGTH = struct.Struct("<Q")
+_ALIGNMENT = 8
+
+_ATTRIBUTE_FIELDS = AttributeReference._fields
+_CATEGORY_FIELDS = CategoryReference._fields
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+class _Strings:
+    """The interned strings of a snapshot, addressed by position"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        # Plain memoryviews: bisecting reads a few entries per lookup, for
+        # which numpy scalars are much slower.
+        self._offsets = offsets.data.cast("B").cast("q")
+        self._data = data.data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._data[start:end].tobytes()
+
+    def text(self, index: int) -> str | None:
+        return None if index < 0 else self[index].decode("utf-8")
+
+    def find(self, value: str) -> int | None:
+        """The position of value, if the snapshot contains it"""
+        encoded = value.encode("utf-8")
+        index = bisect_left(self, encoded)
+        if index < len(self) and self[index] == encoded:
+            return index
+        return None
+
+
+class _Index(Mapping[str, T]):
+    """
+    Rows by one string column: ids holds the column sorted, and rows the
+    position of each entry's row. The first row wins for repeated values.
+    """
+
+    def __init__(
+        self,
+        strings: _Strings,
+        ids: np.ndarray,
+        rows: np.ndarray,
+        row: Callable[[int], T],
+    ) -> None:
+        self._strings = strings
+        self._ids = ids
+        self._rows = rows
+        self._row = row
+
+    def __getitem__(self, key: str) -> T:
+        string_id = self._strings.find(key)
+        if string_id is not None:
+            position = int(np.searchsorted(self._ids, string_id))
+            if position < len(self._ids) and self._ids[position] == string_id:
+                return self._row(int(self._rows[position]))
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for string_id in np.unique(self._ids[self._ids >= 0]).tolist():
+            yield self._strings[string_id].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(np.unique(self._ids[self._ids >= 0]))
+
+
+class _Groups(Mapping[str, frozenset[str]]):
+    """
+    The members of each group: keys holds the group of each member, sorted,
+    and members the string id of the member.
+    """
+
+    def __init__(
+        self, strings: _Strings, keys: np.ndarray, members: np.ndarray
+    ) -> None:
+        self._strings = strings
+        self._keys = keys
+        self._members = members
+
+    def member_ids(self, key: int) -> np.ndarray:
+        start, end = np.searchsorted(self._keys, [key, key + 1])
+        return self._members[start:end]
+
+    def __getitem__(self, group: str) -> frozenset[str]:
+        string_id = self._strings.find(group)
+        if string_id is not None:
+            members = self.member_ids(string_id).tolist()
+            if members:
+                return frozenset(
+                    self._strings[member].decode("utf-8") for member in members
+                )
+        raise KeyError(group)
+
+    def __iter__(self) -> Iterator[str]:
+        for string_id in np.unique(self._keys).tolist():
+            yield self._strings[string_id].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(np.unique(self._keys))
+
+
+class _AllowableValues:
+    """Allowable values answered from the snapshot's value groups"""
+
+    def __init__(
+        self,
+        strings: _Strings,
+        category_values: _Groups,
+        global_values: _Groups,
+        shared_values: _Groups,
+    ) -> None:
+        self._strings = strings
+        self._category_values = category_values
+        self._global_values = global_values
+        self._shared_values = shared_values
+
+    def values_for(
+        self, category_keys: Sequence[str], attribute_key: str
+    ) -> set[str]:
+        attribute_id = self._strings.find(attribute_key)
+        if attribute_id is None:
+            return set()
+        value_ids = [
+            self._category_values.member_ids(
+                (category_id << 32) | attribute_id
+            )
+            for category_id in map(self._strings.find, category_keys)
+            if category_id is not None
+        ]
+        value_ids.append(self._global_values.member_ids(attribute_id))
+        value_ids.append(self._shared_values.member_ids(attribute_id))
+        return {
+            self._strings[value_id].decode("utf-8")
+            for value_id in np.concatenate(value_ids).tolist()
+        }
+
+
+def _table_sections(
+    name: str,
+    fields: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+    ids: dict[str | None, int],
+    indexed: Sequence[str],
+) -> dict[str, np.ndarray]:
+    columns = {
+        field: np.array([ids[row[i]] for row in rows], dtype=np.int32)
+        for i, field in enumerate(fields)
+    }
+    sections = {f"{name}.{field}": column for field, column in columns.items()}
+    key = columns[fields[0]]
+    for field in indexed:
+        order = np.lexsort((key, columns[field])).astype(np.int32)
+        sections[f"{name}.by_{field}.ids"] = columns[field][order]
+        sections[f"{name}.by_{field}.rows"] = order
+    return sections
+
+
+def _group_sections(
+    name: str, keys: Sequence[int], members: Sequence[int]
+) -> dict[str, np.ndarray]:
+    key_array = np.array(keys, dtype=np.int64)
+    member_array = np.array(members, dtype=np.int32)
+    order = np.lexsort((member_array, key_array))
+    return {
+        f"{name}.keys": key_array[order],
+        f"{name}.members": member_array[order],
+    }
+
+
+def write_snapshot(session: Session, path: Path) -> int:
+    """
+    Write the reference data and allowable values, at their current
+    version, to a snapshot at path, and return that version.
+
+    The snapshot is written next to path and renamed over it, so processes
+    that mapped the previous one keep reading it until they map again.
+    """
+    version = session.scalar(VERSION_STATEMENT) or 0
+    attribute_rows, category_rows, category_attribute_rows = (
+        session.execute(statement).all() for statement in REFERENCE_STATEMENTS
+    )
+    category_value_rows, global_value_rows, shared_value_rows = (
+        session.execute(statement).all()
+        for statement in ALLOWABLE_VALUE_STATEMENTS
+    )
+
+    strings = sorted(
+        {
+            value.encode("utf-8")
+            for rows in (
+                attribute_rows,
+                category_rows,
+                category_attribute_rows,
+                category_value_rows,
+                global_value_rows,
+                shared_value_rows,
+            )
+            for row in rows
+            for value in row
+            if value is not None
+        }
+    )
+    ids: dict[str | None, int] = {
+        value.decode("utf-8"): i for i, value in enumerate(strings)
+    }
+    ids[None] = -1
+
+    sections: dict[str, np.ndarray] = {
+        "strings.offsets": np.cumsum([0, *map(len, strings)], dtype=np.int64),
+        "strings.data": np.frombuffer(b"".join(strings), dtype=np.uint8),
+        **_table_sections(
+            "attributes",
+            _ATTRIBUTE_FIELDS,
+            attribute_rows,
+            ids,
+            ("attribute_key", "system_name", "friendly_name"),
+        ),
+        **_table_sections(
+            "categories",
+            _CATEGORY_FIELDS,
+            category_rows,
+            ids,
+            ("category_key", "system_name"),
+        ),
+        **_group_sections(
+            "category_attributes",
+            [ids[category] for category, _ in category_attribute_rows],
+            [ids[attribute] for _, attribute in category_attribute_rows],
+        ),
+        **_group_sections(
+            "category_values",
+            [
+                (ids[category] << 32) | ids[attribute]
+                for category, attribute, _ in category_value_rows
+            ],
+            [ids[value] for _, _, value in category_value_rows],
+        ),
+        **_group_sections(
+            "global_values",
+            [ids[attribute] for attribute, _ in global_value_rows],
+            [ids[value] for _, value in global_value_rows],
+        ),
+        **_group_sections(
+            "shared_values",
+            [ids[attribute] for attribute, _ in shared_value_rows],
+            [ids[value] for _, value in shared_value_rows],
+        ),
+    }
+
+    layout: dict[str, dict[str, Any]] = {}
+    offset = 0
+    for name, array in sections.items():
+        offset = _aligned(offset)
+        layout[name] = {
+            "dtype": array.dtype.str,
+            "count": int(array.size),
+            "offset": offset,
+        }
+        offset += array.nbytes
+    header = json.dumps({"version": version, "sections": layout}).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}")
+    with open(temporary_path, "wb") as file:
+        file.write(MAGIC)
+        file.write(_HEADER_LENGTH.pack(len(header)))
+        file.write(header)
+        start = _aligned(file.tell())
+        for name, array in sections.items():
+            file.write(b"\0" * (start + layout[name]["offset"] - file.tell()))
+            file.write(array.tobytes())
+    os.replace(temporary_path, path)
+
+    logger.info(
+        f"Wrote reference snapshot version {version} to {path}: "
+        f"{len(strings)} strings, {len(attribute_rows)} attributes, "
+        f"{len(category_rows)} categories, "
+        f"{len(category_value_rows)} category allowable values"
+    )
+    return version
+
+
+def map_snapshot(path: Path) -> ReferenceData:
+    """
+    Map a snapshot written by write_snapshot, read-only.
+
+    Nothing is copied: lookups read the mapped pages, which the operating
+    system shares between every process that maps the same file. Raises
+    ValueError if path is not a snapshot.
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a reference snapshot")
+    (header_length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+    header_start = len(MAGIC) + _HEADER_LENGTH.size
+    header_end = header_start + header_length
+    header = json.loads(buffer[header_start:header_end])
+    start = _aligned(header_end)
+
+    arrays = {
+        name: (
+            np.frombuffer(
+                buffer,
+                dtype=section["dtype"],
+                count=section["count"],
+                offset=start + section["offset"],
+            )
+            if section["count"]
+            else np.empty(0, dtype=section["dtype"])
+        )
+        for name, section in header["sections"].items()
+    }
+    strings = _Strings(arrays["strings.offsets"], arrays["strings.data"])
+
+    def attribute(row: int) -> AttributeReference:
+        return AttributeReference._make(
+            strings.text(int(arrays[f"attributes.{field}"][row]))
+            for field in _ATTRIBUTE_FIELDS
+        )
+
+    def category(row: int) -> CategoryReference:
+        return CategoryReference._make(
+            strings.text(int(arrays[f"categories.{field}"][row]))
+            for field in _CATEGORY_FIELDS
+        )
+
+    def index(name: str, row: Callable[[int], T]) -> _Index[T]:
+        return _Index(
+            strings, arrays[f"{name}.ids"], arrays[f"{name}.rows"], row
+        )
+
+    def groups(name: str) -> _Groups:
+        return _Groups(
+            strings, arrays[f"{name}.keys"], arrays[f"{name}.members"]
+        )
+
+    return ReferenceData(
+        version=header["version"],
+        attributes=index("attributes.by_attribute_key", attribute),
+        attributes_by_system_name=index(
+            "attributes.by_system_name", attribute
+        ),
+        attributes_by_friendly_name=index(
+            "attributes.by_friendly_name", attribute
+        ),
+        categories=index("categories.by_category_key", category),
+        categories_by_system_name=index("categories.by_system_name", category),
+        category_attributes=groups("category_attributes"),
+        allowable_values=_AllowableValues(
+            strings,
+            groups("category_values"),
+            groups("global_values"),
+            groups("shared_values"),
+        ),
+    )
@@ -1,10 +1,12 @@
-from typing import Any, Generic, Type, TypeVar
+from typing import Any, Generic, Iterable, Iterator, Type, TypeVar
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from src.core.infrastructure.database.input_data.records import (
     HumanRecommendationRecord,
+    IngestionManifestRecord,
     RawAttributeAllowableValueApplicableInEveryCategoryRecord,
     RawAttributeAllowableValueInAnyCategoryRecord,
     RawAttributeRecord,
@@ -19,14 +21,31 @@ from src.core.infrastructure.database.input_data.records import (
     RawRecommendationRecord,
     RawRichTextSourceRecord,
 )
+from src.core.infrastructure.database.input_data.reference_cache import (
+    REFERENCE_CACHE,
+)
 
 T = TypeVar("T", bound=Any)
+K = TypeVar("K")
+
+# Keys bound per IN list by the batched getters. Longer key lists are
+# queried in chunks, keeping each statement well under PostgreSQL's limit
+# of 65535 bind parameters.
+IN_CHUNK_SIZE = 5000
 
 GloballyAllowedValueRecord = (
     RawAttributeAllowableValueApplicableInEveryCategoryRecord
 )
 
 
+def chunked(keys: Iterable[K], size: int = IN_CHUNK_SIZE) -> Iterator[list[K]]:
+    """The distinct keys, in order, in lists of at most size"""
+    distinct = list(dict.fromkeys(keys))
+    for start in range(0, len(distinct), size):
+        end = start + size
+        yield distinct[start:end]
+
+
 class Repository(Generic[T]):
     """Repository class with common functionality"""
 
@@ -53,9 +72,79 @@ class Repository(Generic[T]):
     def find_by_id(self, id: str) -> T | None:
         return self.session.get(self.model, id)
 
+    def get_many(self, ids: Iterable[Any]) -> dict[Any, T]:
+        """Rows by primary key, raising if any of the ids has none"""
+        ids = list(ids)
+        result = self.find_many(ids)
+        missing = [id for id in dict.fromkeys(ids) if id not in result]
+        if missing:
+            raise ValueError(
+                f"No {self.model.__name__} found with ids "
+                f"{', '.join(map(str, missing))}"
+            )
+        return result
+
+    def find_many(self, ids: Iterable[Any]) -> dict[Any, T]:
+        """Rows by primary key, for the ids that have one"""
+        primary_key = inspect(self.model).primary_key
+        if len(primary_key) != 1:
+            raise TypeError(
+                f"{self.model.__name__} has a composite primary key"
+            )
+        return self._find_many_by(getattr(self.model, primary_key[0].key), ids)
+
+    def _find_many_by(
+        self, column: InstrumentedAttribute[Any], keys: Iterable[Any]
+    ) -> dict[Any, T]:
+        """
+        Rows by the value of column, for the keys that have one: the first
+        row found for a key that several rows share.
+        """
+        result: dict[Any, T] = {}
+        for chunk in chunked(keys):
+            for record in self.session.scalars(
+                select(self.model).where(column.in_(chunk))
+            ):
+                result.setdefault(getattr(record, column.key), record)
+        return result
+
+    def _find_all_by(
+        self, column: InstrumentedAttribute[Any], keys: Iterable[Any]
+    ) -> dict[Any, list[T]]:
+        """All rows grouped by the value of column, for the keys with any"""
+        result: dict[Any, list[T]] = {}
+        for chunk in chunked(keys):
+            for record in self.session.scalars(
+                select(self.model).where(column.in_(chunk))
+            ):
+                result.setdefault(getattr(record, column.key), []).append(
+                    record
+                )
+        return result
+
     def get_all(self) -> list[T]:
         return list(self.session.scalars(select(self.model)).all())
 
+    def get_distinct_values(self, *columns: str) -> set[tuple[Any, ...]]:
+        """All distinct combinations of the given columns in the table"""
+        table = self.model.__table__
+        return {
+            tuple(row)
+            for row in self.session.execute(
+                select(*(table.c[column] for column in columns)).distinct()
+            )
+        }
+
+    def insert_many(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Insert plain column dicts in a single executemany, skipping rows
+        that conflict with one already in the table or earlier in rows
+        """
+        if rows:
+            self.session.execute(
+                insert(self.model).on_conflict_do_nothing(), rows
+            )
+
 
 class RawProductRepository(Repository[RawProductRecord]):
     """Repository for raw product data from CSV"""
@@ -82,13 +171,44 @@ class RawProductRepository(Repository[RawProductRecord]):
             )
         )
 
+    def find_many_by_system_name(
+        self, system_names: Iterable[str]
+    ) -> dict[str, RawProductRecord]:
+        return self._find_many_by(RawProductRecord.system_name, system_names)
+
 
 class RawCategoryRepository(Repository[RawCategoryRecord]):
-    """Repository for raw category data from CSV"""
+    """
+    Repository for raw category data from CSV.
+
+    Lookups by key are served from REFERENCE_CACHE and return detached
+    copies; lookups by system name query the table, which ingestion relies
+    on to skip categories it has just written.
+    """
 
     def __init__(self, session: Session):
         super().__init__(session, RawCategoryRecord)
 
+    def get_by_id(self, id: str) -> RawCategoryRecord:
+        result = self.find_by_id(id)
+        if result is None:
+            raise ValueError(f"No {self.model.__name__} found with id {id}")
+        return result
+
+    def find_by_id(self, id: str) -> RawCategoryRecord | None:
+        reference = REFERENCE_CACHE.get(self.session).categories.get(id)
+        if reference is None:
+            return None
+        return RawCategoryRecord(**reference._asdict())
+
+    def find_many(self, ids: Iterable[str]) -> dict[str, RawCategoryRecord]:
+        categories = REFERENCE_CACHE.get(self.session).categories
+        return {
+            id: RawCategoryRecord(**reference._asdict())
+            for id in dict.fromkeys(ids)
+            if (reference := categories.get(id)) is not None
+        }
+
     def get_by_system_name(self, system_name: str) -> RawCategoryRecord:
         result = self.session.scalar(
             select(RawCategoryRecord).where(
@@ -110,13 +230,44 @@ class RawCategoryRepository(Repository[RawCategoryRecord]):
             )
         )
 
+    def find_many_by_system_name(
+        self, system_names: Iterable[str]
+    ) -> dict[str, RawCategoryRecord]:
+        return self._find_many_by(RawCategoryRecord.system_name, system_names)
+
 
 class RawAttributeRepository(Repository[RawAttributeRecord]):
-    """Repository for raw attribute data from CSV"""
+    """
+    Repository for raw attribute data from CSV.
+
+    Lookups by key and friendly name are served from REFERENCE_CACHE and
+    return detached copies; lookups by system name query the table, which
+    ingestion relies on to skip attributes it has just written.
+    """
 
     def __init__(self, session: Session):
         super().__init__(session, RawAttributeRecord)
 
+    def get_by_id(self, id: str) -> RawAttributeRecord:
+        result = self.find_by_id(id)
+        if result is None:
+            raise ValueError(f"No {self.model.__name__} found with id {id}")
+        return result
+
+    def find_by_id(self, id: str) -> RawAttributeRecord | None:
+        reference = REFERENCE_CACHE.get(self.session).attributes.get(id)
+        if reference is None:
+            return None
+        return RawAttributeRecord(**reference._asdict())
+
+    def find_many(self, ids: Iterable[str]) -> dict[str, RawAttributeRecord]:
+        attributes = REFERENCE_CACHE.get(self.session).attributes
+        return {
+            id: RawAttributeRecord(**reference._asdict())
+            for id in dict.fromkeys(ids)
+            if (reference := attributes.get(id)) is not None
+        }
+
     def get_by_system_name(self, system_name: str) -> RawAttributeRecord:
         result = self.session.scalar(
             select(RawAttributeRecord).where(
@@ -138,18 +289,33 @@ class RawAttributeRepository(Repository[RawAttributeRecord]):
             )
         )
 
+    def find_many_by_system_name(
+        self, system_names: Iterable[str]
+    ) -> dict[str, RawAttributeRecord]:
+        return self._find_many_by(RawAttributeRecord.system_name, system_names)
+
     def get_by_friendly_name(self, friendly_name: str) -> RawAttributeRecord:
         """Get an attribute by its friendly name"""
-        result = self.session.scalar(
-            select(RawAttributeRecord).where(
-                RawAttributeRecord.friendly_name == friendly_name
-            )
-        )
-        if result is None:
+        reference = REFERENCE_CACHE.get(
+            self.session
+        ).attributes_by_friendly_name.get(friendly_name)
+        if reference is None:
             raise ValueError(
                 f"No attribute found with friendly name {friendly_name}"
             )
-        return result
+        return RawAttributeRecord(**reference._asdict())
+
+    def find_many_by_friendly_name(
+        self, friendly_names: Iterable[str]
+    ) -> dict[str, RawAttributeRecord]:
+        attributes = REFERENCE_CACHE.get(
+            self.session
+        ).attributes_by_friendly_name
+        return {
+            name: RawAttributeRecord(**reference._asdict())
+            for name in dict.fromkeys(friendly_names)
+            if (reference := attributes.get(name)) is not None
+        }
 
 
 class RawProductCategoryRepository(Repository[RawProductCategoryRecord]):
@@ -183,6 +349,13 @@ class RawProductCategoryRepository(Repository[RawProductCategoryRecord]):
             ).all()
         )
 
+    def find_many_by_product_key(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, list[RawProductCategoryRecord]]:
+        return self._find_all_by(
+            RawProductCategoryRecord.product_key, product_keys
+        )
+
     def get_by_category_key(
         self, category_key: str
     ) -> list[RawProductCategoryRecord]:
@@ -225,6 +398,21 @@ class RawCategoryAttributeRepository(Repository[RawCategoryAttributeRecord]):
     def __init__(self, session: Session):
         super().__init__(session, RawCategoryAttributeRecord)
 
+    def get_key_map(self) -> dict[str, tuple[str, str]]:
+        """Map every category_attribute_key to (category_key, attribute_key)"""
+        return {
+            category_attribute_key: (category_key, attribute_key)
+            for category_attribute_key, category_key, attribute_key in (
+                self.session.execute(
+                    select(
+                        RawCategoryAttributeRecord.category_attribute_key,
+                        RawCategoryAttributeRecord.category_key,
+                        RawCategoryAttributeRecord.attribute_key,
+                    )
+                )
+            )
+        }
+
     def get_by_category_key(
         self, category_key: str
     ) -> list[RawCategoryAttributeRecord]:
@@ -325,6 +513,13 @@ class RawProductAttributeValueRepository(
             ).all()
         )
 
+    def find_many_by_product_key(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, list[RawProductAttributeValueRecord]]:
+        return self._find_all_by(
+            RawProductAttributeValueRecord.product_key, product_keys
+        )
+
     def get_by_attribute_key(
         self, attribute_key: str
     ) -> list[RawProductAttributeValueRecord]:
@@ -401,6 +596,13 @@ class RawProductAttributeGapRepository(
             ).all()
         )
 
+    def find_many_by_product_key(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, list[RawProductAttributeGapRecord]]:
+        return self._find_all_by(
+            RawProductAttributeGapRecord.product_key, product_keys
+        )
+
     def get_by_attribute_key(
         self, attribute_key: str
     ) -> list[RawProductAttributeGapRecord]:
@@ -653,6 +855,13 @@ class RawRecommendationRepository(Repository[RawRecommendationRecord]):
             ).all()
         )
 
+    def find_many_by_product_key(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, list[RawRecommendationRecord]]:
+        return self._find_all_by(
+            RawRecommendationRecord.product_key, product_keys
+        )
+
     def get_by_attribute_key(
         self, attribute_key: str
     ) -> list[RawRecommendationRecord]:
@@ -710,6 +919,13 @@ class RawRichTextSourceRepository(Repository[RawRichTextSourceRecord]):
             ).all()
         )
 
+    def find_many_by_product_key(
+        self, product_keys: Iterable[str]
+    ) -> dict[str, list[RawRichTextSourceRecord]]:
+        return self._find_all_by(
+            RawRichTextSourceRecord.product_key, product_keys
+        )
+
     def find_by_product_key_and_name(
         self, product_key: str, name: str
     ) -> RawRichTextSourceRecord | None:
@@ -847,3 +1063,15 @@ class HumanRecommendationRepository(Repository[HumanRecommendationRecord]):
                 )
             ).all()
         )
+
+
+class IngestionManifestRepository(Repository[IngestionManifestRecord]):
+    """Repository for the per-file ingestion manifest"""
+
+    def __init__(self, session: Session):
+        super().__init__(session, IngestionManifestRecord)
+
+    def find_by_filename(
+        self, filename: str
+    ) -> IngestionManifestRecord | None:
+        return self.session.get(IngestionManifestRecord, filename)
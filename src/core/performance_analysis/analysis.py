@@ -11,6 +11,9 @@ from src.core.domain.repositories import (
 from src.core.infrastructure.database.input_data.records import (
     RawRecommendationRecord,
 )
+from src.core.infrastructure.database.input_data.repositories import (
+    RawRecommendationRepository,
+)
 from src.core.infrastructure.database.predictions.records import (
     PredictionResultRecord,
 )
@@ -38,6 +41,7 @@ class PredictionAnalyzer:
         self.repository = FacetIdentificationRepository(session)
         self.experiment_repo = ExperimentRepository(session)
         self.result_repo = PredictionResultRepository(session)
+        self.recommendation_repo = RawRecommendationRepository(session)
 
     def get_experiment_results(
         self, experiment_key: str
@@ -57,6 +61,25 @@ class PredictionAnalyzer:
         )
         return result.value if result else None
 
+    def get_ground_truths(
+        self, results: Sequence[PredictionResultRecord]
+    ) -> dict[tuple[str, str], str]:
+        """
+        Ground truth values by (product_key, attribute_key), for the
+        products of the results, fetched in batches.
+        """
+        recommendations = self.recommendation_repo.find_many_by_product_key(
+            result.product_key for result in results
+        )
+        ground_truths: dict[tuple[str, str], str] = {}
+        for product_recommendations in recommendations.values():
+            for recommendation in product_recommendations:
+                ground_truths.setdefault(
+                    (recommendation.product_key, recommendation.attribute_key),
+                    recommendation.value,
+                )
+        return ground_truths
+
     def calculate_basic_metrics(
         self, results: Sequence[PredictionResultRecord]
     ) -> PredictionMetrics:
@@ -70,9 +93,10 @@ class PredictionAnalyzer:
         false_positives = 0
         false_negatives = 0
 
+        ground_truths = self.get_ground_truths(results)
         for result in results:
-            ground_truth = self.get_ground_truth(
-                result.product_key, result.attribute_key
+            ground_truth = ground_truths.get(
+                (result.product_key, result.attribute_key)
             )
             if ground_truth is None:
                 continue
@@ -143,20 +167,29 @@ class PredictionAnalyzer:
         ] = {}
 
         # Get all unique categories from the results
-        for result in results:
-            product_categories = (
-                self.repository.product_category_repo.get_by_product_key(
-                    result.product_key
-                )
+        product_categories = (
+            self.repository.product_category_repo.find_many_by_product_key(
+                result.product_key for result in results
             )
+        )
+        categories = self.repository.category_repo.find_many(
+            product_category.category_key
+            for records in product_categories.values()
+            for product_category in records
+        )
 
-            for category in product_categories:
-                if category.category_key not in category_metrics:
-                    category_metrics[category.category_key] = (
-                        category.friendly_name,
+        for result in results:
+            for product_category in product_categories.get(
+                result.product_key, []
+            ):
+                category_key = product_category.category_key
+                if category_key not in category_metrics:
+                    category = categories.get(category_key)
+                    category_metrics[category_key] = (
+                        category.friendly_name if category else category_key,
                         [],
                     )
-                category_metrics[category.category_key][1].append(result)
+                category_metrics[category_key][1].append(result)
 
         # Calculate metrics for each category
         return [
@@ -181,11 +214,12 @@ class PredictionAnalyzer:
         ] = {}
 
         # Group results by attribute
+        attributes = self.repository.attribute_repo.get_many(
+            result.attribute_key for result in results
+        )
         for result in results:
             if result.attribute_key not in attribute_metrics:
-                attribute = self.repository.attribute_repo.get_by_id(
-                    result.attribute_key
-                )
+                attribute = attributes[result.attribute_key]
                 attribute_metrics[result.attribute_key] = (
                     attribute.friendly_name,
                     [],
@@ -213,18 +247,17 @@ class PredictionAnalyzer:
         gap_count_metrics: dict[int, list[PredictionResultRecord]] = {}
 
         # Get gap counts for each product
-        product_gap_counts: dict[str, int] = {}
-        for result in results:
-            if result.product_key not in product_gap_counts:
-                # flake8: noqa: E501
-                gaps = self.repository.product_attribute_gap_repo.get_by_product_key(
-                    result.product_key
-                )
-                product_gap_counts[result.product_key] = len(gaps)
+        gap_repo = self.repository.product_attribute_gap_repo
+        product_gap_counts = {
+            product_key: len(gaps)
+            for product_key, gaps in gap_repo.find_many_by_product_key(
+                result.product_key for result in results
+            ).items()
+        }
 
         # Group results by gap count
         for result in results:
-            gap_count = product_gap_counts[result.product_key]
+            gap_count = product_gap_counts.get(result.product_key, 0)
             if gap_count not in gap_count_metrics:
                 gap_count_metrics[gap_count] = []
             gap_count_metrics[gap_count].append(result)
@@ -250,18 +283,21 @@ class PredictionAnalyzer:
         }
 
         # Get description lengths for each product
-        product_lengths: dict[str, int] = {}
-        for result in results:
-            if result.product_key not in product_lengths:
-                rich_text = self.repository.rich_text_repo.find_by_product_key(
-                    result.product_key
-                )
-                total_length = sum(len(rt.content) for rt in rich_text)
-                product_lengths[result.product_key] = total_length
+        product_lengths = {
+            product_key: sum(
+                len(description.value)
+                for description in details.product_description
+            )
+            for product_key, details in (
+                self.repository.find_product_details_many(
+                    result.product_key for result in results
+                ).items()
+            )
+        }
 
         # Group results by length segment
         for result in results:
-            length = product_lengths[result.product_key]
+            length = product_lengths.get(result.product_key, 0)
             if length < 500:
                 segment = "short"
             elif length < 2000:
@@ -288,9 +324,10 @@ class PredictionAnalyzer:
         confidences = []
         accuracies = []
 
+        ground_truths = self.get_ground_truths(results)
         for result in results:
-            ground_truth = self.get_ground_truth(
-                result.product_key, result.attribute_key
+            ground_truth = ground_truths.get(
+                (result.product_key, result.attribute_key)
             )
             if ground_truth is not None:
                 confidences.append(result.confidence)
@@ -1,5 +1,8 @@
+import logging
 from pathlib import Path
 
+from sqlalchemy.exc import SQLAlchemyError
+
 from src.common.read_files import read_text_file
 from src.core.domain import FacetPrediction
 from src.core.domain.confidence_levels import ConfidenceLevel
@@ -8,6 +11,8 @@ from src.core.similarity_search.models import SimilaritySearchResult
 from src.core.similarity_search.service import SimilaritySearchService
 from src.core.similarity_search.similarity_cache import SIMILARITY_CACHE
 
+logger = logging.getLogger(__name__)
+
 
 class ProductFacetPrompt:
     def __init__(self) -> None:
@@ -76,7 +81,8 @@ class ProductFacetPrompt:
                 f"products to help you answer the question if applicable:\n"
                 f"{similar_products}"
             )
-        except Exception:
+        except (ValueError, SQLAlchemyError) as e:
+            logger.warning(f"No similar products for {product_key}: {e}")
             return ""
 
     def get_system_prompt(self) -> str:
@@ -1,11 +1,16 @@
-from src.common.db import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.common.db import AsyncSessionLocal
 from src.config import config
-from src.core.domain.repositories import FacetIdentificationRepository
+from src.core.domain.repositories import AsyncFacetIdentificationRepository
 from src.core.embedding_generation.generators import (
     len_safe_get_averaged_embedding,
 )
+from src.core.infrastructure.database.embeddings.models import (
+    SimilarProductResult,
+)
 from src.core.infrastructure.database.embeddings.repository import (
-    ProductEmbeddingRepository,
+    AsyncProductEmbeddingRepository,
 )
 from src.core.similarity_search.models import (
     SimilaritySearchResponse,
@@ -14,14 +19,36 @@ from src.core.similarity_search.models import (
 
 
 class SimilaritySearchService:
-    """Service for finding semantically similar products using embeddings."""
+    """
+    Service for finding semantically similar products using embeddings.
 
-    def __init__(self) -> None:
-        self.session = SessionLocal()
-        self.embedding_repo = ProductEmbeddingRepository(self.session)
-        self.facet_repo = FacetIdentificationRepository(self.session)
+    Every search opens its own asyncio session, so concurrent searches from
+    one instance neither share a session nor block the event loop.
+    """
 
-    def find_similar_products(
+    async def _search_response(
+        self,
+        session: AsyncSession,
+        similar_products: list[SimilarProductResult],
+    ) -> SimilaritySearchResponse:
+        facet_repo = AsyncFacetIdentificationRepository(session)
+        product_details = await facet_repo.get_product_details_many(
+            similar_product.product_key for similar_product in similar_products
+        )
+        results = [
+            SimilaritySearchResult(
+                product=product_details[similar_product.product_key],
+                similarity_score=similar_product.distance,
+            )
+            for similar_product in similar_products
+        ]
+
+        return SimilaritySearchResponse(
+            results=results,
+            total_results=len(results),
+        )
+
+    async def find_similar_products(
         self,
         product_key: str,
         limit: int = config.SIMILARITY_DEFAULT_LIMIT,
@@ -48,28 +75,16 @@ class SimilaritySearchService:
                 f"and {config.SIMILARITY_MAX_DISTANCE}"
             )
 
-        similar_products = self.embedding_repo.find_similar_products_by_key(
-            product_key=product_key,
-            limit=limit,
-            distance_threshold=max_distance,
-        )
-
-        results = []
-        for similar_product in similar_products:
-            product_details = self.facet_repo.get_product_details(
-                similar_product.product_key
-            )
-            results.append(
-                SimilaritySearchResult(
-                    product=product_details,
-                    similarity_score=similar_product.distance,
+        async with AsyncSessionLocal() as session:
+            embedding_repo = AsyncProductEmbeddingRepository(session)
+            similar_products = (
+                await embedding_repo.find_similar_products_by_key(
+                    product_key=product_key,
+                    limit=limit,
+                    distance_threshold=max_distance,
                 )
             )
-
-        return SimilaritySearchResponse(
-            results=results,
-            total_results=len(results),
-        )
+            return await self._search_response(session, similar_products)
 
     async def find_similar_products_for_description(
         self,
@@ -98,30 +113,13 @@ class SimilaritySearchService:
 
         embedding = await len_safe_get_averaged_embedding(description)
 
-        similar_products = (
-            self.embedding_repo.find_similar_products_by_embedding(
-                embedding=embedding,
-                limit=limit,
-                distance_threshold=max_distance,
-            )
-        )
-
-        results = []
-        for similar_product in similar_products:
-            product_details = self.facet_repo.get_product_details(
-                similar_product.product_key
-            )
-            results.append(
-                SimilaritySearchResult(
-                    product=product_details,
-                    similarity_score=similar_product.distance,
+        async with AsyncSessionLocal() as session:
+            embedding_repo = AsyncProductEmbeddingRepository(session)
+            similar_products = (
+                await embedding_repo.find_similar_products_by_embedding(
+                    embedding=embedding,
+                    limit=limit,
+                    distance_threshold=max_distance,
                 )
             )
-
-        return SimilaritySearchResponse(
-            results=results,
-            total_results=len(results),
-        )
-
-    def __del__(self) -> None:
-        self.session.close()
+            return await self._search_response(session, similar_products)
@@ -62,11 +62,15 @@ class SimilaritySearchCache:
         *args: Any,
         **kwargs: Any,
     ) -> SimilaritySearchResponse:
+        """
+        The cached response for product_key, or else the response of
+        fetch_func(product_key, *args, **kwargs), which is cached.
+        """
         cached_result = await self._cache.get(product_key)
         if cached_result is not None:
             return cached_result
 
-        result = await fetch_func(*args, **kwargs)
+        result = await fetch_func(product_key, *args, **kwargs)
         if not isinstance(result, SimilaritySearchResponse):
             raise TypeError(
                 f"Expected SimilaritySearchResponse, got {type(result)}"
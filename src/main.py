@@ -1,8 +1,9 @@
 import logging
 import os
 import uuid
+from contextlib import asynccontextmanager
 from http import HTTPStatus
-from typing import Callable
+from typing import AsyncIterator, Callable
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,6 +12,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.api.routers.base_router import base_router
 from src.common.logs import setup_logging
+from src.core.infrastructure.database.input_data.reference_cache import (
+    REFERENCE_CACHE,
+)
 
 logger = logging.getLogger(__name__)
 setup_logging()
@@ -65,12 +69,20 @@ def setup_exception_handlers(app: FastAPI) -> None:
         )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Map the reference snapshot, if there is one, in every worker."""
+    REFERENCE_CACHE.map_snapshot()
+    yield
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
         title="AIDA Facet Inference API",
         description="API for inferring product facets using LLMs",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     setup_middleware(app)
@@ -0,0 +1,22 @@
+from src.core.csv_ingestion.bulk.delta import _joined, _key_matches
+from src.core.infrastructure.database.input_data.records import (
+    RawProductAttributeValueRecord,
+)
+
+
+def test_row_key_keeps_null_parts_in_place():
+    assert _joined(["s.product_key", "s.attribute_key"]) == (
+        "json_build_array((s.product_key)::text, (s.attribute_key)::text)"
+        "::text"
+    )
+
+
+def test_key_matches_compares_bare_target_columns():
+    assert _key_matches(
+        RawProductAttributeValueRecord,
+        ("product_key", "attribute_key"),
+        "c.row_key",
+    ) == (
+        "t.product_key = CAST((c.row_key)::json->>0 AS VARCHAR) AND "
+        "t.attribute_key = CAST((c.row_key)::json->>1 AS VARCHAR)"
+    )
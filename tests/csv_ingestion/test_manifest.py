@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.csv_ingestion import manifest
+from src.core.csv_ingestion.manifest import (
+    IngestionStatus,
+    begin_file,
+    checkpoint_file,
+    file_fingerprint,
+    finish_file,
+)
+from src.core.infrastructure.database.input_data.records import (
+    IngestionManifestRecord,
+)
+
+
+@pytest.fixture(autouse=True)
+def manifest_db(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    IngestionManifestRecord.__table__.create(engine)
+    monkeypatch.setattr(manifest, "db_session", lambda: sessionmaker(engine))
+
+
+def test_new_file_starts_at_the_first_row():
+    assert begin_file("Product", "h1", resume=True) == 0
+
+
+def test_resume_continues_an_interrupted_file():
+    begin_file("Product", "h1", resume=False)
+    checkpoint_file("Product", 2000)
+
+    assert begin_file("Product", "h1", resume=True) == 2000
+
+
+def test_resume_skips_a_completed_file():
+    begin_file("Product", "h1", resume=False)
+    finish_file("Product", IngestionStatus.COMPLETED, 5000)
+
+    assert begin_file("Product", "h1", resume=True) is None
+
+
+@pytest.mark.parametrize("fingerprint, resume", [("h2", True), ("h1", False)])
+def test_file_starts_over(fingerprint, resume):
+    begin_file("Product", "h1", resume=False)
+    finish_file("Product", IngestionStatus.COMPLETED, 5000)
+
+    assert begin_file("Product", fingerprint, resume) == 0
+
+
+def test_fingerprint_changes_when_the_file_is_rewritten(tmp_path):
+    path = tmp_path / "Product.csv"
+    path.write_text("ProductKey\np1\n")
+    fingerprint = file_fingerprint(path)
+
+    assert file_fingerprint(path) == fingerprint
+    path.write_text("ProductKey\np1\np2\n")
+    assert file_fingerprint(path) != fingerprint
@@ -0,0 +1,40 @@
+from src.core.csv_ingestion.bulk.merge import StagingMerge, build_merge_sql
+from src.core.infrastructure.database.input_data.records import (
+    RawProductAttributeValueRecord,
+)
+
+COLUMNS = ["product_key", "attribute_key", "value"]
+
+
+def test_merge_keeps_the_first_row_of_each_key():
+    merge = StagingMerge(natural_key=("product_key", "attribute_key"))
+
+    sql = build_merge_sql(
+        RawProductAttributeValueRecord, merge, "staging", COLUMNS
+    )
+
+    assert sql == (
+        "INSERT INTO raw_product_attribute_values "
+        "(product_key, attribute_key, value) "
+        "SELECT DISTINCT ON (s.product_key, s.attribute_key) "
+        "s.product_key, s.attribute_key, s.value "
+        "FROM staging s  "
+        "WHERE NOT EXISTS (SELECT 1 FROM raw_product_attribute_values t "
+        "WHERE t.product_key = s.product_key "
+        "AND t.attribute_key = s.attribute_key) "
+        "ORDER BY s.product_key, s.attribute_key, s._row "
+        "ON CONFLICT DO NOTHING"
+    )
+
+
+def test_merge_without_natural_key_inserts_every_row():
+    sql = build_merge_sql(
+        RawProductAttributeValueRecord,
+        StagingMerge(natural_key=()),
+        "staging",
+        COLUMNS,
+    )
+
+    assert "DISTINCT ON" not in sql
+    assert "NOT EXISTS" not in sql
+    assert sql.endswith("ORDER BY s._row")
@@ -0,0 +1,102 @@
+import csv
+
+import pytest
+
+from src.core.csv_ingestion.processors.parallel_csv import (
+    has_rfc_quoting,
+    parse_range,
+    process_csv_file_parallel,
+    split_csv,
+)
+
+ROWS = [
+    ["p1", "Oak chair", "plain"],
+    ["p2", "Table, round", 'a "quoted" word'],
+    ["p3", "Lamp", "first line\nsecond line"],
+    ["p4", "", "trailing"],
+] * 25
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "products.csv"
+    with open(path, "w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(["ProductKey", "Name", "Notes"])
+        writer.writerows(ROWS)
+    return path
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 64, 1 << 20])
+def test_split_csv_ranges_hold_whole_records(csv_path, chunk_bytes):
+    header, ranges = split_csv(csv_path, chunk_bytes)
+
+    assert header == ["ProductKey", "Name", "Notes"]
+    assert all(
+        end == start for (_, end), (start, _) in zip(ranges, ranges[1:])
+    )
+    assert ranges[-1][1] == csv_path.stat().st_size
+    parsed = [
+        parse_range(csv_path, start, end, header) for start, end in ranges
+    ]
+    assert [value for columns in parsed for value in columns["Notes"]] == [
+        row[2] for row in ROWS
+    ]
+
+
+def test_parse_range_renames_columns(csv_path):
+    header, ranges = split_csv(csv_path)
+
+    columns = parse_range(
+        csv_path, *ranges[0], header, {"ProductKey": "product_key"}
+    )
+
+    assert list(columns) == ["product_key"]
+    assert columns["product_key"][:2] == ["p1", "p2"]
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (b'a,b\r\n1,"x, ""y"""\r\n2,"multi\nline"\n', True),
+        (b'a,b\n1,"cut off at the end of the probe', True),
+        (b'a,b\n1,5" pipe\n', False),
+        (b'a,b\n1,"x"y\n', False),
+    ],
+)
+def test_has_rfc_quoting(tmp_path, data, expected):
+    path = tmp_path / "probe.csv"
+    path.write_bytes(data)
+
+    assert has_rfc_quoting(path) is expected
+
+
+class _Writer:
+    def __init__(self):
+        self.batches = []
+
+    def write_columns(self, columns):
+        self.batches.append(columns["product_key"])
+        return len(columns["product_key"])
+
+
+def test_parallel_load_writes_batches_and_resumes(csv_path):
+    writer = _Writer()
+    checkpoints = []
+
+    result = process_csv_file_parallel(
+        csv_path,
+        writer,
+        workers=2,
+        batch_size=30,
+        column_mapping={"ProductKey": "product_key"},
+        chunk_bytes=256,
+        start_row=10,
+        on_checkpoint=checkpoints.append,
+    )
+
+    keys = [key for batch in writer.batches for key in batch]
+    assert keys == [row[0] for row in ROWS[10:]]
+    assert max(len(batch) for batch in writer.batches) <= 30
+    assert checkpoints[-1] == len(ROWS)
+    assert result.total_processed == len(ROWS) - 10
@@ -0,0 +1,36 @@
+from src.core.csv_ingestion.qa import (
+    QA_COLUMNS,
+    find_qa_files,
+    recommendation_content_hash,
+)
+
+
+def test_find_qa_files_matches_csv_and_excel_sorted(tmp_path):
+    for name in ["b/batch2.XLSX", "batch10.csv", "a/batch1.csv", "notes.txt"]:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    files = find_qa_files(f"{tmp_path}/**/*")
+
+    assert [path.relative_to(tmp_path).as_posix() for path in files] == [
+        "a/batch1.csv",
+        "b/batch2.XLSX",
+        "batch10.csv",
+    ]
+
+
+def test_find_qa_files_without_matches(tmp_path):
+    assert find_qa_files(f"{tmp_path}/*.csv") == []
+
+
+def test_content_hash_treats_missing_values_as_empty():
+    row = dict.fromkeys(QA_COLUMNS, "")
+    row["recommendation"] = "Red"
+
+    assert recommendation_content_hash(row) == recommendation_content_hash(
+        {**row, "comment": None}
+    )
+    assert recommendation_content_hash(row) != recommendation_content_hash(
+        {**row, "recommendation": "Blue"}
+    )
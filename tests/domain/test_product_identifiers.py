@@ -0,0 +1,74 @@
+import pytest
+
+from src.core.domain.product_identifiers import (
+    ProductIdentifierType,
+    process_code_types,
+)
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("4006381333931", ProductIdentifierType.EAN),
+        ("96385074", ProductIdentifierType.EAN),
+        ("036000291452", ProductIdentifierType.UPC),
+        ("9780306406157", ProductIdentifierType.ISBN),
+        ("978-0-306-40615-7", ProductIdentifierType.ISBN),
+        ("0306406152", ProductIdentifierType.ISBN),
+        ("080442957X", ProductIdentifierType.ISBN),
+        ("ABC1234", ProductIdentifierType.SKU),
+        ("abc1234", ProductIdentifierType.OTHER),
+        ("", ProductIdentifierType.OTHER),
+    ],
+)
+def test_detect_code_type(code, expected):
+    assert ProductIdentifierType.detect_code_type(code) == expected
+
+
+def test_invalid_check_digit_is_not_a_gtin():
+    assert (
+        ProductIdentifierType.detect_code_type("4006381333932")
+        == ProductIdentifierType.OTHER
+    )
+    assert (
+        ProductIdentifierType.detect_code_type("036000291453")
+        == ProductIdentifierType.SKU
+    )
+
+
+def test_classify_many_matches_detect_code_type():
+    codes = [
+        "4006381333931",
+        "4006381333932",
+        "96385074",
+        "036000291452",
+        "036000291453",
+        "9780306406157",
+        "9790306406156",
+        "0306406152",
+        "080442957X",
+        "080442957x",
+        "X-1",
+        "ABC123",
+        "abc123",
+        "ABCDEFGHIJKLM",
+        "40063813339310",
+        "",
+    ]
+    assert ProductIdentifierType.classify_many(codes) == [
+        ProductIdentifierType.detect_code_type(code) for code in codes
+    ]
+
+
+def test_process_code_types_forced_type():
+    assert process_code_types(["4006381333931", "ABC123"], "SKU") == [
+        "SKU",
+        "SKU",
+    ]
+    with pytest.raises(ValueError):
+        process_code_types(["4006381333931"], "GTIN")
+
+
+def test_no_codes():
+    assert ProductIdentifierType.classify_many([]) == []
+    assert process_code_types([]) == []
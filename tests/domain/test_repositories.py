@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.core.domain.repositories import (
+    AsyncFacetIdentificationRepository,
+    _product_gaps,
+    _product_gaps_statement,
+    _single_product_gaps,
+)
+from src.core.domain.types import ProductAttributeGap
+
+# Rows of a gap statement: product key and name, then the attribute's key,
+# friendly name and allowable values.
+ROWS = [
+    ("p1", "Chair", "a1", "Colour", ["Black", "Red"]),
+    ("p1", "Chair", "a2", "Width", None),
+    ("p2", "Table", None, None, None),
+]
+
+
+def test_product_gaps_folds_rows_per_product():
+    found = _product_gaps(ROWS)
+
+    assert found["p1"].product_name == "Chair"
+    # A gap without allowable values is left out.
+    assert found["p1"].gaps == [
+        ProductAttributeGap(
+            attribute="Colour", allowable_values=["Black", "Red"]
+        )
+    ]
+    assert found["p2"].gaps == []
+
+
+def test_product_gaps_missing_attribute():
+    with pytest.raises(ValueError, match="a3"):
+        _product_gaps([("p1", "Chair", "a3", None, ["Oak"])])
+
+
+def test_single_product_gaps():
+    assert _single_product_gaps("p2", ROWS).gaps == []
+    with pytest.raises(ValueError, match="RawProductRecord"):
+        _single_product_gaps("p3", ROWS)
+
+
+class _AsyncSession:
+    """Answers every statement with ROWS"""
+
+    async def execute(self, statement):
+        return ROWS
+
+
+def test_async_product_without_gaps_has_empty_gaps():
+    repository = AsyncFacetIdentificationRepository(_AsyncSession())
+
+    gaps = asyncio.run(repository.get_product_gaps("p2"))
+
+    assert gaps.product_name == "Table"
+    assert gaps.gaps == []
+
+
+def test_allowable_values_correlate_to_the_product():
+    sql = str(
+        _product_gaps_statement(["p1"]).compile(dialect=postgresql.dialect())
+    )
+
+    # raw_products is only read by the outer query.
+    assert sql.count("FROM raw_products") == 1
+    assert 'ORDER BY value COLLATE "C"' in sql
@@ -0,0 +1,34 @@
+import pytest
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class _Session:
+    """
+    Answers executed statements with the rows answer returns for them, and
+    scalar queries with scalar, counting the statements executed.
+    """
+
+    def __init__(self, answer, scalar=None):
+        self._answer = answer
+        self._scalar = scalar
+        self.queries = 0
+
+    def execute(self, statement):
+        self.queries += 1
+        return _Result(self._answer(statement))
+
+    def scalar(self, statement):
+        return self._scalar
+
+
+@pytest.fixture
+def fake_session():
+    """Build a session stub from a function mapping statements to rows."""
+    return _Session
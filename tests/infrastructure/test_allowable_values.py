@@ -0,0 +1,66 @@
+from src.core.infrastructure.database.input_data import allowable_values
+from src.core.infrastructure.database.input_data.allowable_values import (
+    AllowableValueResolver,
+)
+from src.core.infrastructure.database.input_data.reference_data import (
+    build_reference_data,
+)
+
+# Rows of allowable_values_resolved: (category_key, attribute_key, values)
+RESOLVED = [
+    ("c1", "a1", ["Red", "Blue"]),
+    ("c2", "a1", ["Blue", "Green"]),
+    ("", "a1", ["Black"]),
+    ("", "a2", ["Steel"]),
+]
+
+
+def _answer(statement):
+    """Answer the resolver's query from RESOLVED."""
+    parameters = statement.compile().params
+    categories = parameters["category_key_1"]
+    attributes = parameters["attribute_key_1"]
+    return [
+        (attribute_key, values)
+        for category_key, attribute_key, values in RESOLVED
+        if category_key in categories and attribute_key in attributes
+    ]
+
+
+class _ReferenceCache:
+    def __init__(self):
+        self.version = 1
+
+    def get(self, session):
+        return build_reference_data(self.version, [], [], [])
+
+
+def test_resolves_once_per_category_set(monkeypatch, fake_session):
+    reference_cache = _ReferenceCache()
+    monkeypatch.setattr(allowable_values, "REFERENCE_CACHE", reference_cache)
+    resolver = AllowableValueResolver(max_entries=100)
+    session = fake_session(_answer)
+
+    resolved = resolver.resolve(session, ["c1", "c2"], ["a1", "a2", "a3"])
+
+    assert resolved == {
+        "a1": ("Black", "Blue", "Green", "Red"),
+        "a2": ("Steel",),
+        "a3": (),
+    }
+    assert session.queries == 1
+
+    # Another product with the same categories, listed in another order.
+    again = resolver.resolve(session, ["c2", "c1"], ["a1"])
+    assert again["a1"] is resolved["a1"]
+    assert session.queries == 1
+
+    assert resolver.resolve(session, ["c1"], ["a1"]) == {
+        "a1": ("Black", "Blue", "Red")
+    }
+    assert session.queries == 2
+
+    reference_cache.version = 2
+    resolver.resolve(session, ["c1", "c2"], ["a1"])
+    assert session.queries == 3
+    assert resolver.stats().hits == 1
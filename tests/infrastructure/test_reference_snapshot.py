@@ -0,0 +1,61 @@
+from src.core.infrastructure.database.input_data.reference_data import (
+    ALLOWABLE_VALUE_STATEMENTS,
+    REFERENCE_STATEMENTS,
+    AttributeReference,
+    CategoryReference,
+)
+from src.core.infrastructure.database.input_data.reference_snapshot import (
+    map_snapshot,
+    write_snapshot,
+)
+
+ATTRIBUTES = [
+    ("a1", "colour", "Colour", "text", None),
+    ("a2", "colour_2", "Colour", "text", None),
+    ("a3", "width", "Width", "number", "length"),
+]
+CATEGORIES = [("c1", "chairs", "Chairs"), ("c2", "tables", "Tables")]
+CATEGORY_ATTRIBUTES = [("c1", "a1"), ("c1", "a3"), ("c2", "a3")]
+CATEGORY_VALUES = [("c1", "a1", "Red"), ("c2", "a1", "Blue")]
+GLOBAL_VALUES = [("a1", "Black")]
+SHARED_VALUES = [("a1", "Grün")]
+
+
+def _snapshot_rows():
+    """The snapshot's statements, each mapped to its fixed rows"""
+    statements = REFERENCE_STATEMENTS + ALLOWABLE_VALUE_STATEMENTS
+    rows = [
+        ATTRIBUTES,
+        CATEGORIES,
+        CATEGORY_ATTRIBUTES,
+        CATEGORY_VALUES,
+        GLOBAL_VALUES,
+        SHARED_VALUES,
+    ]
+    return {str(s): r for s, r in zip(statements, rows)}
+
+
+def test_snapshot_round_trip(tmp_path, fake_session):
+    path = tmp_path / "reference.snapshot"
+    rows = _snapshot_rows()
+    session = fake_session(lambda statement: rows[str(statement)], scalar=3)
+    assert write_snapshot(session, path) == 3
+
+    data = map_snapshot(path)
+
+    assert data.version == 3
+    assert data.attributes["a3"] == AttributeReference(*ATTRIBUTES[2])
+    assert data.attributes_by_system_name["colour_2"].attribute_key == "a2"
+    assert data.attributes_by_friendly_name["Colour"].attribute_key == "a1"
+    assert data.categories_by_system_name["tables"] == CategoryReference(
+        *CATEGORIES[1]
+    )
+    assert "missing" not in data.attributes
+    assert data.attribute_keys_for_categories(["c1", "c2"]) == {"a1", "a3"}
+    assert data.allowable_values is not None
+    assert data.allowable_values.values_for(["c1", "c3"], "a1") == {
+        "Red",
+        "Black",
+        "Grün",
+    }
+    assert data.allowable_values.values_for(["c1"], "a3") == set()
@@ -0,0 +1,47 @@
+import asyncio
+
+from src.core.domain.models import ProductDetails
+from src.core.prompts.prompt_manager import ProductFacetPrompt
+from src.core.similarity_search.models import (
+    SimilaritySearchResponse,
+    SimilaritySearchResult,
+)
+from src.core.similarity_search.similarity_cache import SIMILARITY_CACHE
+
+SIMILAR = ProductDetails(
+    product_key="p2",
+    product_code="5012345678900",
+    code_type="EAN13",
+    product_name="Oak Dining Chair",
+    product_description=[],
+    categories=["Chairs"],
+    attributes=[],
+)
+
+
+class _SimilaritySearchService:
+    def __init__(self):
+        self.product_keys = []
+
+    async def find_similar_products(self, product_key, limit, max_distance):
+        self.product_keys.append(product_key)
+        return SimilaritySearchResponse(
+            results=[
+                SimilaritySearchResult(product=SIMILAR, similarity_score=0.2)
+            ],
+            total_results=1,
+        )
+
+
+def test_similar_products_section():
+    SIMILARITY_CACHE.clear()
+    prompt = ProductFacetPrompt()
+    service = _SimilaritySearchService()
+    prompt._similarity_service = service
+
+    section = asyncio.run(prompt._get_similar_products_section("p1"))
+
+    assert service.product_keys == ["p1"]
+    assert "Similar Product 1:" in section
+    assert "Oak Dining Chair" in section
+    SIMILARITY_CACHE.clear()